@@ -0,0 +1,168 @@
+"""
+Concurrency check of work day duration accumulation.
+
+Inserts `--sessions` closed sessions of one employee on one work day,
+the way batch ingestion inserts sessions started and ended in the same
+batch, then adds their durations to the work day concurrently, one
+transaction per session:
+
+- the former way, reading `total_duration` into Python and writing the
+  sum back, which loses the increments of transactions that interleave;
+- with `EmployeeService.add_session_durations`, the statement clock-outs
+  use, which adds them in the database.
+
+Fails unless the work day and its weekly and monthly rollups end up
+with exactly the sum of the session durations. Needs the database from
+the environment; the rows it creates are deleted afterwards.
+
+Usage:
+    python -m benchmarks.concurrent_clock_out [--sessions N]
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select, update, delete
+
+from src.database import engine, new_session
+from src.employee.models import Employee, WorkDay, WorkSession, WorkPlace, EmployeeWeekTotal, EmployeeMonthTotal
+from src.employee.service import EmployeeService
+from src.users.models import User
+
+
+async def create_fixture(sessions: int) -> tuple[int, int, int, date, timedelta]:
+    """Return user, work place and employee ids, the work date and the expected total."""
+    tag = uuid.uuid4().hex[:8]
+    today = date.today()
+    async with new_session() as session:
+        user = User(first_name="Bench", last_name="Mark", email=f"bench-{tag}@example.com", password="-")
+        workplace = WorkPlace(title=f"Bench {tag}", address=f"Bench street {tag}")
+        session.add_all([user, workplace])
+        await session.flush()
+        employee = Employee(
+            first_name="Bench", last_name=tag, position="Barista", email=f"bench-{tag}@example.com",
+            phone_number=f"+{uuid.uuid4().int % 10**12:012}", user_id=user.id, workplace_id=workplace.id,
+        )
+        session.add(employee)
+        await session.flush()
+        work_day = WorkDay(employee_id=employee.id, work_date=today)
+        session.add(work_day)
+        await session.flush()
+
+        start = datetime.now(timezone.utc) - timedelta(hours=1)
+        durations = [timedelta(seconds=random.randint(60, 600), microseconds=random.randint(0, 999999)) for _ in range(sessions)]
+        session.add_all([
+            WorkSession(
+                work_day_id=work_day.id, work_date=today, employee_id=employee.id,
+                start_time=start, end_time=start + duration,
+            )
+            for duration in durations
+        ])
+        await session.commit()
+        return user.id, workplace.id, employee.id, today, sum(durations, timedelta())
+
+
+async def session_ids(employee_id: int) -> list[int]:
+    async with new_session() as session:
+        result = await session.execute(select(WorkSession.id).where(WorkSession.employee_id == employee_id))
+        return list(result.scalars().all())
+
+
+async def read_modify_write(session_id: int) -> None:
+    async with new_session() as session:
+        work_session = (await session.execute(select(WorkSession).where(WorkSession.id == session_id))).scalar_one()
+        work_day = (await session.execute(
+            select(WorkDay).where(WorkDay.id == work_session.work_day_id, WorkDay.work_date == work_session.work_date)
+        )).scalar_one()
+        total_duration = work_day.total_duration + (work_session.end_time - work_session.start_time)
+        await session.execute(
+            update(WorkDay)
+            .where(WorkDay.id == work_day.id, WorkDay.work_date == work_day.work_date)
+            .values(total_duration=total_duration)
+        )
+        await session.commit()
+
+
+async def add_in_database(session_id: int) -> None:
+    async with new_session() as session:
+        closed = (
+            select(
+                WorkSession.work_day_id,
+                WorkSession.work_date,
+                (WorkSession.end_time - WorkSession.start_time).label("duration"),
+            )
+            .where(WorkSession.id == session_id)
+            .subquery("closed_session")
+        )
+        work_day_cte, *rollup_ctes = EmployeeService.add_session_durations(closed)
+        await session.execute(select(work_day_cte.c.total_duration).add_cte(*rollup_ctes))
+        await session.commit()
+
+
+async def totals(employee_id: int, work_date: date) -> tuple[timedelta, timedelta | None, timedelta | None]:
+    async with new_session() as session:
+        day = await session.scalar(select(WorkDay.total_duration).where(WorkDay.employee_id == employee_id))
+        week = await session.scalar(select(EmployeeWeekTotal.total_duration).where(
+            EmployeeWeekTotal.employee_id == employee_id,
+            EmployeeWeekTotal.week_start == work_date - timedelta(days=work_date.weekday()),
+        ))
+        month = await session.scalar(select(EmployeeMonthTotal.total_duration).where(
+            EmployeeMonthTotal.employee_id == employee_id,
+            EmployeeMonthTotal.month_start == work_date.replace(day=1),
+        ))
+        return day, week, month
+
+
+async def reset(employee_id: int) -> None:
+    async with new_session() as session:
+        await session.execute(update(WorkDay).where(WorkDay.employee_id == employee_id).values(total_duration=timedelta()))
+        await session.execute(delete(EmployeeWeekTotal).where(EmployeeWeekTotal.employee_id == employee_id))
+        await session.execute(delete(EmployeeMonthTotal).where(EmployeeMonthTotal.employee_id == employee_id))
+        await session.commit()
+
+
+async def drop_fixture(user_id: int, workplace_id: int, employee_id: int) -> None:
+    async with new_session() as session:
+        # work days, sessions and rollups cascade
+        await session.execute(delete(Employee).where(Employee.id == employee_id))
+        await session.execute(delete(WorkPlace).where(WorkPlace.id == workplace_id))
+        await session.execute(delete(User).where(User.id == user_id))
+        await session.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent work day duration accumulation check.")
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    user_id, workplace_id, employee_id, work_date, expected = await create_fixture(args.sessions)
+    try:
+        ids = await session_ids(employee_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(read_modify_write(session_id) for session_id in ids))
+        elapsed = time.perf_counter() - started
+        day, _, _ = await totals(employee_id, work_date)
+        print(f"read-modify-write: {elapsed * 1000:6.0f} ms, lost {expected - day} of {expected}")
+
+        await reset(employee_id)
+        started = time.perf_counter()
+        await asyncio.gather(*(add_in_database(session_id) for session_id in ids))
+        elapsed = time.perf_counter() - started
+        day, week, month = await totals(employee_id, work_date)
+        print(f"in database:       {elapsed * 1000:6.0f} ms, lost {expected - day} of {expected}")
+
+        assert day == expected, f"work day total {day} != {expected}"
+        assert week == expected, f"week total {week} != {expected}"
+        assert month == expected, f"month total {month} != {expected}"
+        print(f"{args.sessions} concurrent clock-outs, work day and rollups equal the sum of session durations")
+    finally:
+        await drop_fixture(user_id, workplace_id, employee_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
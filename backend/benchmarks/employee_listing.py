@@ -0,0 +1,110 @@
+"""
+Micro-benchmark of employee listing serialization.
+
+Compares the former path (validate each employee, dump it, validate the
+dict again, then FastAPI validates and serializes the response model and
+encodes it with the json module) with the single-pass path used by
+`GET /employees`. Checks that both produce the same JSON.
+
+Usage:
+    python -m benchmarks.employee_listing [--employees N] [--repeat N]
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.requests import Request
+
+from src.employee.models import Employee, WorkPlace
+from src.employee.schemas import EmployeeReturnSchema, EmployeeWithStatsReturnSchema, base_url_prefix
+from src.utils.responses import FastJSONResponse
+
+
+def generate_rows(employees: int) -> list[tuple]:
+    """Return (employee, today, week, month) rows like the listing query does."""
+    workplaces = [WorkPlace(id=i, title=f"Work place {i}", address=f"Street {i}") for i in range(1, 11)]
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(1, employees + 1):
+        employee = Employee(
+            id=i,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            position="Barista",
+            profile_photo=f"/static/employees/profile_photos/{i}.jpg" if i % 4 else None,
+            email=f"employee{i}@example.com",
+            phone_number=f"+38050{i:07}",
+            created_at=created_at + timedelta(seconds=i * 37, microseconds=i),
+            workplace=workplaces[i % len(workplaces)],
+        )
+        today = timedelta(hours=i % 9, minutes=i % 60) if i % 3 else None
+        rows.append((employee, today, timedelta(hours=i % 41), timedelta(hours=i % 170)))
+    return rows
+
+
+def make_request() -> Request:
+    return Request({
+        "type": "http", "scheme": "http", "server": ("testserver", 80), "root_path": "",
+        "path": "/employees", "query_string": b"", "headers": [],
+    })
+
+
+async def validated_path(rows: list[tuple], request: Request, field) -> bytes:
+    response_data = []
+    for employee, today, week, month in rows:
+        emp_dict = EmployeeReturnSchema.model_validate(employee).model_dump(context={"request": request})
+        emp_dict["work_stats"] = {"today": today, "week": week, "month": month}
+        response_data.append(emp_dict)
+    content = [EmployeeWithStatsReturnSchema.model_validate(data) for data in response_data]
+    # FastAPI validates the returned models against response_model and serializes them
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+
+def single_pass(rows: list[tuple], request: Request) -> bytes:
+    base_url = base_url_prefix(request)
+    return FastJSONResponse([
+        EmployeeWithStatsReturnSchema.dump_row(employee, today, week, month, base_url)
+        for employee, today, week, month in rows
+    ]).body
+
+
+def best_of(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Employee listing serialization benchmark.")
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.employees)
+    request = make_request()
+    field = create_model_field(
+        name="Response_get_all_employees", type_=list[EmployeeWithStatsReturnSchema], mode="serialization"
+    )
+
+    before = asyncio.run(validated_path(rows, request, field))
+    after = single_pass(rows, request)
+    assert json.loads(before) == json.loads(after), "serialized payloads differ"
+
+    old = best_of(args.repeat, lambda: asyncio.run(validated_path(rows, request, field)))
+    new = best_of(args.repeat, lambda: single_pass(rows, request))
+    print(f"{args.employees:,} employees, {len(after):,} bytes, identical payloads")
+    print(f"validated path: {old * 1000:.1f} ms")
+    print(f"single pass:    {new * 1000:.1f} ms ({old / new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
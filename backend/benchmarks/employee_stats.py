@@ -0,0 +1,148 @@
+"""
+Benchmark of the employee listing work stats query.
+
+Generates `--employees` employees of one user with a work day on each of
+the last `--days` days, then times the today/week/month totals of all of
+them computed three ways:
+
+- correlated: three correlated SUM subqueries per employee row, as the
+  listing used to do;
+- filter: `EmployeeService.work_stats_subquery`, one grouped pass with
+  FILTER clauses (`EMPLOYEE_STATS_FROM_ROLLUPS=False`);
+- rollups: joins to today's work day and the weekly and monthly rollup
+  tables (the default).
+
+Checks that all three return the same totals. Needs the database from the
+environment; everything runs in one transaction that is rolled back.
+
+Usage:
+    python -m benchmarks.employee_stats [--employees N] [--days N] [--repeat N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import select, func, and_, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.database import engine
+from src.employee.models import Employee, WorkDay, EmployeeWeekTotal, EmployeeMonthTotal
+from src.employee.service import EmployeeService, ROLLUP_PERIODS
+
+
+async def generate(connection: AsyncConnection, employees: int, days: int) -> int:
+    """Insert employees, their work days and rollups, return the user id."""
+    user_id = (await connection.execute(text(
+        "INSERT INTO users (first_name, last_name, email, password, is_active, is_superuser) "
+        "VALUES ('Bench', 'Mark', 'bench-stats@example.com', '-', true, false) RETURNING id"
+    ))).scalar_one()
+    workplace_id = (await connection.execute(text(
+        "INSERT INTO workplaces (title, address) VALUES ('Bench stats', 'Bench street') RETURNING id"
+    ))).scalar_one()
+    await connection.execute(text(
+        "INSERT INTO employees (first_name, last_name, position, email, phone_number, is_active, user_id, workplace_id) "
+        "SELECT 'First' || i, 'Last' || i, 'Barista', 'bench-stats-' || i || '@example.com', "
+        "'+99' || lpad(i::text, 10, '0'), true, :user_id, :workplace_id FROM generate_series(1, :employees) i"
+    ), {"user_id": user_id, "workplace_id": workplace_id, "employees": employees})
+    # one work day per employee and day, skipping some days off
+    await connection.execute(text(
+        "INSERT INTO work_days (employee_id, work_date, total_duration) "
+        "SELECT e.id, current_date - d, make_interval(mins => 240 + (e.id * 7 + d * 13) % 300) "
+        "FROM employees e CROSS JOIN generate_series(0, :days - 1) d "
+        "WHERE e.user_id = :user_id AND (e.id + d) % 7 <> 0"
+    ), {"user_id": user_id, "days": days})
+
+    for model, period_column, unit in ROLLUP_PERIODS:
+        period_start = func.date_trunc(unit, WorkDay.work_date).cast(WorkDay.work_date.type)
+        await connection.execute(
+            model.__table__.insert().from_select(
+                ["employee_id", period_column, "total_duration"],
+                select(WorkDay.employee_id, period_start, func.sum(WorkDay.total_duration))
+                .join(Employee, Employee.id == WorkDay.employee_id)
+                .where(Employee.user_id == user_id)
+                .group_by(WorkDay.employee_id, period_start),
+            )
+        )
+    await connection.execute(text("ANALYZE employees, work_days, employee_week_totals, employee_month_totals"))
+    return user_id
+
+
+def queries(user_id: int, today: date) -> dict:
+    start_of_week = today - timedelta(days=today.weekday())
+    start_of_month = today.replace(day=1)
+
+    def correlated_sum(condition):
+        return (
+            select(func.sum(WorkDay.total_duration))
+            .where(WorkDay.employee_id == Employee.id, condition)
+            .correlate(Employee)
+            .scalar_subquery()
+        )
+
+    stats = EmployeeService.work_stats_subquery(
+        today, WorkDay.employee_id.in_(select(Employee.id).where(Employee.user_id == user_id))
+    )
+    return {
+        "correlated": select(
+            Employee.id,
+            correlated_sum(WorkDay.work_date == today),
+            correlated_sum(WorkDay.work_date >= start_of_week),
+            correlated_sum(WorkDay.work_date >= start_of_month),
+        ).where(Employee.user_id == user_id),
+        "filter": (
+            select(Employee.id, stats.c.today, stats.c.week, stats.c.month)
+            .outerjoin(stats, stats.c.employee_id == Employee.id)
+            .where(Employee.user_id == user_id)
+        ),
+        "rollups": (
+            select(
+                Employee.id, WorkDay.total_duration, EmployeeWeekTotal.total_duration, EmployeeMonthTotal.total_duration
+            )
+            .outerjoin(WorkDay, and_(WorkDay.employee_id == Employee.id, WorkDay.work_date == today))
+            .outerjoin(EmployeeWeekTotal, and_(
+                EmployeeWeekTotal.employee_id == Employee.id, EmployeeWeekTotal.week_start == start_of_week
+            ))
+            .outerjoin(EmployeeMonthTotal, and_(
+                EmployeeMonthTotal.employee_id == Employee.id, EmployeeMonthTotal.month_start == start_of_month
+            ))
+            .where(Employee.user_id == user_id)
+        ),
+    }
+
+
+def normalized(rows) -> list[tuple]:
+    return sorted((row[0], *(value or timedelta() for value in row[1:])) for row in rows)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Employee work stats query benchmark.")
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    async with engine.connect() as connection:
+        started = time.perf_counter()
+        user_id = await generate(connection, args.employees, args.days)
+        print(f"generated {args.employees:,} employees x {args.days} days in {time.perf_counter() - started:.0f} s")
+
+        results = {}
+        for name, query in queries(user_id, date.today()).items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rows = (await connection.execute(query)).all()
+                timings.append(time.perf_counter() - started)
+            results[name] = normalized(rows)
+            print(f"{name:<11} {len(rows):,} rows, median {statistics.median(timings) * 1000:8.0f} ms")
+
+        assert results["correlated"] == results["filter"] == results["rollups"], "totals differ"
+        print("identical totals")
+        await connection.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Event-loop lag during a burst of argon2 password checks.
+
+Runs `--logins` concurrent verifications the former way (argon2 inline in
+the coroutine) and through `hashing_pool`, while a probe coroutine that
+should wake up every 5 ms records how late it actually wakes up. That
+delay is what every clock-in on the worker waits on top of its own work.
+
+Usage:
+    python -m benchmarks.login_storm [--logins N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.utils.hashing import hashing_pool, pwd_context
+
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: list[float], done: asyncio.Event) -> None:
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def inline_verify(password: str, hashed: str) -> bool:
+    return pwd_context.verify(password, hashed)
+
+
+async def pooled_verify(password: str, hashed: str) -> bool:
+    return await hashing_pool.run(pwd_context.verify, password, hashed)
+
+
+async def storm(verify, logins: int, hashed: str) -> tuple[float, list[float]]:
+    lags = []
+    done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, done))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify("password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+
+    done.set()
+    await probe_task
+    return elapsed, lags
+
+
+def report(name: str, elapsed: float, lags: list[float]) -> None:
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:<8} total {elapsed * 1000:7.0f} ms | loop lag median {statistics.median(lags_ms):6.1f} ms, "
+        f"p99 {p99:6.1f} ms, max {lags_ms[-1]:6.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Event-loop lag under a login storm.")
+    parser.add_argument("--logins", type=int, default=20)
+    args = parser.parse_args()
+
+    hashed = pwd_context.hash("password")
+    report("inline", *await storm(inline_verify, args.logins, hashed))
+    report("pooled", *await storm(pooled_verify, args.logins, hashed))
+    print(hashing_pool.stats())
+    hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark of the payroll computation.
+
+Generates a month of sessions for 100k employees, times the vectorized
+computation and checks it against a plain Python loop on a sample.
+
+Usage:
+    python -m benchmarks.payroll [--employees N] [--days N] [--check N]
+"""
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from src.employee.payroll import PayrollSessions, compute_payroll, DAY, NIGHT_START, NIGHT_END
+from src.employee.schemas import PayrollParamsSchema
+
+
+def generate_sessions(employees: int, days: int, seed: int = 0) -> PayrollSessions:
+    """Return one or two sessions per employee and day, some of them at night."""
+    rng = np.random.default_rng(seed)
+    first_day = (date(2026, 9, 1) - date(1970, 1, 1)).days
+
+    employee_ids = np.repeat(np.arange(1, employees + 1), days)
+    work_days = np.tile(np.arange(first_day, first_day + days), employees)
+    # every fifth employee works late shifts that run past midnight
+    shift_start = np.where(employee_ids % 5 == 0, 18 * 3600, 8 * 3600)
+    starts = work_days * DAY + shift_start + rng.integers(-3600, 3600, len(work_days))
+    ends = starts + rng.integers(4 * 3600, 10 * 3600, len(work_days))
+
+    # a second, short session on a third of the days
+    extra = rng.random(len(work_days)) < 0.33
+    extra_starts = ends[extra] + 1800
+    extra_ends = extra_starts + rng.integers(1800, 3 * 3600, int(extra.sum()))
+
+    starts = np.concatenate([starts, extra_starts])
+    ends = np.concatenate([ends, extra_ends])
+    shuffled = rng.permutation(len(starts))
+    return PayrollSessions(
+        employee_ids=np.concatenate([employee_ids, employee_ids[extra]])[shuffled],
+        days=np.concatenate([work_days, work_days[extra]])[shuffled],
+        starts=starts[shuffled],
+        ends=ends[shuffled],
+        durations=(ends - starts)[shuffled],
+    )
+
+
+def compute_payroll_loop(sessions: PayrollSessions, params: PayrollParamsSchema, employee_id: int) -> dict:
+    """Reference computation for one employee, second by second arithmetic per session."""
+    step = params.rounding_minutes * 60
+    day_totals: dict[int, int] = {}
+    night = weekend = count = 0
+    for i in np.flatnonzero(sessions.employee_ids == employee_id):
+        start, end, duration = int(sessions.starts[i]), int(sessions.ends[i]), int(sessions.durations[i])
+        if step:
+            duration = {"up": -(-duration // step), "down": duration // step}.get(
+                params.rounding, (duration + step // 2) // step
+            ) * step
+        session_night = session_weekend = 0
+        moment = start
+        while moment < end:
+            boundary = min(end, (moment // 3600 + 1) * 3600)
+            hour = moment % DAY
+            if hour >= NIGHT_START or hour < NIGHT_END:
+                session_night += boundary - moment
+            if date.fromordinal(date(1970, 1, 1).toordinal() + moment // DAY).weekday() >= 5:
+                session_weekend += boundary - moment
+            moment = boundary
+        night += min(session_night, duration)
+        weekend += min(session_weekend, duration)
+        day = int(sessions.days[i])
+        day_totals[day] = day_totals.get(day, 0) + duration
+        count += 1
+
+    threshold = int(params.daily_overtime_hours * 3600)
+    total = sum(day_totals.values())
+    overtime = sum(max(seconds - threshold, 0) for seconds in day_totals.values())
+    return {"sessions": count, "total": total, "overtime": overtime, "night": night, "weekend": weekend}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Payroll computation benchmark.")
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--check", type=int, default=200, help="Employees checked against the loop.")
+    args = parser.parse_args()
+
+    sessions = generate_sessions(args.employees, args.days)
+    params = PayrollParamsSchema(
+        date_from=date(2026, 9, 1), date_to=date(2026, 9, 30),
+        hourly_rate=20, rounding_minutes=15, rounding="nearest",
+    )
+    print(f"{len(sessions.employee_ids):,} sessions of {args.employees:,} employees")
+
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        totals = compute_payroll(sessions, params)
+        timings.append(time.perf_counter() - started)
+    print(f"vectorized: best {min(timings) * 1000:.0f} ms, median {sorted(timings)[2] * 1000:.0f} ms")
+
+    rows = {employee_id: index for index, employee_id in enumerate(totals.employee_ids.tolist())}
+    sample = np.random.default_rng(1).choice(totals.employee_ids, min(args.check, len(rows)), replace=False)
+    started = time.perf_counter()
+    for employee_id in sample.tolist():
+        expected = compute_payroll_loop(sessions, params, employee_id)
+        index = rows[employee_id]
+        actual = {
+            "sessions": int(totals.sessions[index]), "total": int(totals.total[index]),
+            "overtime": int(totals.overtime[index]), "night": int(totals.night[index]),
+            "weekend": int(totals.weekend[index]),
+        }
+        assert actual == expected, (employee_id, actual, expected)
+    per_employee = (time.perf_counter() - started) / len(sample)
+    print(f"loop: {per_employee * 1000:.1f} ms per employee, "
+          f"~{per_employee * args.employees:.0f} s for all; {len(sample)} employees match")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
@@ -24,6 +25,18 @@ DB_URL = (
 
 alembic_config.set_main_option("sqlalchemy.url", DB_URL)
 
+# partitions are managed by src.employee.partitions, not by the models
+PARTITION_TABLE = re.compile(r"^(work_days|work_sessions)_(p\d{4}_\d{2}|default)$")
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Skip partitions and the foreign keys Postgres adds for them when comparing the schema."""
+    if type_ == "table":
+        return not PARTITION_TABLE.match(name)
+    if type_ == "foreign_key_constraint" and reflected:
+        return not PARTITION_TABLE.match(object.referred_table.name)
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -41,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,7 +78,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,61 @@
+"""Add employee_id to work sessions
+
+Revision ID: 3b9f1c2d7a41
+Revises: cf4d62c9c796
+Create Date: 2026-10-18 10:12:41.218334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f1c2d7a41'
+down_revision: Union[str, Sequence[str], None] = 'cf4d62c9c796'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('work_sessions', sa.Column('employee_id', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE work_sessions
+        SET employee_id = work_days.employee_id
+        FROM work_days
+        WHERE work_days.id = work_sessions.work_day_id
+        """
+    )
+    # keep only the latest open session per employee, older ones are closed without duration
+    op.execute(
+        """
+        UPDATE work_sessions
+        SET end_time = start_time
+        WHERE end_time IS NULL
+          AND id NOT IN (
+              SELECT DISTINCT ON (employee_id) id
+              FROM work_sessions
+              WHERE end_time IS NULL
+              ORDER BY employee_id, start_time DESC
+          )
+        """
+    )
+    op.alter_column('work_sessions', 'employee_id', nullable=False)
+    op.create_foreign_key('work_sessions_employee_id_fkey', 'work_sessions', 'employees', ['employee_id'], ['id'], ondelete='CASCADE')
+    op.create_index(
+        'uq_employee_open_session',
+        'work_sessions',
+        ['employee_id'],
+        unique=True,
+        postgresql_where=sa.text('end_time IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_employee_open_session', table_name='work_sessions', postgresql_where=sa.text('end_time IS NULL'))
+    op.drop_constraint('work_sessions_employee_id_fkey', 'work_sessions', type_='foreignkey')
+    op.drop_column('work_sessions', 'employee_id')
@@ -0,0 +1,59 @@
+"""Add employee rollup tables
+
+Revision ID: 8e24d0b5c6f3
+Revises: 3b9f1c2d7a41
+Create Date: 2026-10-18 11:04:17.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e24d0b5c6f3'
+down_revision: Union[str, Sequence[str], None] = '3b9f1c2d7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_week_totals',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('total_duration', sa.Interval(), server_default='0 hours', nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'week_start')
+    )
+    op.create_table('employee_month_totals',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('month_start', sa.Date(), nullable=False),
+    sa.Column('total_duration', sa.Interval(), server_default='0 hours', nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'month_start')
+    )
+    # backfill from existing work days
+    op.execute(
+        """
+        INSERT INTO employee_week_totals (employee_id, week_start, total_duration)
+        SELECT employee_id, date_trunc('week', work_date)::date, sum(total_duration)
+        FROM work_days
+        GROUP BY 1, 2
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO employee_month_totals (employee_id, month_start, total_duration)
+        SELECT employee_id, date_trunc('month', work_date)::date, sum(total_duration)
+        FROM work_days
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('employee_month_totals')
+    op.drop_table('employee_week_totals')
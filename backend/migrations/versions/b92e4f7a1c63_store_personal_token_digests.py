@@ -0,0 +1,63 @@
+"""Store personal token digests
+
+Revision ID: b92e4f7a1c63
+Revises: e5b7d3a9c104
+Create Date: 2026-10-18 23:05:31.744120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.employee.utils import digest_personal_token
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b92e4f7a1c63'
+down_revision: Union[str, Sequence[str], None] = 'e5b7d3a9c104'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('employees', sa.Column('personal_token_digest', sa.String(length=64), nullable=True))
+
+    # digests need PERSONAL_TOKEN_KEY, so they are computed here rather than in SQL
+    connection = op.get_bind()
+    employees = sa.table(
+        'employees',
+        sa.column('id', sa.Integer),
+        sa.column('personal_token', sa.String),
+        sa.column('personal_token_digest', sa.String),
+    )
+    last_id = 0
+    while rows := connection.execute(
+        sa.select(employees.c.id, employees.c.personal_token)
+        .where(employees.c.id > last_id, employees.c.personal_token.is_not(None))
+        .order_by(employees.c.id)
+        .limit(BATCH_SIZE)
+    ).all():
+        connection.execute(
+            employees.update()
+            .where(employees.c.id == sa.bindparam('employee_id'))
+            .values(personal_token_digest=sa.bindparam('digest')),
+            [{'employee_id': employee_id, 'digest': digest_personal_token(token)} for employee_id, token in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(op.f('ix_employees_personal_token_digest'), 'employees', ['personal_token_digest'], unique=True)
+    op.drop_constraint(op.f('employees_personal_token_key'), 'employees', type_='unique')
+    op.drop_column('employees', 'personal_token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # plaintext tokens cannot be recovered from digests, they have to be issued again
+    op.add_column('employees', sa.Column('personal_token', sa.String(length=255), nullable=True))
+    op.create_unique_constraint(op.f('employees_personal_token_key'), 'employees', ['personal_token'])
+    op.drop_index(op.f('ix_employees_personal_token_digest'), table_name='employees')
+    op.drop_column('employees', 'personal_token_digest')
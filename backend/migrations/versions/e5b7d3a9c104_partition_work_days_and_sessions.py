@@ -0,0 +1,142 @@
+"""Partition work days and sessions
+
+Revision ID: e5b7d3a9c104
+Revises: c81f4a0d9e25
+Create Date: 2026-10-18 19:12:40.208417
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7d3a9c104'
+down_revision: Union[str, Sequence[str], None] = 'c81f4a0d9e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# keep in sync with src.employee.partitions.PARTITION_MONTHS_AHEAD
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_tables(partitioned: bool) -> None:
+    partition_by = " PARTITION BY RANGE (work_date)" if partitioned else ""
+    op.execute(f"""
+        CREATE TABLE work_days (
+            id integer NOT NULL DEFAULT nextval('work_days_id_seq'),
+            work_date date NOT NULL,
+            employee_id integer NOT NULL REFERENCES employees (id) ON DELETE CASCADE,
+            total_duration interval NOT NULL DEFAULT '0 hours'
+        ){partition_by}
+    """)
+    op.execute(f"""
+        CREATE TABLE work_sessions (
+            id integer NOT NULL DEFAULT nextval('work_sessions_id_seq'),
+            work_day_id integer NOT NULL,
+            {"work_date date NOT NULL," if partitioned else ""}
+            employee_id integer NOT NULL REFERENCES employees (id) ON DELETE CASCADE,
+            start_time timestamp with time zone NOT NULL,
+            end_time timestamp with time zone,
+            needs_review boolean NOT NULL DEFAULT false
+        ){partition_by}
+    """)
+    op.execute("ALTER SEQUENCE work_days_id_seq OWNED BY work_days.id")
+    op.execute("ALTER SEQUENCE work_sessions_id_seq OWNED BY work_sessions.id")
+
+
+def rename_old_tables() -> None:
+    # the sequences would otherwise be dropped together with the old tables
+    op.execute("ALTER SEQUENCE work_days_id_seq OWNED BY NONE")
+    op.execute("ALTER SEQUENCE work_sessions_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE work_sessions RENAME TO work_sessions_old")
+    op.execute("ALTER TABLE work_days RENAME TO work_days_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    first = op.get_bind().exec_driver_sql(
+        "SELECT date_trunc('month', min(work_date))::date FROM work_days"
+    ).scalar()
+    current = date.today().replace(day=1)
+    month = min(first or current, current)
+
+    rename_old_tables()
+    create_tables(partitioned=True)
+
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        bounds = f"FROM ('{month}') TO ('{add_months(month, 1)}')"
+        op.execute(f"CREATE TABLE work_days_p{month:%Y_%m} PARTITION OF work_days FOR VALUES {bounds}")
+        op.execute(f"CREATE TABLE work_sessions_p{month:%Y_%m} PARTITION OF work_sessions FOR VALUES {bounds}")
+        month = add_months(month, 1)
+    op.execute("CREATE TABLE work_days_default PARTITION OF work_days DEFAULT")
+    op.execute("CREATE TABLE work_sessions_default PARTITION OF work_sessions DEFAULT")
+
+    op.execute("""
+        INSERT INTO work_days (id, work_date, employee_id, total_duration)
+        SELECT id, work_date, employee_id, total_duration FROM work_days_old
+    """)
+    op.execute("""
+        INSERT INTO work_sessions (id, work_day_id, work_date, employee_id, start_time, end_time, needs_review)
+        SELECT s.id, s.work_day_id, d.work_date, s.employee_id, s.start_time, s.end_time, s.needs_review
+        FROM work_sessions_old s JOIN work_days_old d ON d.id = s.work_day_id
+    """)
+    op.execute("DROP TABLE work_sessions_old")
+    op.execute("DROP TABLE work_days_old")
+
+    # constraints and indexes are built once the data is in place
+    op.execute("ALTER TABLE work_days ADD CONSTRAINT work_days_pkey PRIMARY KEY (id, work_date)")
+    op.execute("ALTER TABLE work_days ADD CONSTRAINT uq_employee_day UNIQUE (work_date, employee_id)")
+    op.execute("CREATE INDEX ix_work_days_employee_date ON work_days (employee_id, work_date)")
+    op.execute("ALTER TABLE work_sessions ADD CONSTRAINT work_sessions_pkey PRIMARY KEY (id, work_date)")
+    op.execute("""
+        ALTER TABLE work_sessions ADD CONSTRAINT work_sessions_work_day_id_work_date_fkey
+        FOREIGN KEY (work_day_id, work_date) REFERENCES work_days (id, work_date) ON DELETE CASCADE
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_employee_open_session ON work_sessions (employee_id, work_date) WHERE end_time IS NULL")
+    op.execute("CREATE INDEX ix_work_sessions_needs_review ON work_sessions (employee_id) WHERE needs_review")
+    op.execute("CREATE INDEX ix_work_sessions_work_day ON work_sessions (work_day_id, work_date)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rename_old_tables()
+    create_tables(partitioned=False)
+
+    op.execute("""
+        INSERT INTO work_days (id, work_date, employee_id, total_duration)
+        SELECT id, work_date, employee_id, total_duration FROM work_days_old
+    """)
+    op.execute("""
+        INSERT INTO work_sessions (id, work_day_id, employee_id, start_time, end_time, needs_review)
+        SELECT id, work_day_id, employee_id, start_time, end_time, needs_review FROM work_sessions_old
+    """)
+    # drops the partitions as well
+    op.execute("DROP TABLE work_sessions_old")
+    op.execute("DROP TABLE work_days_old")
+
+    op.execute("ALTER TABLE work_days ADD CONSTRAINT work_days_pkey PRIMARY KEY (id)")
+    op.execute("ALTER TABLE work_days ADD CONSTRAINT uq_employee_day UNIQUE (work_date, employee_id)")
+    op.execute("CREATE INDEX ix_work_days_employee_date ON work_days (employee_id, work_date)")
+    op.execute("ALTER TABLE work_sessions ADD CONSTRAINT work_sessions_pkey PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE work_sessions ADD CONSTRAINT work_sessions_work_day_id_fkey
+        FOREIGN KEY (work_day_id) REFERENCES work_days (id) ON DELETE CASCADE
+    """)
+    # keeps only the latest open session of an employee
+    op.execute("""
+        UPDATE work_sessions s SET end_time = s.start_time
+        WHERE s.end_time IS NULL AND EXISTS (
+            SELECT 1 FROM work_sessions o
+            WHERE o.employee_id = s.employee_id AND o.end_time IS NULL AND o.start_time > s.start_time
+        )
+    """)
+    op.execute("CREATE UNIQUE INDEX uq_employee_open_session ON work_sessions (employee_id) WHERE end_time IS NULL")
+    op.execute("CREATE INDEX ix_work_sessions_needs_review ON work_sessions (employee_id) WHERE needs_review")
@@ -3,6 +3,7 @@ from fastadmin import register, SqlAlchemyModelAdmin
 from sqlalchemy import select, update
 
 from src.database import new_session
+from src.users.cache import revoked_users
 from src.users.models import User
 from src.users.utils import verify_password, hash_password
 
@@ -19,9 +20,9 @@ class UserAdmin(SqlAlchemyModelAdmin):
     async def authenticate(self, email: str, password: str) -> int | None:
         """Authenticate admin superuser."""
         async with new_session() as session:
-            stmt = select(User).where(User.email == email, User.is_superuser == True)
+            stmt = select(User).where(User.email == email, User.is_superuser == True, User.is_active == True)
             user = await session.scalar(stmt)
-            if user and verify_password(password, user.password):
+            if user and await verify_password(password, user.password):
                 return user.id
             return None
 
@@ -42,11 +43,16 @@ class UserAdmin(SqlAlchemyModelAdmin):
                 update(User).where(User.id == obj.id).values(**values)
             )
             await session.commit()
+        # also drops cached profile data of the user on every worker
+        if obj.is_active:
+            revoked_users.restore(obj.id)
+        else:
+            revoked_users.revoke(obj.id)
 
     async def change_password(self, id: int, password: str) -> None:
         """Change user password securely."""
         async with new_session() as session:
-            hashed = hash_password(password)
+            hashed = await hash_password(password)
             await session.execute(
                 update(User).where(User.id == id).values(password=hashed)
             )
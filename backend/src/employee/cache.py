@@ -0,0 +1,258 @@
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Hashable
+
+from decouple import config
+
+
+@dataclass(frozen=True, slots=True)
+class CachedEmployee:
+    """
+    Slim employee record resolved from a personal token.
+
+    Attributes:
+        id (int): Employee id.
+        user_id (int): Employer (user) id.
+        workplace_id (int): Work place id.
+        is_active (bool): Whether the employee is active or not.
+    """
+    id: int
+    user_id: int
+    workplace_id: int
+    is_active: bool
+
+
+class TokenCache:
+    """
+    Bounded LRU cache with TTL mapping personal tokens to employees.
+
+    Entries are kept per process, so changes made elsewhere (admin panel,
+    other workers) become visible at the latest after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, CachedEmployee]] = OrderedDict()
+
+    def get(self, token: str) -> CachedEmployee | None:
+        """Return cached employee for token or None."""
+        entry = self._entries.get(token)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, token: str, employee: CachedEmployee) -> None:
+        """Store employee for token, evicting the least recently used entry."""
+        self._entries[token] = (time.monotonic() + self.ttl, employee)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, token: str | None) -> None:
+        """Drop cached entry for token."""
+        if token:
+            self._entries.pop(token, None)
+
+    def invalidate_employee(self, employee_id: int) -> None:
+        """Drop every cached entry pointing to employee."""
+        for token, (_, employee) in list(self._entries.items()):
+            if employee.id == employee_id:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+token_cache = TokenCache(
+    maxsize=config("EMPLOYEE_TOKEN_CACHE_SIZE", default=10000, cast=int),
+    ttl=config("EMPLOYEE_TOKEN_CACHE_TTL", default=300, cast=float),
+)
+
+
+def estimate_size(value: Any) -> int:
+    """Return approximate memory footprint of value and its items in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class ReportCache:
+    """
+    Cache interface for computed per-employee reports.
+
+    Every entry belongs to one employee and covers the inclusive date range
+    `start`..`end`, so writes to a work day drop exactly the reports that
+    include it. This base class caches nothing; backends override it.
+    """
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return cached report for key or None."""
+        return None
+
+    def set(self, key: Hashable, value: Any, employee_id: int, start: date, end: date) -> None:
+        """Store report of employee covering start..end."""
+
+    def invalidate(self, employee_id: int, day: date | None = None) -> None:
+        """Drop reports of employee covering day, or all of them if day is None."""
+
+    def clear(self) -> None:
+        """Drop all entries."""
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters."""
+        return {"backend": "none"}
+
+
+class LRUReportCache(ReportCache):
+    """
+    Bounded in-process LRU report cache.
+
+    Reports of periods that ended before today only change when past
+    sessions are written, which invalidates them on every worker through
+    the live hub (see `invalidate_caches`), so they are kept for
+    `closed_ttl` seconds. Reports including today are kept for `open_ttl`
+    seconds, bounding staleness when an invalidation was missed.
+    """
+
+    def __init__(self, maxsize: int, open_ttl: float, closed_ttl: float):
+        self.maxsize = maxsize
+        self.open_ttl = open_ttl
+        self.closed_ttl = closed_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # key -> (expires at, employee id, start, end, size, value)
+        self._entries: OrderedDict[Hashable, tuple[float, int, date, date, int, Any]] = OrderedDict()
+        self._by_employee: dict[int, set[Hashable]] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[5]
+
+    def set(self, key: Hashable, value: Any, employee_id: int, start: date, end: date) -> None:
+        if key in self._entries:
+            self._drop(key)
+
+        ttl = self.closed_ttl if end < date.today() else self.open_ttl
+        size = estimate_size(value)
+        self._entries[key] = (time.monotonic() + ttl, employee_id, start, end, size, value)
+        self._by_employee.setdefault(employee_id, set()).add(key)
+        self.bytes += size
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, employee_id: int, day: date | None = None) -> None:
+        for key in list(self._by_employee.get(employee_id, ())):
+            _, _, start, end, _, _ = self._entries[key]
+            if day is None or start <= day <= end:
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_employee.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def _drop(self, key: Hashable) -> None:
+        _, employee_id, _, _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        keys = self._by_employee[employee_id]
+        keys.discard(key)
+        if not keys:
+            del self._by_employee[employee_id]
+
+
+def lru_report_cache() -> LRUReportCache:
+    """Return in-process report cache configured from the environment."""
+    open_ttl = config("REPORT_CACHE_OPEN_TTL", default=60, cast=float)
+    closed_ttl = config("REPORT_CACHE_CLOSED_TTL", default=86400, cast=float)
+    # without the live hub bridge, writes of other workers never invalidate entries here
+    if not config("LIVE_NOTIFY_BRIDGE", default=True, cast=bool):
+        closed_ttl = min(closed_ttl, open_ttl)
+    return LRUReportCache(maxsize=config("REPORT_CACHE_SIZE", default=10000, cast=int), open_ttl=open_ttl, closed_ttl=closed_ttl)
+
+
+REPORT_CACHE_BACKENDS = {
+    "memory": lru_report_cache,
+    "none": ReportCache,
+}
+
+report_cache: ReportCache = REPORT_CACHE_BACKENDS[config("REPORT_CACHE_BACKEND", default="memory")]()
+
+
+def invalidate_caches(user_id: int, event: dict) -> None:
+    """
+    Drop cache entries made stale by a live hub event of any worker.
+
+    Clock events drop the reports of their `work_date`. Cache events name
+    the `work_dates` whose reports changed, or set `all_reports`, and set
+    `token_changed` once the employee's personal token stopped working.
+
+    Args:
+        user_id (int): Employer (user) id.
+        event (dict): Event published by the live hub.
+    """
+    employee_id = event["employee_id"]
+    if "work_date" in event:
+        report_cache.invalidate(employee_id, date.fromisoformat(event["work_date"]))
+    for day in event.get("work_dates", ()):
+        report_cache.invalidate(employee_id, date.fromisoformat(day))
+    if event.get("all_reports"):
+        report_cache.invalidate(employee_id)
+    if event.get("token_changed"):
+        token_cache.invalidate_employee(employee_id)
+
+
+async def reset_caches() -> None:
+    """Drop all report and token cache entries, invalidations may have been missed while the bridge was down."""
+    report_cache.clear()
+    token_cache.clear()
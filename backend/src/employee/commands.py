@@ -0,0 +1,193 @@
+"""
+Maintenance commands for employee data.
+
+Usage:
+    python -m src.employee.commands rebuild-rollups [--since YYYY-MM-DD]
+    python -m src.employee.commands auto-close-sessions [--chunk-size N]
+    python -m src.employee.commands create-partitions [--months-ahead N]
+    python -m src.employee.commands archive-partitions [--retention-months N] [--output-dir DIR]
+    python -m src.employee.commands generate-thumbnails [--workers N]
+    python -m src.employee.commands fingerprint-photos
+    python -m src.employee.commands precompress-static [--directory DIR]
+    python -m src.employee.commands replay-work-events [--file PATH] [--batch-size N]
+"""
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from PIL import Image
+from sqlalchemy import select, update
+
+from src.database import new_session, engine
+from src.employee.jobs import AUTO_CLOSE_CHUNK_SIZE
+from src.employee.models import Employee
+from src.employee.partitions import (
+    PARTITION_MONTHS_AHEAD, ARCHIVE_RETENTION_MONTHS, ARCHIVE_DIR, create_future_partitions, archive_partitions
+)
+from src.employee.photos import (
+    PHOTO_URL_PREFIX, FINGERPRINTED_PHOTO, THUMBNAIL_WORKERS, fingerprint_photo, make_thumbnails
+)
+from src.employee.queue import work_event_writer
+from src.employee.schemas import WorkEventSchema, WorkEventBatchSchema
+from src.employee.service import EmployeeService
+from src.utils.static import precompress_directory
+
+
+async def rebuild_rollups(since: date | None) -> None:
+    """Recompute weekly and monthly employee rollups."""
+    async with new_session() as session:
+        await EmployeeService.rebuild_rollups(session, since)
+    print(f"Rollups rebuilt{f' since {since}' if since else ''}.")
+
+
+async def auto_close_sessions(chunk_size: int) -> None:
+    """Close forgotten work sessions and flag them for review."""
+    closed = await EmployeeService.close_forgotten_sessions(chunk_size)
+    print(f"{closed} work sessions auto-closed.")
+
+
+async def create_partitions(months_ahead: int) -> None:
+    """Create missing monthly partitions of work days and sessions."""
+    created = await create_future_partitions(months_ahead)
+    print(f"{len(created)} partitions created.")
+
+
+async def archive_old_partitions(retention_months: int, output_dir: str) -> None:
+    """Move partitions older than the retention window to compressed dumps."""
+    async with new_session() as session:
+        paths = await archive_partitions(session, retention_months, output_dir)
+    for path in paths:
+        print(f"Archived {path}.")
+    print(f"{len(paths)} partitions archived.")
+
+
+async def generate_thumbnails(workers: int) -> None:
+    """Create missing thumbnails of every uploaded profile photo."""
+    async with new_session() as session:
+        urls = (await session.execute(
+            select(Employee.profile_photo).distinct().where(Employee.profile_photo.startswith(f"{PHOTO_URL_PREFIX}/"))
+        )).scalars().all()
+    names = [url.rsplit("/", 1)[-1] for url in urls]
+
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(make_thumbnails, name) for name in names}
+        for name, future in futures.items():
+            try:
+                written += future.result()
+            except (OSError, Image.DecompressionBombError) as error:
+                print(f"Skipped {name}: {error}")
+    print(f"{written} thumbnails created for {len(names)} photos.")
+
+
+async def fingerprint_photos() -> None:
+    """Move profile photos stored under random names to content-hash names."""
+    async with new_session() as session:
+        urls = (await session.execute(
+            select(Employee.profile_photo).distinct().where(Employee.profile_photo.startswith(f"{PHOTO_URL_PREFIX}/"))
+        )).scalars().all()
+        renamed = 0
+        for url in urls:
+            if FINGERPRINTED_PHOTO.fullmatch(url.removeprefix("/static/")):
+                continue
+            try:
+                name = fingerprint_photo(url.rsplit("/", 1)[-1])
+                make_thumbnails(name)
+            except (OSError, Image.DecompressionBombError) as error:
+                print(f"Skipped {url}: {error}")
+                continue
+            await session.execute(
+                update(Employee).where(Employee.profile_photo == url).values(profile_photo=f"{PHOTO_URL_PREFIX}/{name}")
+            )
+            await session.commit()
+            renamed += 1
+    # old files stay in place for pages still showing their URL
+    print(f"{renamed} photos fingerprinted.")
+
+
+def precompress_static(directory: str) -> None:
+    """Write gzip variants of compressible static files."""
+    print(f"{precompress_directory(directory)} gzip variants written.")
+
+
+async def replay_work_events(path: str, batch_size: int) -> None:
+    """Persist clock events the write-behind queue could not write to the database."""
+    if not os.path.exists(path):
+        print(f"No dead-letter file {path}.")
+        return
+    # the API keeps appending to a new file meanwhile
+    replaying = f"{path}.replaying"
+    os.replace(path, replaying)
+    with open(replaying, encoding="utf-8") as file:
+        events = [WorkEventSchema.model_validate_json(line) for line in file if line.strip()]
+
+    applied = 0
+    for start in range(0, len(events), batch_size):
+        batch = events[start:start + batch_size]
+        async with new_session() as session:
+            results = await EmployeeService.ingest_work_events(session, WorkEventBatchSchema.model_construct(events=batch))
+        for result in results:
+            if result.status == "applied":
+                applied += 1
+            else:
+                event = batch[result.index]
+                print(f"Rejected {event.type} event of {event.timestamp} for token {event.token[:4]}...: {result.detail}")
+    os.remove(replaying)
+    print(f"{applied} of {len(events)} clock events applied.")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Employee maintenance commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-rollups", help="Recompute weekly and monthly rollups from work days.")
+    rebuild.add_argument("--since", type=date.fromisoformat, default=None, help="Only rebuild periods from this date.")
+
+    auto_close = commands.add_parser("auto-close-sessions", help="Close forgotten work sessions and flag them for review.")
+    auto_close.add_argument("--chunk-size", type=int, default=AUTO_CLOSE_CHUNK_SIZE, help="Sessions closed per transaction.")
+
+    partitions = commands.add_parser("create-partitions", help="Create missing monthly partitions ahead of time.")
+    partitions.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD, help="Future months to cover.")
+
+    archive = commands.add_parser("archive-partitions", help="Dump old partitions to NDJSON files and drop them.")
+    archive.add_argument("--retention-months", type=int, default=ARCHIVE_RETENTION_MONTHS, help="Months to keep, current month included.")
+    archive.add_argument("--output-dir", default=ARCHIVE_DIR, help="Directory for the .ndjson.gz dumps.")
+
+    thumbnails = commands.add_parser("generate-thumbnails", help="Create missing thumbnails of uploaded profile photos.")
+    thumbnails.add_argument("--workers", type=int, default=THUMBNAIL_WORKERS, help="Processes resizing photos.")
+
+    commands.add_parser("fingerprint-photos", help="Rename profile photos uploaded before content-hash names.")
+
+    precompress = commands.add_parser("precompress-static", help="Write gzip variants of compressible static files.")
+    precompress.add_argument("--directory", default="static", help="Static files directory.")
+
+    replay = commands.add_parser("replay-work-events", help="Persist clock events the write-behind queue failed to write.")
+    replay.add_argument("--file", default=work_event_writer.dead_letter, help="Dead-letter NDJSON file.")
+    replay.add_argument("--batch-size", type=int, default=work_event_writer.batch_size, help="Events applied per transaction.")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "rebuild-rollups":
+            await rebuild_rollups(args.since)
+        elif args.command == "auto-close-sessions":
+            await auto_close_sessions(args.chunk_size)
+        elif args.command == "create-partitions":
+            await create_partitions(args.months_ahead)
+        elif args.command == "archive-partitions":
+            await archive_old_partitions(args.retention_months, args.output_dir)
+        elif args.command == "generate-thumbnails":
+            await generate_thumbnails(args.workers)
+        elif args.command == "fingerprint-photos":
+            await fingerprint_photos()
+        elif args.command == "precompress-static":
+            precompress_static(args.directory)
+        elif args.command == "replay-work-events":
+            await replay_work_events(args.file, args.batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from decouple import config
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Runs a coroutine function in the background every `interval` seconds.
+
+    A failed run is logged and retried on the next tick. Several workers
+    may run the same job; the job itself must tolerate that.
+
+    Attributes:
+        name (str): Job name, used for the task and in logs.
+        enabled (bool): Whether the job is started.
+    """
+
+    def __init__(self, name: str, enabled: bool, interval: float):
+        self.name = name
+        self.enabled = enabled
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+        self.runs = 0
+        self.failures = 0
+
+    async def start(self, run: Callable[[], Awaitable[object]]) -> None:
+        """Start running the job."""
+        if not self.enabled or self._task:
+            return
+        self._task = asyncio.create_task(self._loop(run), name=self.name)
+
+    async def stop(self) -> None:
+        """Stop running the job, cancelling a run in progress."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self, run: Callable[[], Awaitable[object]]) -> None:
+        while True:
+            try:
+                await run()
+            except Exception:
+                self.failures += 1
+                logger.exception(f"Periodic job {self.name} failed.")
+            self.runs += 1
+            await asyncio.sleep(self.interval)
+
+
+AUTO_CLOSE_CHUNK_SIZE = config("AUTO_CLOSE_CHUNK_SIZE", default=500, cast=int)
+
+auto_close_job = PeriodicJob(
+    name="auto-close-sessions",
+    enabled=config("AUTO_CLOSE_ENABLED", default=True, cast=bool),
+    interval=config("AUTO_CLOSE_INTERVAL_SECONDS", default=300, cast=float),
+)
+
+partition_job = PeriodicJob(
+    name="create-partitions",
+    enabled=config("PARTITION_JOB_ENABLED", default=True, cast=bool),
+    interval=config("PARTITION_CHECK_INTERVAL_SECONDS", default=86400, cast=float),
+)
+
+presence_job = PeriodicJob(
+    name="rebuild-presence",
+    enabled=config("PRESENCE_REBUILD_ENABLED", default=True, cast=bool),
+    interval=config("PRESENCE_REBUILD_INTERVAL_SECONDS", default=300, cast=float),
+)
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import Awaitable, Callable
+
+import asyncpg
+from decouple import config
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Pending live messages of one connected dashboard.
+
+    An idle subscriber costs a deque and an event; nothing runs on its
+    behalf until a message is pushed.
+    """
+    __slots__ = ("user_id", "maxsize", "messages", "dropped", "_ready")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self.messages: deque[str] = deque()
+        self.dropped = False
+        self._ready = asyncio.Event()
+
+    def push(self, message: str) -> bool:
+        """Queue message, or mark subscriber as dropped if it fell too far behind."""
+        if len(self.messages) >= self.maxsize:
+            self.dropped = True
+            self._ready.set()
+            return False
+        self.messages.append(message)
+        self._ready.set()
+        return True
+
+    async def get(self) -> str | None:
+        """Wait for the next message, None once the subscriber was dropped."""
+        while not self.messages and not self.dropped:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.dropped:
+            return None
+        return self.messages.popleft()
+
+
+class LiveHub:
+    """
+    In-process fan-out of clock deltas to dashboards of an employer.
+
+    A message is serialized once and appended to the subscriptions of its
+    employer by the publishing coroutine. With the bridge enabled, messages
+    are also sent through Postgres NOTIFY by one background task, and
+    messages of other workers received through LISTEN are fanned out
+    locally. Observers see every event, published here or elsewhere, except
+    while the bridge is disconnected; connect callbacks run after every
+    (re)connect so they can catch up. Events published for observers only
+    (e.g. cache invalidations) are not sent to dashboards.
+
+    Attributes:
+        channel (str): Postgres notification channel.
+        queue_size (int): Messages a subscriber may fall behind before it is dropped.
+    """
+
+    def __init__(self, channel: str, queue_size: int, bridge: bool, outbox_size: int):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.bridge = bridge
+        self.origin = uuid.uuid4().hex
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._observers: list[Callable[[int, dict], None]] = []
+        self._connect_callbacks: list[Callable[[], Awaitable[object]]] = []
+        self._outbox: asyncio.Queue[str] = asyncio.Queue(outbox_size)
+        self._task: asyncio.Task | None = None
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.notified = 0
+        self.received = 0
+        self.outbox_overflowed = 0
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a dashboard of employer."""
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a dashboard."""
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.user_id]
+
+    def observe(self, callback: Callable[[int, dict], None]) -> None:
+        """Call callback with employer id and event for every event of every worker."""
+        self._observers.append(callback)
+
+    def on_connect(self, callback: Callable[[], Awaitable[object]]) -> None:
+        """Await callback each time the bridge (re)connects, once it listens for notifications."""
+        self._connect_callbacks.append(callback)
+
+    def publish(self, user_id: int, event: dict, dashboards: bool = True) -> None:
+        """
+        Send event to observers and dashboards of employer in every worker.
+
+        Args:
+            user_id (int): Employer (user) id.
+            event (dict): JSON serializable event.
+            dashboards (bool): Whether dashboards receive the event, or observers alone.
+        """
+        message = json.dumps(event, default=str, separators=(",", ":"))
+        self.published += 1
+        self._notify_observers(user_id, event)
+        if dashboards:
+            self._deliver(user_id, message)
+
+        if self._task:
+            notification = {"origin": self.origin, "user_id": user_id, "message": message}
+            if not dashboards:
+                notification["dashboards"] = False
+            try:
+                self._outbox.put_nowait(json.dumps(notification))
+            except asyncio.QueueFull:
+                self.outbox_overflowed += 1
+                logger.warning("Live notification outbox is full, event not sent to other workers.")
+
+    def _notify_observers(self, user_id: int, event: dict) -> None:
+        for callback in self._observers:
+            try:
+                callback(user_id, event)
+            except Exception:
+                logger.exception(f"Live event observer {callback!r} failed.")
+
+    def _deliver(self, user_id: int, message: str) -> None:
+        for subscription in list(self._subscribers.get(user_id, ())):
+            if subscription.push(message):
+                self.delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                self.dropped += 1
+
+    async def start(self, dsn: str) -> None:
+        """Start the LISTEN/NOTIFY bridge."""
+        if not self.bridge or self._task:
+            return
+        self._task = asyncio.create_task(self._run(dsn), name="live-hub-bridge")
+
+    async def stop(self) -> None:
+        """Stop the LISTEN/NOTIFY bridge."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, dsn: str) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                await connection.add_listener(self.channel, self._on_notification)
+                logger.info(f"Live hub listening on channel {self.channel}.")
+                for callback in self._connect_callbacks:
+                    try:
+                        await callback()
+                    except Exception:
+                        logger.exception(f"Live hub connect callback {callback!r} failed.")
+                while True:
+                    try:
+                        async with asyncio.timeout(30):
+                            payload = await self._outbox.get()
+                    except TimeoutError:
+                        # keeps a silently dropped connection from going unnoticed
+                        await connection.execute("SELECT 1")
+                        continue
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+                    self.notified += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live hub bridge failed, reconnecting.")
+                await asyncio.sleep(1)
+            finally:
+                if connection is not None:
+                    connection.terminate()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        notification = json.loads(payload)
+        if notification["origin"] == self.origin:
+            return
+        self.received += 1
+        if self._observers:
+            self._notify_observers(notification["user_id"], json.loads(notification["message"]))
+        if notification.get("dashboards", True):
+            self._deliver(notification["user_id"], notification["message"])
+
+    def stats(self) -> dict:
+        """Return subscriber counts and message counters."""
+        return {
+            "bridge": self._task is not None,
+            "employers": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "notified": self.notified,
+            "received": self.received,
+            "outbox": self._outbox.qsize(),
+            "outbox_overflowed": self.outbox_overflowed,
+        }
+
+
+live_hub = LiveHub(
+    channel=config("LIVE_CHANNEL", default="employee_live"),
+    queue_size=config("LIVE_QUEUE_SIZE", default=100, cast=int),
+    bridge=config("LIVE_NOTIFY_BRIDGE", default=True, cast=bool),
+    outbox_size=config("LIVE_OUTBOX_SIZE", default=10000, cast=int),
+)
@@ -1,6 +1,7 @@
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
-from sqlalchemy import String, DateTime, func, ForeignKey, Date, Interval, UniqueConstraint
+from sqlalchemy import String, DateTime, func, ForeignKey, Date, Interval, UniqueConstraint, Index, text, \
+    ForeignKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database import Base
@@ -15,12 +16,18 @@ class WorkPlace(Base):
         id (int): Unique identifier.
         title (str): Title of the work place.
         address (str): Address of the work place.
+        auto_close_enabled (bool): Whether forgotten sessions are closed automatically.
+        auto_close_after (timedelta): Session age after which it is closed, global default if empty.
+        auto_close_credit (timedelta): Time credited for an auto-closed session, global default if empty.
     """
     __tablename__ = 'workplaces'
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     address: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    auto_close_enabled: Mapped[bool] = mapped_column(default=True, server_default=text("true"), nullable=False)
+    auto_close_after: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
+    auto_close_credit: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
 
     employees: Mapped[list["Employee"]] = relationship(back_populates="workplace", cascade="all, delete-orphan")
 
@@ -44,6 +51,7 @@ class Employee(Base):
         email (str): User email address.
         phone_number (str): User phone number.
         is_active (bool): Whether the user is active or not.
+        personal_token_digest (str): Keyed digest of the personal token, see `digest_personal_token`.
         created_at (datetime): Date and time the user was created.
         updated_at (datetime): Date and time the user was last updated.
     """
@@ -57,7 +65,7 @@ class Employee(Base):
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     phone_number: Mapped[str] = mapped_column(String(13), nullable=False, unique=True)
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
-    personal_token: Mapped[str] = mapped_column(String(255), nullable=True, unique=True)
+    personal_token_digest: Mapped[str] = mapped_column(String(64), nullable=True, unique=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, default=func.now(), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True, onupdate=func.now(), server_default=func.now())
 
@@ -70,6 +78,12 @@ class Employee(Base):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # keyset pagination of an employer's employees
+        Index("ix_employees_user_name", "user_id", "last_name", "first_name", "id"),
+        Index("ix_employees_user_created_at", "user_id", "created_at", "id"),
+    )
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -81,6 +95,8 @@ class WorkDay(Base):
     """
     Represents an employee work day entity in the DB.
 
+    The table is range partitioned by month of `work_date`.
+
     Attributes:
         id (int): Unique identifier.
         work_date (date): Work day.
@@ -89,8 +105,8 @@ class WorkDay(Base):
     """
     __tablename__ = 'work_days'
 
-    id : Mapped[int] = mapped_column(primary_key=True)
-    work_date: Mapped[date] = mapped_column(Date,nullable=False)
+    id : Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    work_date: Mapped[date] = mapped_column(Date, primary_key=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
     total_duration: Mapped[str] = mapped_column(Interval, server_default="0 hours", nullable=False)
 
@@ -99,6 +115,8 @@ class WorkDay(Base):
 
     __table_args__ = (
         UniqueConstraint('work_date', 'employee_id', name='uq_employee_day'),
+        Index('ix_work_days_employee_date', 'employee_id', 'work_date'),
+        {"postgresql_partition_by": "RANGE (work_date)"},
     )
 
     def __str__(self):
@@ -112,22 +130,97 @@ class WorkSession(Base):
     """
     Represents a work session entity in the DB.
 
+    The table is range partitioned by month of `work_date`, like work days.
+
     Attributes:
         id (int): Unique identifier.
         work_day_id (int): Work day.
+        work_date (date): Date of the work day, denormalized as partition key.
+        employee_id (int): Employee id, denormalized from the work day.
         start_time (datetime): Start time of the work day.
         end_time (datetime): End time of the work day.
+        needs_review (bool): Whether the session was closed automatically and awaits review.
     """
     __tablename__ = "work_sessions"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    work_day_id: Mapped[int] = mapped_column(ForeignKey("work_days.id", ondelete="CASCADE"), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    work_day_id: Mapped[int] = mapped_column(nullable=False)
+    work_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    needs_review: Mapped[bool] = mapped_column(default=False, server_default=text("false"), nullable=False)
 
     work_day: Mapped["WorkDay"] = relationship(back_populates="sessions")
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["work_day_id", "work_date"],
+            ["work_days.id", "work_days.work_date"],
+            ondelete="CASCADE",
+        ),
+        # unique indexes of a partitioned table must include the partition key,
+        # so this allows one open session per employee and work day; sessions
+        # open on other days are checked under the employee's clock lock when
+        # a session is started
+        Index(
+            "uq_employee_open_session",
+            "employee_id",
+            "work_date",
+            unique=True,
+            postgresql_where=text("end_time IS NULL"),
+        ),
+        Index(
+            "ix_work_sessions_needs_review",
+            "employee_id",
+            postgresql_where=text("needs_review"),
+        ),
+        Index("ix_work_sessions_work_day", "work_day_id", "work_date"),
+        {"postgresql_partition_by": "RANGE (work_date)"},
+    )
+
 
     def __repr__(self):
         return f"<WorkSession {self.start_time} - {self.end_time}>"
 
+
+class EmployeeWeekTotal(Base):
+    """
+    Represents an employee work time rollup for a week.
+
+    Kept up to date incrementally whenever a work session is closed.
+
+    Attributes:
+        employee_id (int): Employee id.
+        week_start (date): Monday of the week.
+        total_duration (timedelta): Total duration of the week.
+    """
+    __tablename__ = "employee_week_totals"
+
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_duration: Mapped[timedelta] = mapped_column(Interval, server_default="0 hours", nullable=False)
+
+    def __repr__(self):
+        return f"<EmployeeWeekTotal {self.employee_id} {self.week_start}>"
+
+
+class EmployeeMonthTotal(Base):
+    """
+    Represents an employee work time rollup for a month.
+
+    Kept up to date incrementally whenever a work session is closed.
+
+    Attributes:
+        employee_id (int): Employee id.
+        month_start (date): First day of the month.
+        total_duration (timedelta): Total duration of the month.
+    """
+    __tablename__ = "employee_month_totals"
+
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    month_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_duration: Mapped[timedelta] = mapped_column(Interval, server_default="0 hours", nullable=False)
+
+    def __repr__(self):
+        return f"<EmployeeMonthTotal {self.employee_id} {self.month_start}>"
@@ -0,0 +1,202 @@
+"""
+Monthly range partitions of work days and work sessions.
+
+Both tables are partitioned by `work_date`, a session living in the same
+month partition as its work day. Rows outside every monthly partition
+(e.g. backdated into an archived month) land in the `_default` partition.
+"""
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from decouple import config
+from sqlalchemy import text
+
+from src.database import new_session
+from src.dependencies import SessionDep
+
+
+logger = logging.getLogger(__name__)
+
+# referenced table first, sessions hold a foreign key to work days
+PARTITIONED_TABLES = ("work_days", "work_sessions")
+
+PARTITION_NAME = re.compile(r"^(work_days|work_sessions)_p(\d{4})_(\d{2})$")
+
+PARTITION_MONTHS_AHEAD = config("PARTITION_MONTHS_AHEAD", default=3, cast=int)
+ARCHIVE_RETENTION_MONTHS = config("ARCHIVE_RETENTION_MONTHS", default=24, cast=int)
+ARCHIVE_DIR = config("ARCHIVE_DIR", default="archive")
+ARCHIVE_CHUNK_SIZE = config("ARCHIVE_CHUNK_SIZE", default=5000, cast=int)
+
+
+def add_months(month: date, months: int) -> date:
+    """Return first day of the month `months` after the month of `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Return name of the partition of table holding month."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+async def list_partition_tables(session: SessionDep) -> dict[str, bool]:
+    """
+    Return monthly partition tables mapped to whether they are attached.
+
+    Detached tables left behind by an interrupted archive run are included.
+
+    Args:
+        session (AsyncSession): Session object.
+    """
+    result = await session.execute(text(
+        "SELECT c.relname, i.inhrelid IS NOT NULL FROM pg_class c "
+        "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+        "WHERE c.relkind = 'r' AND c.relnamespace = 'public'::regnamespace "
+        "AND c.relname ~ '^(work_days|work_sessions)_p[0-9]{4}_[0-9]{2}$'"
+    ))
+    return dict(result.all())
+
+
+async def ensure_partitions(session: SessionDep, months_ahead: int = PARTITION_MONTHS_AHEAD) -> list[str]:
+    """
+    Create missing partitions from the current month to `months_ahead` months ahead.
+
+    Rows that landed in the `_default` partitions for a month before its
+    partitions existed are moved into them in the same transaction; the
+    partitions could not be created while the default partition holds
+    rows of their range.
+
+    Safe to run from several workers at once. Gives up instead of queueing
+    behind live traffic when the tables cannot be locked quickly; the next
+    run retries.
+
+    Args:
+        session (AsyncSession): Session object.
+        months_ahead (int): Number of future months to cover.
+    """
+    await session.execute(text("SELECT pg_advisory_xact_lock(hashtext('employee_partitions'))"))
+    await session.execute(text("SET LOCAL lock_timeout = '5s'"))
+    existing = await list_partition_tables(session)
+
+    created = []
+    current = date.today().replace(day=1)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        missing = [table for table in PARTITIONED_TABLES if partition_name(table, month) not in existing]
+        bounds = {"start": month, "end": add_months(month, 1)}
+
+        # sessions first, they reference work days
+        moved = {}
+        for table in reversed(missing):
+            holding = f"{partition_name(table, month)}_moved"
+            await session.execute(text(f"CREATE TEMP TABLE {holding} (LIKE {table}_default) ON COMMIT DROP"))
+            result = await session.execute(text(
+                f"WITH moved AS (DELETE FROM {table}_default WHERE work_date >= :start AND work_date < :end RETURNING *) "
+                f"INSERT INTO {holding} SELECT * FROM moved"
+            ), bounds)
+            moved[table] = (holding, result.rowcount)
+
+        for table in missing:
+            name = partition_name(table, month)
+            await session.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            ))
+            created.append(name)
+
+            holding, rows = moved[table]
+            if rows:
+                await session.execute(text(f"INSERT INTO {table} SELECT * FROM {holding}"))
+                logger.warning(f"Moved {rows} rows of {table} from the default partition to {name}.")
+
+    await session.commit()
+    if created:
+        logger.info(f"Created partitions {', '.join(created)}.")
+    return created
+
+
+async def create_future_partitions(months_ahead: int = PARTITION_MONTHS_AHEAD) -> list[str]:
+    """Create missing partitions in a new session, for background jobs and commands."""
+    async with new_session() as session:
+        return await ensure_partitions(session, months_ahead)
+
+
+async def dump_table(session: SessionDep, name: str, directory: Path) -> Path:
+    """
+    Write all rows of table to `<directory>/<name>.ndjson.gz`.
+
+    Rows are read from a server-side cursor and serialized by Postgres.
+
+    Args:
+        session (AsyncSession): Session object.
+        name (str): Table name.
+        directory (Path): Output directory.
+    """
+    path = directory / f"{name}.ndjson.gz"
+    partial = directory / f"{name}.ndjson.gz.part"
+
+    result = await session.stream(
+        text(f"SELECT row_to_json(t)::text FROM {name} t"),
+        execution_options={"yield_per": ARCHIVE_CHUNK_SIZE},
+    )
+    with gzip.open(partial, "wt", encoding="utf-8") as file:
+        async for partition in result.partitions():
+            file.writelines(f"{line}\n" for (line,) in partition)
+        file.flush()
+        os.fsync(file.fileno())
+    await session.commit()
+
+    os.replace(partial, path)
+    return path
+
+
+async def archive_partitions(
+        session: SessionDep,
+        retention_months: int = ARCHIVE_RETENTION_MONTHS,
+        directory: str = ARCHIVE_DIR
+) -> list[Path]:
+    """
+    Detach, dump and drop partitions of months older than the retention window.
+
+    Every partition is detached in its own short transaction and dropped
+    only after its dump has been written, so an interrupted run is resumed
+    by the next one. Sessions of a month go before its work days, which
+    they reference.
+
+    Args:
+        session (AsyncSession): Session object.
+        retention_months (int): Number of months to keep, current month included.
+        directory (str): Output directory.
+    """
+    output = Path(directory)
+    output.mkdir(parents=True, exist_ok=True)
+    cutoff = add_months(date.today().replace(day=1), -(retention_months - 1))
+
+    tables = await list_partition_tables(session)
+    await session.commit()
+
+    months = sorted({
+        date(int(match[2]), int(match[3]), 1)
+        for match in map(PARTITION_NAME.match, tables)
+        if date(int(match[2]), int(match[3]), 1) < cutoff
+    })
+
+    paths = []
+    for month in months:
+        for table in reversed(PARTITIONED_TABLES):
+            name = partition_name(table, month)
+            if name not in tables:
+                continue
+            if tables[name]:
+                await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                await session.commit()
+
+            paths.append(await dump_table(session, name, output))
+            await session.execute(text(f"DROP TABLE {name}"))
+            await session.commit()
+            logger.info(f"Archived partition {name} to {paths[-1]}.")
+    return paths
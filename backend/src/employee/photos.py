@@ -0,0 +1,201 @@
+"""
+Storage of employee profile photos.
+
+Photos are stored once per content: the file name is the SHA-256 of the
+bytes (its first 128 bits, to fit the profile_photo column), so uploading
+the same picture again reuses the stored file.
+Copying and hashing run in a worker thread, keeping the event loop free
+for clock events while large files are written.
+
+Every photo also gets square WebP thumbnails of THUMBNAIL_SIZES pixels,
+decoded and resized in a process pool so neither the event loop nor the
+GIL is held by image work. Thumbnails are named after the original, so
+their URL is derived from `profile_photo` without a lookup.
+
+Since a name changes whenever the bytes do, photos and thumbnails are
+served as immutable (see `CachedStaticFiles`). Photos uploaded before
+content-hash names get one from `fingerprint_photo`.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO
+
+from decouple import config, Csv
+from fastapi import HTTPException, UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+
+PHOTO_DIR = "static/employees/profile_photos"
+PHOTO_URL_PREFIX = "/static/employees/profile_photos"
+THUMBNAIL_DIR = f"{PHOTO_DIR}/thumbnails"
+THUMBNAIL_URL_PREFIX = f"{PHOTO_URL_PREFIX}/thumbnails"
+# content-addressed photos and thumbnails, relative to the /static mount
+FINGERPRINTED_PHOTO = re.compile(r"employees/profile_photos/(?:thumbnails/)?[0-9a-f]{32}(?:_\d+)?\.[a-z]+")
+
+PHOTO_MAX_BYTES = config("PHOTO_MAX_BYTES", default=5 * 1024 * 1024, cast=int)
+PHOTO_CHUNK_SIZE = config("PHOTO_CHUNK_SIZE", default=256 * 1024, cast=int)
+PHOTO_EXTENSIONS = config("PHOTO_EXTENSIONS", default="jpg,jpeg,png,webp,gif", cast=Csv())
+# room for the employee form field and multipart framing around the photo
+PHOTO_FORM_OVERHEAD = 64 * 1024
+
+THUMBNAIL_SIZES = tuple(config("THUMBNAIL_SIZES", default="64,256", cast=Csv(int)))
+THUMBNAIL_QUALITY = config("THUMBNAIL_QUALITY", default=80, cast=int)
+THUMBNAIL_WORKERS = config("THUMBNAIL_WORKERS", default=2, cast=int)
+
+
+class PhotoTooLarge(Exception):
+    pass
+
+
+def photo_extension(filename: str | None) -> str:
+    """Return normalized extension of an uploaded photo, 415 if it is not allowed."""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    if extension not in PHOTO_EXTENSIONS:
+        raise HTTPException(status_code=415, detail=f"Photo must be one of: {', '.join(PHOTO_EXTENSIONS)}")
+    return "jpg" if extension == "jpeg" else extension
+
+
+def copy_and_hash(source: BinaryIO, directory: str, max_bytes: int) -> tuple[str, str]:
+    """
+    Copy source into a temporary file of directory in chunks, hashing it on the way.
+
+    Returns the temporary file path and the hex digest. Raises PhotoTooLarge
+    as soon as more than max_bytes have been read.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    descriptor, path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(descriptor, "wb") as target:
+            while chunk := source.read(PHOTO_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise PhotoTooLarge
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest()[:32]
+
+
+def store_photo(source: BinaryIO, extension: str, max_bytes: int) -> str:
+    """Store photo under its content hash and return the file name."""
+    os.makedirs(PHOTO_DIR, exist_ok=True)
+    temporary, digest = copy_and_hash(source, PHOTO_DIR, max_bytes)
+    filename = f"{digest}.{extension}"
+    path = os.path.join(PHOTO_DIR, filename)
+    if os.path.exists(path):
+        os.unlink(temporary)
+    else:
+        # mkstemp creates the file readable by the owner only
+        os.chmod(temporary, 0o644)
+        # identical concurrent uploads replace each other with the same bytes
+        os.replace(temporary, path)
+    return filename
+
+
+def fingerprint_photo(photo_name: str) -> str:
+    """Store a copy of a stored photo under its content hash and return the new file name."""
+    extension = os.path.splitext(photo_name)[1].lstrip(".").lower()
+    with open(os.path.join(PHOTO_DIR, photo_name), "rb") as source:
+        return store_photo(source, "jpg" if extension == "jpeg" else extension, sys.maxsize)
+
+
+def thumbnail_name(photo_name: str, size: int) -> str:
+    """Return file name of a thumbnail of photo."""
+    return f"{os.path.splitext(photo_name)[0]}_{size}.webp"
+
+
+def thumbnail_url(photo_url: str | None, size: int | None) -> str | None:
+    """Return URL path of a thumbnail of an uploaded photo, photo URL itself if size is None."""
+    if not photo_url or size is None or not photo_url.startswith(f"{PHOTO_URL_PREFIX}/"):
+        return photo_url
+    return f"{THUMBNAIL_URL_PREFIX}/{thumbnail_name(photo_url.rsplit('/', 1)[-1], size)}"
+
+
+def make_thumbnails(photo_name: str, sizes: tuple[int, ...] = THUMBNAIL_SIZES, quality: int = THUMBNAIL_QUALITY) -> int:
+    """
+    Write missing thumbnails of photo, runs in a worker process.
+
+    Returns the number of thumbnails written. Raises UnidentifiedImageError
+    if the photo is not an image Pillow can read.
+    """
+    targets = {
+        size: os.path.join(THUMBNAIL_DIR, thumbnail_name(photo_name, size))
+        for size in sizes
+    }
+    targets = {size: path for size, path in targets.items() if not os.path.exists(path)}
+    if not targets:
+        return 0
+
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    with Image.open(os.path.join(PHOTO_DIR, photo_name)) as image:
+        # lets JPEG decode at a reduced scale, far cheaper for large photos
+        image.draft("RGB", (max(targets) * 2, max(targets) * 2))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        for size, path in sorted(targets.items(), reverse=True):
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            descriptor, temporary = tempfile.mkstemp(dir=THUMBNAIL_DIR, suffix=".part")
+            with os.fdopen(descriptor, "wb") as target:
+                thumbnail.save(target, "WEBP", quality=quality, method=4)
+            os.chmod(temporary, 0o644)
+            os.replace(temporary, path)
+    return len(targets)
+
+
+_thumbnail_pool: ProcessPoolExecutor | None = None
+
+
+def thumbnail_pool() -> ProcessPoolExecutor:
+    """Return the process pool of this worker, started on first use."""
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        _thumbnail_pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+    return _thumbnail_pool
+
+
+def shutdown_thumbnail_pool() -> None:
+    """Stop the process pool, waiting for thumbnails in progress."""
+    global _thumbnail_pool
+    if _thumbnail_pool is not None:
+        _thumbnail_pool.shutdown()
+        _thumbnail_pool = None
+
+
+async def save_profile_photo(file: UploadFile, max_bytes: int = PHOTO_MAX_BYTES) -> str:
+    """
+    Store uploaded profile photo, create its thumbnails and return its URL path.
+
+    Args:
+        file (UploadFile): Uploaded photo.
+        max_bytes (int): Largest accepted photo.
+    """
+    extension = photo_extension(file.filename)
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Photo must not exceed {max_bytes} bytes")
+
+    try:
+        filename = await asyncio.to_thread(store_photo, file.file, extension, max_bytes)
+    except PhotoTooLarge:
+        raise HTTPException(status_code=413, detail=f"Photo must not exceed {max_bytes} bytes")
+
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(thumbnail_pool(), make_thumbnails, filename)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as error:
+        logger.warning(f"Rejected unreadable profile photo {filename}: {error}")
+        # the same bytes could not have been accepted before, so no employee uses the file
+        os.remove(os.path.join(PHOTO_DIR, filename))
+        raise HTTPException(status_code=415, detail="Photo could not be read as an image")
+    return f"{PHOTO_URL_PREFIX}/{filename}"
@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.database import new_session
+from src.dependencies import SessionDep
+from src.employee.models import Employee, WorkSession
+
+
+class PresenceRegistry:
+    """
+    Employees with an open work session, per employer.
+
+    Loaded from the database and then kept current from clock events, so
+    headcount queries never touch the database. Events of other workers
+    arrive through the live hub bridge. Events missed by this worker (the
+    bridge disabled or reconnecting, another worker's outbox overflowing)
+    are made up for by rebuilding after every bridge connect and
+    periodically.
+    """
+
+    def __init__(self):
+        # user id -> employee id -> (workplace id, session start)
+        self._on_shift: dict[int, dict[int, tuple[int, datetime]]] = {}
+        # events applied while a rebuild query runs, replayed onto its result
+        self._pending: list[tuple[int, dict]] | None = None
+        self._lock = asyncio.Lock()
+
+        self.rebuilds = 0
+
+    async def rebuild(self, session: SessionDep) -> None:
+        """
+        Replace the registry with the open sessions stored in the database.
+
+        Events applied while the query runs are replayed onto its result,
+        so a clock event committed after the query's snapshot is not lost.
+
+        Args:
+            session (AsyncSession): Session object.
+        """
+        stmt = (
+            select(Employee.user_id, Employee.id, Employee.workplace_id, WorkSession.start_time)
+            .join(WorkSession, WorkSession.employee_id == Employee.id)
+            .where(WorkSession.end_time.is_(None))
+        )
+        async with self._lock:
+            self._pending = []
+            try:
+                result = await session.execute(stmt)
+
+                on_shift: dict[int, dict[int, tuple[int, datetime]]] = {}
+                for user_id, employee_id, workplace_id, start_time in result:
+                    on_shift.setdefault(user_id, {})[employee_id] = (workplace_id, start_time)
+                for user_id, event in self._pending:
+                    self._apply(on_shift, user_id, event)
+                self._on_shift = on_shift
+                self.rebuilds += 1
+            finally:
+                self._pending = None
+
+    def apply(self, user_id: int, event: dict) -> None:
+        """
+        Apply a live clock event.
+
+        Args:
+            user_id (int): Employer (user) id.
+            event (dict): Event published by the live hub.
+        """
+        if self._pending is not None:
+            self._pending.append((user_id, event))
+        self._apply(self._on_shift, user_id, event)
+
+    @staticmethod
+    def _apply(on_shift: dict[int, dict[int, tuple[int, datetime]]], user_id: int, event: dict) -> None:
+        if "state" not in event:
+            # not a clock event
+            return
+        if event["state"] == "on_shift":
+            on_shift.setdefault(user_id, {})[event["employee_id"]] = (
+                event["workplace_id"], datetime.fromisoformat(event["at"])
+            )
+            return
+
+        employees = on_shift.get(user_id)
+        if employees is not None:
+            employees.pop(event["employee_id"], None)
+            if not employees:
+                del on_shift[user_id]
+
+    def on_shift(self, user_id: int) -> dict[int, tuple[int, datetime]]:
+        """Return employees of employer on shift, mapped to workplace id and session start."""
+        return self._on_shift.get(user_id, {})
+
+    def stats(self) -> dict:
+        """Return number of employers and employees on shift and of rebuilds."""
+        return {
+            "employers": len(self._on_shift),
+            "on_shift": sum(len(employees) for employees in self._on_shift.values()),
+            "rebuilds": self.rebuilds,
+        }
+
+
+presence = PresenceRegistry()
+
+
+async def rebuild_presence() -> None:
+    """Rebuild the registry in a new session, for background jobs and the live hub bridge."""
+    async with new_session() as session:
+        await presence.rebuild(session)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from decouple import config
+from fastapi import HTTPException
+
+from src.employee.schemas import WorkEventSchema
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkEventWriter:
+    """
+    Write-behind queue for clock events.
+
+    Events are accepted into a bounded in-process queue and persisted by a
+    background task in batches of up to `batch_size` events, or whatever
+    has arrived within `flush_interval` seconds of the first one.
+
+    A batch that cannot be persisted is retried `retries` times, waiting
+    `retry_delay` seconds and twice as long after every further failure,
+    while the queue keeps filling. A batch failing every retry is appended
+    to the `dead_letter` NDJSON file, replayed by the `replay-work-events`
+    command; accepted events are never dropped.
+
+    Attributes:
+        enabled (bool): Whether clock endpoints should enqueue events.
+        overflow (str): "block" to wait for free space, "reject" to answer 503.
+        dead_letter (str): File collecting events that could not be persisted.
+    """
+
+    def __init__(
+            self,
+            enabled: bool,
+            maxsize: int,
+            batch_size: int,
+            flush_interval: float,
+            overflow: str,
+            retries: int,
+            retry_delay: float,
+            dead_letter: str
+    ):
+        if overflow not in ("block", "reject"):
+            raise ValueError("Overflow must be either 'block' or 'reject'")
+
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.dead_letter = dead_letter
+        self._queue: asyncio.Queue[WorkEventSchema | None] = asyncio.Queue(maxsize)
+        self._flush: Callable[[list[WorkEventSchema]], Awaitable[None]] | None = None
+        self._task: asyncio.Task | None = None
+        self._accepting = False
+        # puts waiting for free space in a full queue
+        self._waiting_puts = 0
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.retried = 0
+        self.failed = 0
+        self.overflowed = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+
+    async def start(self, flush: Callable[[list[WorkEventSchema]], Awaitable[None]]) -> None:
+        """Start the background flusher."""
+        if not self.enabled or self._task:
+            return
+        self._flush = flush
+        self._task = asyncio.create_task(self._run(), name="work-event-writer")
+        self._accepting = True
+
+    async def stop(self) -> None:
+        """Persist everything queued so far and stop the background flusher."""
+        if not self._task:
+            return
+        self._accepting = False
+        # the flusher exits when it reaches the sentinel, after older events
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+        # puts accepted before the queue stopped but still waiting for space land after the sentinel
+        while self._waiting_puts or not self._queue.empty():
+            batch = []
+            while not self._queue.empty() and len(batch) < self.batch_size:
+                event = self._queue.get_nowait()
+                if event is not None:
+                    batch.append(event)
+            if batch:
+                await self._write(batch)
+            # lets waiting puts take the space just freed
+            await asyncio.sleep(0)
+
+    async def put(self, event: WorkEventSchema) -> None:
+        """
+        Enqueue event for persistence.
+
+        Args:
+            event (WorkEventSchema): Clock event.
+        """
+        if not self._accepting:
+            raise HTTPException(status_code=503, detail="Clock event queue is not running")
+
+        if self.overflow == "block":
+            self._waiting_puts += 1
+            try:
+                await self._queue.put(event)
+            finally:
+                self._waiting_puts -= 1
+        else:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed += 1
+                raise HTTPException(status_code=503, detail="Clock event queue is full")
+        self.enqueued += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            event = await self._queue.get()
+            if event is None:
+                break
+
+            batch = [event]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            await self._write(batch)
+
+    async def _write(self, batch: list[WorkEventSchema]) -> None:
+        started = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                await self._flush(batch)
+            except Exception:
+                if attempt == self.retries:
+                    self.failed += len(batch)
+                    logger.exception(f"Failed to persist {len(batch)} queued clock events, writing them to {self.dead_letter}.")
+                    await self._write_dead_letter(batch)
+                    break
+                delay = self.retry_delay * 2 ** attempt
+                self.retried += 1
+                logger.warning(f"Failed to persist {len(batch)} queued clock events, retrying in {delay:g} s.", exc_info=True)
+                await asyncio.sleep(delay)
+            else:
+                self.flushed += len(batch)
+                break
+
+        elapsed = time.perf_counter() - started
+        self.flushes += 1
+        self.flush_seconds_total += elapsed
+        self.flush_seconds_max = max(self.flush_seconds_max, elapsed)
+
+    async def _write_dead_letter(self, batch: list[WorkEventSchema]) -> None:
+        def append():
+            path = Path(self.dead_letter)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as file:
+                file.writelines(f"{event.model_dump_json()}\n" for event in batch)
+                file.flush()
+                os.fsync(file.fileno())
+
+        try:
+            await asyncio.to_thread(append)
+        except OSError:
+            # last resort, the events can still be recovered from the log
+            logger.exception(
+                f"Failed to write {len(batch)} clock events to {self.dead_letter}: "
+                + "".join(f"\n{event.model_dump_json()}" for event in batch)
+            )
+
+    def stats(self) -> dict:
+        """Return queue depth, counters and flush latency."""
+        return {
+            "enabled": self.enabled,
+            "depth": self._queue.qsize(),
+            "maxsize": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "overflowed": self.overflowed,
+            "flushes": self.flushes,
+            "flush_ms_avg": round(self.flush_seconds_total / self.flushes * 1000, 2) if self.flushes else 0.0,
+            "flush_ms_max": round(self.flush_seconds_max * 1000, 2),
+        }
+
+
+work_event_writer = WorkEventWriter(
+    enabled=config("WORK_EVENTS_WRITE_BEHIND", default=False, cast=bool),
+    maxsize=config("WORK_EVENTS_QUEUE_SIZE", default=10000, cast=int),
+    batch_size=config("WORK_EVENTS_FLUSH_SIZE", default=500, cast=int),
+    flush_interval=config("WORK_EVENTS_FLUSH_INTERVAL_MS", default=200, cast=int) / 1000,
+    overflow=config("WORK_EVENTS_QUEUE_OVERFLOW", default="block"),
+    retries=config("WORK_EVENTS_FLUSH_RETRIES", default=5, cast=int),
+    retry_delay=config("WORK_EVENTS_FLUSH_RETRY_DELAY_MS", default=500, cast=int) / 1000,
+    dead_letter=config("WORK_EVENTS_DEAD_LETTER", default="dead_letter/work_events.ndjson"),
+)
@@ -1,13 +1,21 @@
 import os
 from datetime import date
+from typing import Annotated
 
 from authx import TokenPayload
-from fastapi import APIRouter, Depends, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Request, Query
 
 from src.dependencies import SessionDep
+from src.employee.cache import token_cache, report_cache
 from src.employee.dependencies import get_current_employer_token
+from src.employee.live import live_hub
+from src.employee.presence import presence
 from src.employee.schemas import EmployeeCreateSchema, EmployeeReturnSchema, EmployeeWorkDetailSchema, \
-    WorkplaceCreateSchema, EmployeeWithStatsReturnSchema, EmployeeReturnByTokenSchema
+    WorkplaceCreateSchema, EmployeeWithStatsReturnSchema, EmployeeReturnByTokenSchema, WorkEventBatchSchema, \
+    WorkEventResultSchema, EmployeeListParamsSchema, TimesheetExportParamsSchema, EmployeeDetailParamsSchema, \
+    WorkplaceTimesheetSchema, OnShiftSchema, ReviewSessionSchema, ReviewSessionUpdateSchema, PayrollParamsSchema, \
+    PayrollSchema
+from src.employee.payroll import PayrollService
 from src.employee.service import EmployeeService
 from src.users.config import auth
 from src.security import *
@@ -25,15 +33,61 @@ async def create_employee(session: SessionDep, file: UploadFile = File(...), dat
 
 
 @router.get("", summary="Get all employees for current user", response_model=list[EmployeeWithStatsReturnSchema], openapi_extra={"security": [{"JWT Access Cookie": []}]})
-async def get_all_employees(request: Request, session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
-    """Get all employees for current user."""
-    return await EmployeeService.get_all_employees(request, session, payload)
+async def get_all_employees(request: Request, session: SessionDep, params: Annotated[EmployeeListParamsSchema, Query()], payload: TokenPayload = Depends(auth.access_token_required)):
+    """
+    Get a page of employees for current user.
+
+    Pass the `X-Next-Cursor` response header as `cursor` to get the next page.
+    """
+    return await EmployeeService.get_all_employees(request, session, payload, params)
+
+
+@router.get("/export", summary="Export work sessions", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def export_work_sessions(params: Annotated[TimesheetExportParamsSchema, Query()], payload: TokenPayload = Depends(auth.access_token_required)):
+    """Stream work sessions of all employees as CSV or NDJSON."""
+    return await EmployeeService.export_work_sessions(payload, params)
+
+
+@router.get("/live", summary="Stream live clock events", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def live_events(payload: TokenPayload = Depends(auth.access_token_required)):
+    """Stream start/end deltas of all employees as server-sent events."""
+    return await EmployeeService.live_events(payload)
+
+
+@router.get("/on-shift", summary="Get employees currently on shift", response_model=OnShiftSchema, openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_on_shift(workplace_id: int | None = None, payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get employees with an open work session and their count per work place."""
+    return await EmployeeService.get_on_shift(payload, workplace_id)
+
+
+@router.get("/sessions/review", summary="Get auto-closed sessions awaiting review", response_model=list[ReviewSessionSchema], openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_sessions_for_review(session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get work sessions that were closed automatically and need review."""
+    return await EmployeeService.get_sessions_for_review(payload, session)
+
+
+@router.post("/sessions/{session_id}/review", summary="Accept an auto-closed session", response_model=ReviewSessionSchema, openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def review_session(session_id: int, data: ReviewSessionUpdateSchema, session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
+    """Accept a work session closed automatically, optionally correcting its end time, and clear its review flag."""
+    return await EmployeeService.review_session(session_id, data, session=session, payload=payload)
+
+
+@router.get("/payroll", summary="Get payroll of a period", response_model=PayrollSchema, openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_payroll(session: SessionDep, params: Annotated[PayrollParamsSchema, Query()], payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get regular, overtime, night and weekend hours and gross pay of every employee with closed sessions in a period."""
+    return await PayrollService.get_payroll(session=session, params=params, payload=payload)
+
+
+@router.get("/cache/stats", summary="Get employee cache statistics", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_cache_stats(payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get size, memory footprint and hit ratio of this worker's caches."""
+    return {"token_cache": token_cache.stats(), "report_cache": report_cache.stats(), "live_hub": live_hub.stats(), "presence": presence.stats()}
 
 
 @router.get("/{employee_id}", summary="Get a specific employee", response_model=EmployeeWorkDetailSchema, openapi_extra={"security": [{"JWT Access Cookie": []}]})
-async def get_employee_detail(request: Request, employee_id: int, session: SessionDep, week: date | None = None, month: date | None = None,payload: TokenPayload = Depends(auth.access_token_required)):
+async def get_employee_detail(request: Request, employee_id: int, session: SessionDep, params: Annotated[EmployeeDetailParamsSchema, Query()], payload: TokenPayload = Depends(auth.access_token_required)):
     """Get detailed info and work summary for an employee"""
-    return await EmployeeService.get_employee_detail(request=request, employee_id=employee_id, session=session, month=month, week=week, payload=payload)
+    return await EmployeeService.get_employee_detail(request=request, employee_id=employee_id, session=session, params=params, payload=payload)
 
 
 @router.post("/work/start", summary="Start a new work session", openapi_extra={"security": [{"Employer Header Token": []}]})
@@ -48,18 +102,40 @@ async def end_work(session: SessionDep, token: str = Depends(get_current_employe
     return await EmployeeService.end_work(session, token)
 
 
+@router.post("/work/batch", summary="Apply buffered work session events", response_model=list[WorkEventResultSchema])
+async def ingest_work_events(data: WorkEventBatchSchema, session: SessionDep):
+    """
+    Apply buffered start/end events in event-time order.
+
+    Every event is authorized by its own employee personal token.
+    """
+    return await EmployeeService.ingest_work_events(session, data)
+
+
 @router.post("/workplaces")
 async def add_workplace(data: WorkplaceCreateSchema, session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
     """Add a new workplace."""
     return await EmployeeService.add_workplace(data, session, payload)
 
 
+@router.get("/workplaces/{workplace_id}/timesheet", summary="Get work place timesheet", response_model=WorkplaceTimesheetSchema, openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_workplace_timesheet(workplace_id: int, session: SessionDep, month: date | None = None, payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get worked seconds of every employee at a work place for every day of a month."""
+    return await EmployeeService.get_workplace_timesheet(workplace_id=workplace_id, session=session, month=month, payload=payload)
+
+
 @router.delete("/{employee_id}", summary="Delete employee", openapi_extra={"security": [{"JWT Access Cookie": []}]})
 async def delete_employee(request: Request, employee_id: int, session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
     """Delete an employee."""
     return await EmployeeService.delete_employee_by_id(request, employee_id, session=session, payload=payload)
 
 
+@router.post("/{employee_id}/personal-token", summary="Rotate employee's personal token", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def rotate_personal_token(employee_id: int, session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
+    """Issue a new personal token for an employee, the old one stops working."""
+    return await EmployeeService.rotate_personal_token(employee_id, session=session, payload=payload)
+
+
 @router.get("/by-token/{employee_token}", response_model=EmployeeReturnByTokenSchema, summary="Return employee by personal token")
 async def get_employee_by_token(
     request: Request,
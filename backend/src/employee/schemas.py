@@ -1,25 +1,70 @@
 import re
-from datetime import datetime, date, timedelta, time
-from typing import List
+from datetime import datetime, date, timedelta
+from typing import List, Literal
 
 from fastapi import Request
-from pydantic import BaseModel, EmailStr, field_validator, HttpUrl, SerializationInfo, field_serializer
+from decouple import config
+from pydantic import BaseModel, EmailStr, field_validator, HttpUrl, SerializationInfo, field_serializer, \
+    AwareDatetime, Field, model_validator
+
+from src.employee.photos import THUMBNAIL_SIZES, thumbnail_url
+
+
+def base_url_prefix(request: Request) -> str:
+    """
+    Returns the base URL of the request without the trailing slash.
+    """
+    return str(request.base_url).rstrip('/')
 
 
 def to_absolute_url(value: str | None, info: SerializationInfo) -> str | None:
     """
     Converts a relative URL path to an absolute URL using the request context.
+    A precomputed "base_url" in the context saves rebuilding it for every row.
     """
     if not value:
         return None
 
-    if info.context and "request" in info.context:
+    if info.context:
+        if "base_url" in info.context:
+            return f"{info.context['base_url']}{value}"
         request: Request | None = info.context.get("request")
         if request:
-            return f"{str(request.base_url).rstrip('/')}{value}"
+            return f"{base_url_prefix(request)}{value}"
+    return value
+
+
+def to_photo_url(value: str | None, info: SerializationInfo) -> str | None:
+    """
+    Converts a profile photo path to the absolute URL of the thumbnail of the
+    "photo_size" given in the context, or of the original photo without one.
+    """
+    size = info.context.get("photo_size") if info.context else None
+    return to_absolute_url(thumbnail_url(value, size), info)
+
+
+def validate_photo_size(value: int | None) -> int | None:
+    """
+    Checks that a requested photo size is one of the generated thumbnail sizes.
+    """
+    if value is not None and value not in THUMBNAIL_SIZES:
+        raise ValueError(f"photo_size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}")
     return value
 
 
+def format_duration(value: timedelta | None) -> str:
+    """
+    Formats a duration as HH:MM, "00:00" when empty.
+    """
+    if not value:
+        return "00:00"
+
+    total_seconds = int(value.total_seconds())
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    return f"{hours:02}:{minutes:02}"
+
+
 class EmployeeCreateSchema(BaseModel):
     """
     Schema using for employee creation
@@ -63,13 +108,7 @@ class WorkTimeStatusSchema(BaseModel):
 
     @field_serializer('today', 'week', 'month')
     def serialize_duration(self, value: timedelta | None, _info):
-        if not value:
-            return "00:00"
-
-        total_seconds = int(value.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        return f"{hours:02}:{minutes:02}"
+        return format_duration(value)
 
 
 class EmployeeReturnSchema(BaseModel):
@@ -92,7 +131,7 @@ class EmployeeReturnSchema(BaseModel):
 
     @field_serializer("profile_photo")
     def make_photo_url_absolute(self, value: str | None, info: SerializationInfo):
-        return to_absolute_url(value, info)
+        return to_photo_url(value, info)
 
 
 class EmployeeWithStatsReturnSchema(EmployeeReturnSchema):
@@ -105,14 +144,47 @@ class EmployeeWithStatsReturnSchema(EmployeeReturnSchema):
         "from_attributes": True
     }
 
+    @staticmethod
+    def dump_row(
+            employee,
+            today: timedelta | None,
+            week: timedelta | None,
+            month: timedelta | None,
+            base_url: str,
+            photo_size: int | None = None
+    ) -> dict:
+        """
+        Returns the serialized form of an employee loaded from the DB without
+        validating it, for listings. Must produce the same output as
+        model_dump(mode="json") of this schema.
+        """
+        workplace = employee.workplace
+        photo = thumbnail_url(employee.profile_photo, photo_size)
+        return {
+            "id": employee.id,
+            "first_name": employee.first_name,
+            "last_name": employee.last_name,
+            "position": employee.position,
+            "profile_photo": f"{base_url}{photo}" if photo else None,
+            "email": employee.email,
+            "phone_number": employee.phone_number,
+            "created_at": employee.created_at,
+            "workplace": {"id": workplace.id, "title": workplace.title, "address": workplace.address},
+            "work_stats": {
+                "today": format_duration(today),
+                "week": format_duration(week),
+                "month": format_duration(month),
+            },
+        }
+
 
 class WorkSummarySchema(BaseModel):
     """
-    Повертає статистику за день.
-    hours - це об'єкт time (наприклад 08:45:00) або None.
+    Повертає статистику за день, тиждень або місяць.
+    date - перший день періоду, seconds - відпрацьований час у секундах.
     """
     date: date
-    work_time: time | None
+    seconds: int
 
     model_config = {
         "from_attributes": True
@@ -132,7 +204,6 @@ class EmployeeReturnDetailSchema(BaseModel):
     phone_number: str
     created_at: datetime
     workplace: WorkPlaceReturnSchema
-    personal_token: str
 
     model_config = {
         "from_attributes": True
@@ -140,7 +211,7 @@ class EmployeeReturnDetailSchema(BaseModel):
 
     @field_serializer("profile_photo")
     def make_photo_url_absolute(self, value: str | None, info: SerializationInfo):
-        return to_absolute_url(value, info)
+        return to_photo_url(value, info)
 
 
 class EmployeeWorkDetailSchema(BaseModel):
@@ -149,16 +220,78 @@ class EmployeeWorkDetailSchema(BaseModel):
     """
     employee: EmployeeReturnDetailSchema
     period: str
+    bucket: Literal["day", "week", "month"]
+    date_from: date
+    date_to: date
     work_summary: List[WorkSummarySchema]
+    total_seconds: int
     total_hours: float
 
 
+class WorkplaceTimesheetSchema(BaseModel):
+    """
+    Schema using when returning work place timesheet matrix.
+    seconds is flat and row-major: seconds[i * len(dates) + j] belongs to
+    employee_ids[i] on dates[j].
+    """
+    workplace_id: int
+    month: date
+    employee_ids: List[int]
+    dates: List[date]
+    seconds: List[int]
+
+
+class PayrollParamsSchema(BaseModel):
+    """
+    Schema using for payroll period, rates and rules
+    """
+    date_from: date
+    date_to: date
+    workplace_id: int | None = None
+    hourly_rate: float = Field(default=config("PAYROLL_HOURLY_RATE", default=0, cast=float), ge=0)
+    overtime_multiplier: float = Field(default=config("PAYROLL_OVERTIME_MULTIPLIER", default=1.5, cast=float), ge=1)
+    night_multiplier: float = Field(default=config("PAYROLL_NIGHT_MULTIPLIER", default=1.25, cast=float), ge=1)
+    weekend_multiplier: float = Field(default=config("PAYROLL_WEEKEND_MULTIPLIER", default=1.5, cast=float), ge=1)
+    daily_overtime_hours: float = Field(default=config("PAYROLL_DAILY_OVERTIME_HOURS", default=8, cast=float), gt=0, le=24)
+    rounding_minutes: int = Field(default=0, ge=0, le=60)
+    rounding: Literal["nearest", "up", "down"] = "nearest"
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        max_days = config("PAYROLL_MAX_DAYS", default=62, cast=int)
+        if (self.date_to - self.date_from).days >= max_days:
+            raise ValueError(f"Date range must not exceed {max_days} days")
+        return self
+
+
+class PayrollSchema(BaseModel):
+    """
+    Schema using when returning payroll of a period.
+    All lists are parallel to employee_ids.
+    """
+    date_from: date
+    date_to: date
+    employee_ids: List[int]
+    sessions: List[int]
+    total_hours: List[float]
+    regular_hours: List[float]
+    overtime_hours: List[float]
+    night_hours: List[float]
+    weekend_hours: List[float]
+    gross_pay: List[float]
+
+
 class WorkplaceCreateSchema(BaseModel):
     """
     Schema using when creating work place
     """
     title: str
     address: str
+    auto_close_enabled: bool = True
+    auto_close_after: timedelta | None = Field(default=None, gt=timedelta(0))
+    auto_close_credit: timedelta | None = Field(default=None, ge=timedelta(0))
 
 
 class EmployeeReturnByTokenSchema(EmployeeReturnDetailSchema):
@@ -168,10 +301,137 @@ class EmployeeReturnByTokenSchema(EmployeeReturnDetailSchema):
 
     @field_serializer('day_time', 'week_time', 'month_time')
     def serialize_duration(self, value: timedelta | None, _info):
-        if not value:
-            return "00:00"
+        return format_duration(value)
 
-        total_seconds = int(value.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        return f"{hours:02}:{minutes:02}"
\ No newline at end of file
+
+class WorkEventSchema(BaseModel):
+    """
+    Schema using for a single buffered clock event
+    """
+    token: str
+    type: Literal["start", "end"]
+    timestamp: AwareDatetime
+
+
+class WorkEventBatchSchema(BaseModel):
+    """
+    Schema using for batch clock event ingestion
+    """
+    events: List[WorkEventSchema] = Field(
+        min_length=1,
+        max_length=config("WORK_EVENTS_BATCH_MAX", default=10000, cast=int),
+    )
+
+
+class WorkEventResultSchema(BaseModel):
+    """
+    Schema using when returning the result of a single clock event
+    """
+    index: int
+    status: Literal["applied", "rejected"]
+    session_id: int | None = None
+    detail: str | None = None
+
+
+class OnShiftEmployeeSchema(BaseModel):
+    """
+    Schema using when returning an employee with an open work session
+    """
+    employee_id: int
+    workplace_id: int
+    started_at: datetime
+
+
+class OnShiftSchema(BaseModel):
+    """
+    Schema using when returning employees currently on shift
+    """
+    count: int
+    by_workplace: dict[int, int]
+    employees: List[OnShiftEmployeeSchema]
+
+
+class ReviewSessionSchema(BaseModel):
+    """
+    Schema using when returning an auto-closed work session awaiting review
+    """
+    id: int
+    employee_id: int
+    start_time: datetime
+    end_time: datetime
+
+
+class ReviewSessionUpdateSchema(BaseModel):
+    """
+    Schema using when accepting an auto-closed work session, optionally with a corrected end time
+    """
+    end_time: AwareDatetime | None = None
+
+
+class EmployeeListParamsSchema(BaseModel):
+    """
+    Schema using for employee list filters, sorting and pagination
+    """
+    limit: int = Field(
+        default=config("EMPLOYEES_PAGE_SIZE", default=100, cast=int),
+        ge=1,
+        le=config("EMPLOYEES_PAGE_SIZE_MAX", default=1000, cast=int),
+    )
+    cursor: str | None = None
+    workplace_id: int | None = None
+    is_active: bool | None = None
+    search: str | None = Field(default=None, min_length=1, max_length=100)
+    sort: Literal["name", "-name", "created_at", "-created_at", "week", "-week", "month", "-month"] = "name"
+    photo_size: int | None = None
+
+    @field_validator("photo_size")
+    @classmethod
+    def check_photo_size(cls, value: int | None) -> int | None:
+        """Validate photo size."""
+        return validate_photo_size(value)
+
+
+class TimesheetExportParamsSchema(BaseModel):
+    """
+    Schema using for work session export filters
+    """
+    format: Literal["csv", "ndjson"] = "csv"
+    workplace_id: int | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        return self
+
+
+class EmployeeDetailParamsSchema(BaseModel):
+    """
+    Schema using for employee work detail period and bucketing
+    """
+    week: date | None = None
+    month: date | None = None
+    date_from: date | None = None
+    date_to: date | None = None
+    bucket: Literal["day", "week", "month"] = "day"
+    photo_size: int | None = None
+
+    @field_validator("photo_size")
+    @classmethod
+    def check_photo_size(cls, value: int | None) -> int | None:
+        """Validate photo size."""
+        return validate_photo_size(value)
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if (self.date_from is None) != (self.date_to is None):
+            raise ValueError("date_from and date_to must be given together")
+        if self.date_from and self.date_to:
+            if self.date_from > self.date_to:
+                raise ValueError("date_from must not be after date_to")
+            max_days = config("EMPLOYEE_DETAIL_MAX_DAYS", default=1830, cast=int)
+            if (self.date_to - self.date_from).days >= max_days:
+                raise ValueError(f"Date range must not exceed {max_days} days")
+        return self
@@ -1,22 +1,73 @@
-import os
-import shutil
-import uuid
+import asyncio
+import csv
+import io
+import json
+import logging
+import math
 from calendar import monthrange
 from datetime import date, datetime, timedelta, timezone
 
 from authx import TokenPayload
+from decouple import config
 from fastapi import HTTPException, UploadFile, File, Request
-from sqlalchemy import select, update, func, extract
-from sqlalchemy.orm import selectinload, Session
-
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, delete, text, func, extract, and_, or_, tuple_, literal, values, column, \
+    union_all, cast, true, false, Integer, Date, DateTime, Interval, ARRAY
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.orm import selectinload, lazyload, Session
+
+from src.database import new_session
 from src.dependencies import SessionDep
 from src.employee.schemas import EmployeeCreateSchema, EmployeeReturnSchema, EmployeeWorkDetailSchema, \
     EmployeeReturnDetailSchema, WorkSummarySchema, WorkplaceCreateSchema, EmployeeWithStatsReturnSchema, \
-    EmployeeReturnByTokenSchema
-from src.employee.utils import generate_personal_token, hash_personal_token
+    EmployeeReturnByTokenSchema, WorkEventSchema, WorkEventBatchSchema, WorkEventResultSchema, EmployeeListParamsSchema, \
+    TimesheetExportParamsSchema, EmployeeDetailParamsSchema, WorkplaceTimesheetSchema, OnShiftSchema, \
+    OnShiftEmployeeSchema, ReviewSessionSchema, ReviewSessionUpdateSchema, base_url_prefix
+from src.employee.cache import CachedEmployee, token_cache, report_cache
+from src.employee.live import live_hub
+from src.employee.photos import save_profile_photo
+from src.employee.presence import presence
+from src.employee.queue import work_event_writer
+from src.employee.utils import generate_personal_token, digest_personal_token, encode_cursor, decode_cursor
+from src.utils.responses import FastJSONResponse
 from src.utils.users import extract_user_uid_from_token, extract_user_by_id
 from src.users.models import User
-from src.employee.models import Employee, WorkDay, WorkSession, WorkPlace
+from src.employee.models import Employee, WorkDay, WorkSession, WorkPlace, EmployeeWeekTotal, EmployeeMonthTotal
+
+
+logger = logging.getLogger(__name__)
+
+# read dashboard week/month totals from rollup tables instead of aggregating work days
+STATS_FROM_ROLLUPS = config("EMPLOYEE_STATS_FROM_ROLLUPS", default=True, cast=bool)
+
+# rows fetched from the server-side cursor and written per chunk of an export
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# age and credited time of forgotten sessions for work places without their own policy
+AUTO_CLOSE_AFTER = timedelta(hours=config("AUTO_CLOSE_AFTER_HOURS", default=16, cast=float))
+AUTO_CLOSE_CREDIT = timedelta(hours=config("AUTO_CLOSE_CREDIT_HOURS", default=8, cast=float))
+
+# open sessions are looked up only in work days of the last OPEN_SESSION_MAX_DAYS days, so clock
+# events skip older monthly partitions; auto-close closes every session before it falls out of them
+OPEN_SESSION_MAX_DAYS = config(
+    "OPEN_SESSION_MAX_DAYS", default=math.ceil(AUTO_CLOSE_AFTER / timedelta(days=1)) + 1, cast=int
+)
+if OPEN_SESSION_MAX_DAYS < 2:
+    raise RuntimeError("OPEN_SESSION_MAX_DAYS must be at least 2")
+OPEN_SESSION_MAX_AGE = timedelta(days=OPEN_SESSION_MAX_DAYS - 1)
+
+# seconds between keepalive comments on idle live event streams
+LIVE_KEEPALIVE_SECONDS = config("LIVE_KEEPALIVE_SECONDS", default=15, cast=float)
+
+# readers of aborted exports, referenced until they finish
+EXPORT_READERS: set[asyncio.Task] = set()
+
+# rollup model, its period column and the matching date_trunc() unit
+ROLLUP_PERIODS = (
+    (EmployeeWeekTotal, "week_start", "week"),
+    (EmployeeMonthTotal, "month_start", "month"),
+)
 
 
 class EmployeeService:
@@ -38,18 +89,7 @@ class EmployeeService:
         uid = extract_user_uid_from_token(payload)
         user = await extract_user_by_id(uid, User, session)
 
-        # Generate a unique filename
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-
-        upload_dir = "static/employees/profile_photos"
-        file_path = os.path.join(upload_dir, unique_filename)
-        os.makedirs(upload_dir, exist_ok=True)
-
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        profile_photo_url = f"/static/employees/profile_photos/{unique_filename}"
+        profile_photo_url = await save_profile_photo(file)
 
         new_employee = Employee(
             first_name=data.first_name,
@@ -66,21 +106,31 @@ class EmployeeService:
         await session.refresh(new_employee)
 
         personal_token = generate_personal_token(new_employee.id)
-        new_employee.personal_token = personal_token
+        new_employee.personal_token_digest = digest_personal_token(personal_token)
         await session.commit()
 
         return {"msg": "success", "personal_token": personal_token}
 
 
     @staticmethod
-    async def get_all_employees(request: Request, session: SessionDep, payload: TokenPayload):
+    async def get_all_employees(
+            request: Request,
+            session: SessionDep,
+            payload: TokenPayload,
+            params: EmployeeListParamsSchema,
+    ):
         """
-        Get all workers for current user.
+        Get a page of workers for current user.
+
+        Pages are keyset-paginated on the sort key plus employee id, so every
+        page costs the same no matter how deep it is. The cursor of the next
+        page is returned in the `X-Next-Cursor` header.
 
         Args:
+            request (HTTPRequest): Request object.
             session (AsyncSession): Session object.
             payload (TokenPayload): Validated payload.
-            request (HTTPRequest): Request object.
+            params (EmployeeListParamsSchema): Filters, sorting and pagination.
         """
         user_id = extract_user_uid_from_token(payload)
 
@@ -89,52 +139,300 @@ class EmployeeService:
         start_of_week = today - timedelta(days=today.weekday())
         start_of_month = today.replace(day=1)
 
-        def get_duration_subquery(start_date):
-            return (
-                select(func.sum(WorkDay.total_duration))
-                .where(WorkDay.employee_id == Employee.id)
-                .where(WorkDay.work_date >= start_date)
-                .correlate(Employee)
-                .scalar_subquery()
+        query = (
+            select(Employee)
+            .where(Employee.user_id == user_id)
+            .options(selectinload(Employee.workplace))
+        )
+        if STATS_FROM_ROLLUPS:
+            # week and month totals come from the rollup tables, one PK probe each
+            hours_today = WorkDay.total_duration
+            hours_week = EmployeeWeekTotal.total_duration
+            hours_month = EmployeeMonthTotal.total_duration
+            query = (
+                query
+                .outerjoin(WorkDay, and_(WorkDay.employee_id == Employee.id, WorkDay.work_date == today))
+                .outerjoin(EmployeeWeekTotal, and_(
+                    EmployeeWeekTotal.employee_id == Employee.id,
+                    EmployeeWeekTotal.week_start == start_of_week,
+                ))
+                .outerjoin(EmployeeMonthTotal, and_(
+                    EmployeeMonthTotal.employee_id == Employee.id,
+                    EmployeeMonthTotal.month_start == start_of_month,
+                ))
+            )
+        else:
+            stats = EmployeeService.work_stats_subquery(
+                today,
+                WorkDay.employee_id.in_(select(Employee.id).where(Employee.user_id == user_id)),
             )
+            hours_today, hours_week, hours_month = stats.c.today, stats.c.week, stats.c.month
+            query = query.outerjoin(stats, stats.c.employee_id == Employee.id)
+
+        query = query.add_columns(
+            hours_today.label("hours_today"),
+            hours_week.label("hours_week"),
+            hours_month.label("hours_month"),
+        )
 
-        sq_today = select(func.sum(WorkDay.total_duration)) \
-            .where(WorkDay.employee_id == Employee.id) \
-            .where(WorkDay.work_date == today) \
-            .correlate(Employee) \
-            .scalar_subquery()
+        if params.workplace_id is not None:
+            query = query.where(Employee.workplace_id == params.workplace_id)
+        if params.is_active is not None:
+            query = query.where(Employee.is_active == params.is_active)
+        if params.search:
+            query = query.where(or_(
+                Employee.first_name.istartswith(params.search, autoescape=True),
+                Employee.last_name.istartswith(params.search, autoescape=True),
+                Employee.email.istartswith(params.search, autoescape=True),
+            ))
 
-        sq_week = get_duration_subquery(start_of_week)
-        sq_month = get_duration_subquery(start_of_month)
+        sort_field = params.sort.lstrip("-")
+        descending = params.sort.startswith("-")
+        sort_keys = {
+            "name": (Employee.last_name, Employee.first_name),
+            "created_at": (Employee.created_at,),
+            "week": (func.coalesce(hours_week, timedelta()),),
+            "month": (func.coalesce(hours_month, timedelta()),),
+        }[sort_field] + (Employee.id,)
+
+        if params.cursor:
+            cursor_values = decode_cursor(params.cursor, params.sort)
+            if (
+                cursor_values is None
+                or len(cursor_values) != len(sort_keys)
+                or not all(isinstance(value, key.type.python_type) for key, value in zip(sort_keys, cursor_values))
+            ):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            keys = tuple_(*sort_keys)
+            after = tuple_(*(literal(value, key.type) for key, value in zip(sort_keys, cursor_values)))
+            query = query.where(keys < after if descending else keys > after)
 
         query = (
+            query
+            .order_by(*(key.desc() if descending else key for key in sort_keys))
+            .limit(params.limit + 1)
+        )
+
+        result = await session.execute(query)
+        rows = result.all()
+
+        headers = {}
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            last = rows[-1]
+            headers["X-Next-Cursor"] = encode_cursor(params.sort, {
+                "name": (last[0].last_name, last[0].first_name),
+                "created_at": (last[0].created_at,),
+                "week": (last.hours_week or timedelta(),),
+                "month": (last.hours_month or timedelta(),),
+            }[sort_field] + (last[0].id,))
+
+        # rows come straight from the DB, so they are serialized once without
+        # validation; returning a response also skips FastAPI's response_model pass
+        base_url = base_url_prefix(request)
+        return FastJSONResponse(
+            [
+                EmployeeWithStatsReturnSchema.dump_row(
+                    row[0], row.hours_today, row.hours_week, row.hours_month, base_url, params.photo_size
+                )
+                for row in rows
+            ],
+            headers=headers,
+        )
+
+
+    @staticmethod
+    def work_stats_subquery(today: date, *criteria):
+        """
+        Return subquery with today, week and month totals per employee.
+
+        All three totals are computed in a single pass over the work days of
+        the current week and month, grouped by employee.
+
+        Args:
+            today (date): Current date.
+            criteria: Extra conditions on work days, e.g. limiting employees.
+        """
+        start_of_week = today - timedelta(days=today.weekday())
+        start_of_month = today.replace(day=1)
+
+        return (
             select(
-                Employee,
-                sq_today.label("hours_today"),
-                sq_week.label("hours_week"),
-                sq_month.label("hours_month")
+                WorkDay.employee_id,
+                func.sum(WorkDay.total_duration).filter(WorkDay.work_date == today).label("today"),
+                func.sum(WorkDay.total_duration).filter(WorkDay.work_date >= start_of_week).label("week"),
+                func.sum(WorkDay.total_duration).filter(WorkDay.work_date >= start_of_month).label("month"),
             )
+            .where(WorkDay.work_date >= min(start_of_week, start_of_month), WorkDay.work_date <= today, *criteria)
+            .group_by(WorkDay.employee_id)
+            .subquery("work_stats")
+        )
+
+
+    @staticmethod
+    async def export_work_sessions(payload: TokenPayload, params: TimesheetExportParamsSchema) -> StreamingResponse:
+        """
+        Stream work sessions of current user's employees as CSV or NDJSON.
+
+        Rows are read from a server-side cursor and written out chunk by
+        chunk, so memory use does not depend on the size of the export.
+
+        Args:
+            payload (TokenPayload): Validated payload.
+            params (TimesheetExportParamsSchema): Export format and filters.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        stmt = (
+            select(
+                WorkSession.id.label("session_id"),
+                Employee.id.label("employee_id"),
+                Employee.first_name,
+                Employee.last_name,
+                Employee.email,
+                Employee.workplace_id,
+                WorkSession.work_date,
+                WorkSession.start_time,
+                WorkSession.end_time,
+                cast(func.round(extract("epoch", WorkSession.end_time - WorkSession.start_time)), Integer)
+                .label("duration_seconds"),
+            )
+            .join(Employee, WorkSession.employee_id == Employee.id)
             .where(Employee.user_id == user_id)
-            .options(selectinload(Employee.workplace))
+            .order_by(WorkSession.employee_id, WorkSession.start_time)
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
         )
+        if params.workplace_id is not None:
+            stmt = stmt.where(Employee.workplace_id == params.workplace_id)
+        if params.date_from:
+            stmt = stmt.where(WorkSession.work_date >= params.date_from)
+        if params.date_to:
+            stmt = stmt.where(WorkSession.work_date <= params.date_to)
+
+        columns = [column.name for column in stmt.selected_columns]
+
+        def format_csv(rows) -> str:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(
+                [value.isoformat() if isinstance(value, (date, datetime)) else value for value in row]
+                for row in rows
+            )
+            return buffer.getvalue()
 
-        result = await session.execute(query)
-        rows = result.all()
+        def format_ndjson(rows) -> str:
+            return "".join(
+                json.dumps(dict(zip(columns, row)), default=lambda value: value.isoformat()) + "\n"
+                for row in rows
+            )
+
+        formatter = format_csv if params.format == "csv" else format_ndjson
+
+        async def read_chunks(chunks: asyncio.Queue, stopped: asyncio.Event):
+            # own session, the request one is closed once the response starts
+            try:
+                async with new_session() as session:
+                    result = await session.stream(stmt)
+                    async for rows in result.partitions():
+                        if stopped.is_set():
+                            break
+                        await chunks.put(formatter(rows))
+            finally:
+                await chunks.put(None)
+
+        async def generate():
+            if params.format == "csv":
+                yield ",".join(columns) + "\r\n"
+
+            # The cursor is read in a separate task: a client disconnect cancels
+            # this generator, and cancelling a running asyncpg query would leave
+            # a broken connection in the pool. The bounded queue keeps memory flat.
+            chunks = asyncio.Queue(maxsize=2)
+            stopped = asyncio.Event()
+            reader = asyncio.create_task(read_chunks(chunks, stopped))
+            try:
+                while (chunk := await chunks.get()) is not None:
+                    yield chunk
+                await reader
+            finally:
+                if not reader.done():
+                    stopped.set()
+                    # unblock the reader, it stops at the next chunk
+                    while not chunks.empty():
+                        chunks.get_nowait()
+                    EXPORT_READERS.add(reader)
+                    reader.add_done_callback(EXPORT_READERS.discard)
+
+        media_type, extension = ("text/csv", "csv") if params.format == "csv" else ("application/x-ndjson", "ndjson")
+        return StreamingResponse(
+            generate(),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="work_sessions.{extension}"'},
+        )
 
-        response_data = []
-        for row in rows:
-            employee = row[0]
-            emp_dict = EmployeeReturnSchema.model_validate(employee).model_dump(context={"request": request})
 
-            emp_dict["work_stats"] = {
-                "today": row[1],
-                "week": row[2],
-                "month": row[3]
-            }
+    @staticmethod
+    async def live_events(payload: TokenPayload) -> StreamingResponse:
+        """
+        Stream clock deltas of current user's employees as server-sent events.
 
-            response_data.append(emp_dict)
+        Each `clock` event carries the employee id, its on/off shift state and,
+        once a session was closed, the updated day, week and month totals.
 
-        return [EmployeeWithStatsReturnSchema.model_validate(data) for data in response_data]
+        Args:
+            payload (TokenPayload): Validated payload.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        async def events():
+            subscription = live_hub.subscribe(user_id)
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    try:
+                        async with asyncio.timeout(LIVE_KEEPALIVE_SECONDS):
+                            message = await subscription.get()
+                    except TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                    if message is None:
+                        # fell behind, the client reconnects and reloads the list
+                        break
+                    yield f"event: clock\ndata: {message}\n\n"
+            finally:
+                live_hub.unsubscribe(subscription)
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+    @staticmethod
+    async def get_on_shift(payload: TokenPayload, workplace_id: int | None = None) -> OnShiftSchema:
+        """
+        Return current user's employees with an open work session.
+
+        Served from the in-memory presence registry without a database query.
+
+        Args:
+            payload (TokenPayload): Validated payload.
+            workplace_id (int | None): Only employees of this work place.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        employees = []
+        by_workplace: dict[int, int] = {}
+        for employee_id, (employee_workplace_id, started_at) in presence.on_shift(user_id).items():
+            if workplace_id is not None and employee_workplace_id != workplace_id:
+                continue
+            by_workplace[employee_workplace_id] = by_workplace.get(employee_workplace_id, 0) + 1
+            employees.append(OnShiftEmployeeSchema(
+                employee_id=employee_id, workplace_id=employee_workplace_id, started_at=started_at
+            ))
+
+        return OnShiftSchema(count=len(employees), by_workplace=by_workplace, employees=employees)
 
 
     @staticmethod
@@ -142,10 +440,24 @@ class EmployeeService:
             request: Request,
             employee_id: int,
             session: SessionDep,
-            week: date | None,
-            month: date | None,
+            params: EmployeeDetailParamsSchema,
             payload: TokenPayload
     ) -> EmployeeWorkDetailSchema:
+        """
+        Return employee detail with worked time per day, week or month.
+
+        Periods without work are filled in by the database from
+        generate_series, so every bucket of the range is present. The
+        computed buckets are kept in the report cache until a session of
+        the employee within the range is closed.
+
+        Args:
+            request (Request): Request object.
+            employee_id (int): Employee id.
+            session (AsyncSession): Session object.
+            params (EmployeeDetailParamsSchema): Period and bucketing.
+            payload (TokenPayload): Token payload.
+        """
         user_id = extract_user_uid_from_token(payload)
 
         query = (
@@ -159,100 +471,291 @@ class EmployeeService:
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found or access denied")
 
-        period_type = "today"
-        today = date.today()
-
-        if week:
-            start_date = week - timedelta(days=week.weekday())
+        if params.date_from:
+            start_date, end_date = params.date_from, params.date_to
+            period_type = "range"
+        elif params.week:
+            start_date = params.week - timedelta(days=params.week.weekday())
             end_date = start_date + timedelta(days=6)
             period_type = "week"
-        elif month:
-            start_date = month.replace(day=1)
+        elif params.month:
+            start_date = params.month.replace(day=1)
             _, days_in_month = monthrange(start_date.year, start_date.month)
             end_date = start_date.replace(day=days_in_month)
             period_type = "month"
         else:
-            start_date = today
-            end_date = today
+            start_date = end_date = date.today()
             period_type = "today"
 
-        stmt = select(WorkDay).where(
-            WorkDay.employee_id == employee.id,
-            WorkDay.work_date.between(start_date, end_date)
+        cache_key = (employee.id, "detail", start_date, end_date, params.bucket)
+        rows = report_cache.get(cache_key)
+        if rows is None:
+            rows = await EmployeeService.work_summary_buckets(
+                session, employee.id, start_date, end_date, params.bucket
+            )
+            report_cache.set(cache_key, rows, employee.id, start_date, end_date)
+        total_seconds = sum(seconds for _, seconds in rows)
+
+        return EmployeeWorkDetailSchema(
+            employee=EmployeeReturnDetailSchema.model_validate(employee).model_dump(
+                context={"request": request, "photo_size": params.photo_size}
+            ),
+            period=period_type,
+            bucket=params.bucket,
+            date_from=start_date,
+            date_to=end_date,
+            work_summary=[WorkSummarySchema(date=day, seconds=seconds) for day, seconds in rows],
+            total_seconds=total_seconds,
+            total_hours=round(total_seconds / 3600, 2),
+        )
+
+
+    @staticmethod
+    async def work_summary_buckets(
+            session: SessionDep,
+            employee_id: int,
+            start_date: date,
+            end_date: date,
+            bucket: str
+    ) -> tuple[tuple[date, int], ...]:
+        """
+        Return worked seconds of employee per bucket, gaps filled with zeros.
+
+        Args:
+            session (AsyncSession): Session object.
+            employee_id (int): Employee id.
+            start_date (date): First day of the range.
+            end_date (date): Last day of the range.
+            bucket (str): "day", "week" or "month".
+        """
+        buckets = func.generate_series(
+            func.date_trunc(bucket, cast(literal(start_date), DateTime)),
+            cast(literal(end_date), DateTime),
+            cast(literal(f"1 {bucket}"), Interval),
+        ).table_valued("bucket").render_derived(name="buckets")
+        bucket_date = cast(buckets.c.bucket, Date)
+
+        stmt = (
+            select(
+                bucket_date,
+                cast(func.coalesce(func.sum(extract("epoch", WorkDay.total_duration)), 0), Integer),
+            )
+            .select_from(buckets)
+            .outerjoin(
+                WorkDay,
+                and_(
+                    WorkDay.employee_id == employee_id,
+                    WorkDay.work_date.between(start_date, end_date),
+                    cast(func.date_trunc(bucket, cast(WorkDay.work_date, DateTime)), Date) == bucket_date,
+                ),
+            )
+            .group_by(bucket_date)
+            .order_by(bucket_date)
         )
         result = await session.execute(stmt)
-        db_work_days = result.scalars().all()
-        work_map = {wd.work_date: wd.total_duration for wd in db_work_days}
-        summaries: list[WorkSummarySchema] = []
-        total_period_hours_float = 0.0
-
-        current_date = start_date
-        while current_date <= end_date:
-            duration = work_map.get(current_date)
-
-            hours_time_obj = None
-            if duration:
-                total_period_hours_float += duration.total_seconds() / 3600
-                hours_time_obj = (datetime.min + duration).time()
-
-            summaries.append(WorkSummarySchema(
-                date=current_date,
-                work_time=hours_time_obj
-            ))
+        return tuple(tuple(row) for row in result)
 
-            current_date += timedelta(days=1)
 
-        return EmployeeWorkDetailSchema(
-            employee=EmployeeReturnDetailSchema.model_validate(employee).model_dump(context={"request": request}),
-            period=period_type,
-            work_summary=summaries,
-            total_hours=round(total_period_hours_float, 2),
+    @staticmethod
+    async def get_workplace_timesheet(
+            workplace_id: int,
+            session: SessionDep,
+            month: date | None,
+            payload: TokenPayload
+    ) -> WorkplaceTimesheetSchema:
+        """
+        Return worked seconds of every employee at work place for every day of month.
+
+        The whole matrix is computed by a single query that aggregates one
+        gap-filled row of seconds per employee.
+
+        Args:
+            workplace_id (int): Work place id.
+            session (AsyncSession): Session object.
+            month (date | None): Any day of the month, current month by default.
+            payload (TokenPayload): Token payload.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        workplace = await session.get(WorkPlace, workplace_id)
+        if not workplace:
+            raise HTTPException(status_code=404, detail="Workplace not found")
+
+        start_date = (month or date.today()).replace(day=1)
+        _, days_in_month = monthrange(start_date.year, start_date.month)
+        end_date = start_date.replace(day=days_in_month)
+
+        days = func.generate_series(
+            cast(literal(start_date), DateTime),
+            cast(literal(end_date), DateTime),
+            cast(literal("1 day"), Interval),
+        ).table_valued("day").render_derived(name="days")
+        day = cast(days.c.day, Date)
+
+        employees = (
+            select(Employee.id, Employee.last_name, Employee.first_name)
+            .where(Employee.user_id == user_id, Employee.workplace_id == workplace_id)
+            .subquery()
+        )
+        seconds = cast(func.coalesce(extract("epoch", WorkDay.total_duration), 0), Integer)
+
+        stmt = (
+            select(employees.c.id, func.array_agg(aggregate_order_by(seconds, day)))
+            .select_from(employees)
+            .join(days, true())
+            .outerjoin(
+                WorkDay,
+                and_(
+                    WorkDay.employee_id == employees.c.id,
+                    WorkDay.work_date.between(start_date, end_date),
+                    WorkDay.work_date == day,
+                ),
+            )
+            .group_by(employees.c.id, employees.c.last_name, employees.c.first_name)
+            .order_by(employees.c.last_name, employees.c.first_name, employees.c.id)
+        )
+        rows = (await session.execute(stmt)).all()
+
+        return WorkplaceTimesheetSchema(
+            workplace_id=workplace_id,
+            month=start_date,
+            employee_ids=[employee_id for employee_id, _ in rows],
+            dates=[start_date + timedelta(days=offset) for offset in range(days_in_month)],
+            seconds=[value for _, row in rows for value in row],
         )
 
 
     @staticmethod
-    async def start_work(session: SessionDep, token: str):
+    async def resolve_personal_token(session: SessionDep, token: str) -> CachedEmployee:
         """
-        Start a new work session for current employee.
+        Resolve personal token to a slim employee record.
+
+        Served from the in-process token cache when possible, otherwise
+        loaded with a single narrow query on the unique token digest index
+        and cached. The digest is only computed on a cache miss.
+
         Args:
             session (AsyncSession): Session object.
             token (str): Employee token.
         """
-        query = select(Employee).where(Employee.personal_token == token)
+        employee = token_cache.get(token)
+        if employee:
+            return employee
+
+        query = select(
+            Employee.id, Employee.user_id, Employee.workplace_id, Employee.is_active
+        ).where(Employee.personal_token_digest == digest_personal_token(token))
         result = await session.execute(query)
-        employee = result.scalar_one_or_none()
-        if not employee:
+        row = result.one_or_none()
+        if not row:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        today = date.today()
+        employee = CachedEmployee(**row._mapping)
+        token_cache.set(token, employee)
+        return employee
 
-        stmt = select(WorkDay).where(
-            WorkDay.employee_id == employee.id, WorkDay.work_date == today
-        )
-        result = await session.execute(stmt)
-        work_day = result.scalar_one_or_none()
 
-        if not work_day:
-            work_day = WorkDay(employee_id=employee.id, work_date=today, total_duration=timedelta())
-            session.add(work_day)
-            await session.commit()
-            await session.refresh(work_day)
+    @staticmethod
+    async def start_work(session: SessionDep, token: str):
+        """
+        Start a new work session for current employee.
 
-        stmt = select(WorkSession).where(
-            WorkSession.work_day_id == work_day.id,
-            WorkSession.end_time.is_(None)
+        The work day upsert and the session insert are issued as a single
+        statement. Clock-ins of the same employee are serialized by an
+        advisory lock held until commit, since the insert's guard against an
+        already open session only sees rows committed before it started.
+
+        Args:
+            session (AsyncSession): Session object.
+            token (str): Employee token.
+        """
+        employee = await EmployeeService.resolve_personal_token(session, token)
+
+        if work_event_writer.enabled:
+            await work_event_writer.put(WorkEventSchema(token=token, type="start", timestamp=datetime.now(timezone.utc)))
+            return {"message": "Work session start queued"}
+
+        await EmployeeService.lock_employees(session, {employee.id})
+
+        work_day_insert = insert(WorkDay).values(employee_id=employee.id, work_date=date.today())
+        work_day_cte = (
+            work_day_insert
+            # no-op update, so RETURNING also yields an already existing day
+            .on_conflict_do_update(
+                constraint="uq_employee_day",
+                set_={"total_duration": WorkDay.total_duration},
+            )
+            .returning(WorkDay.id, WorkDay.work_date)
+            .cte("work_day")
         )
-        result = await session.execute(stmt)
-        open_session = result.scalar_one_or_none()
-        if open_session:
+
+        open_session = select(WorkSession.id).where(
+            WorkSession.employee_id == employee.id,
+            WorkSession.end_time.is_(None),
+            EmployeeService.recent_work_sessions(),
+        )
+        new_session_cte = (
+            insert(WorkSession)
+            .from_select(
+                # Python side defaults are not applied to inserts nested in a CTE
+                ["work_day_id", "work_date", "employee_id", "start_time", "needs_review"],
+                select(work_day_cte.c.id, work_day_cte.c.work_date, literal(employee.id), func.now(), false())
+                .where(~open_session.exists()),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[WorkSession.employee_id, WorkSession.work_date],
+                index_where=WorkSession.end_time.is_(None),
+            )
+            .returning(WorkSession.id, WorkSession.start_time)
+            .cte("new_session")
+        )
+
+        try:
+            result = await session.execute(select(new_session_cte.c.id, new_session_cte.c.start_time))
+        except IntegrityError:
+            # employee was deleted after its token had been cached
+            token_cache.invalidate(token)
+            raise HTTPException(status_code=404, detail="Employee not found")
+
+        row = result.one_or_none()
+        if row is None:
             raise HTTPException(status_code=400, detail="Work session already started")
 
-        new_session = WorkSession(work_day_id=work_day.id, start_time=datetime.utcnow())
-        session.add(new_session)
         await session.commit()
-        await session.refresh(new_session)
+        session_id, start_time = row
+        EmployeeService.publish_clock_event(employee, True, start_time)
+        return {"message": "Work session started", "session_id": session_id}
+
 
-        return {"message": "Work session started", "session_id": new_session.id}
+    @staticmethod
+    def recent_work_sessions():
+        """
+        Return condition limiting work sessions to the work days an open session can belong to.
+
+        Auto-close keeps sessions from staying open longer than
+        OPEN_SESSION_MAX_AGE, a day short of the window, so no open session
+        is missed, while the planner prunes older and future monthly
+        partitions. Tomorrow is included for clock skew between servers.
+        """
+        today = date.today()
+        return WorkSession.work_date.between(today - timedelta(days=OPEN_SESSION_MAX_DAYS), today + timedelta(days=1))
+
+
+    @staticmethod
+    async def lock_employees(session: SessionDep, employee_ids: set[int]) -> None:
+        """
+        Take the clock lock of employees, held until the transaction ends.
+
+        Clock-ins and batch ingestion take it before checking for open
+        sessions. Locks are taken in id order, so batches cannot deadlock.
+
+        Args:
+            session (AsyncSession): Session object.
+            employee_ids (set[int]): Employee ids.
+        """
+        # unnest() yields the sorted ids in array order
+        ids = func.unnest(literal(sorted(employee_ids), ARRAY(Integer)))
+        await session.execute(select(func.pg_advisory_xact_lock(func.hashtext("employee_clock"), ids)))
 
 
     @staticmethod
@@ -260,51 +763,652 @@ class EmployeeService:
         """
         End work session for current employee.
 
+        The open session is found by the employee's open session index, so
+        sessions started on a previous day are closed as well. Closing it and
+        adding its duration to the work day it started on is a single
+        statement.
+
         Args:
             session (AsyncSession): Session object.
             token (str): Employee token.
         """
-        query = select(Employee).where(Employee.personal_token == token)
-        result = await session.execute(query)
-        employee = result.scalar_one_or_none()
-        if not employee:
-            raise HTTPException(status_code=404, detail="Employee not found")
+        employee = await EmployeeService.resolve_personal_token(session, token)
+
+        if work_event_writer.enabled:
+            await work_event_writer.put(WorkEventSchema(token=token, type="end", timestamp=datetime.now(timezone.utc)))
+            return {"message": "Work session end queued"}
+
+        closed_cte = (
+            update(WorkSession)
+            .where(
+                WorkSession.employee_id == employee.id,
+                WorkSession.end_time.is_(None),
+                EmployeeService.recent_work_sessions(),
+            )
+            .values(end_time=func.now())
+            .returning(
+                WorkSession.work_day_id,
+                WorkSession.work_date,
+                (WorkSession.end_time - WorkSession.start_time).label("duration"),
+            )
+            .cte("closed_session")
+        )
 
-        today = date.today()
+        work_day_cte, *rollup_ctes = EmployeeService.add_session_durations(closed_cte)
+        stmt = (
+            select(
+                work_day_cte.c.duration,
+                work_day_cte.c.work_date,
+                *EmployeeService.updated_totals(work_day_cte, rollup_ctes),
+            )
+            # not read by the outer query, but must be rendered to run
+            .add_cte(*rollup_ctes)
+        )
+        result = await session.execute(stmt)
+        row = result.one_or_none()
 
-        stmt = select(WorkDay).where(
-            WorkDay.employee_id == employee.id,
-            WorkDay.work_date == today
+        if row is None:
+            raise HTTPException(status_code=400, detail="No active session to close")
+
+        await session.commit()
+        duration = row.duration
+        report_cache.invalidate(employee.id, row.work_date)
+        EmployeeService.publish_clock_event(employee, False, datetime.now(timezone.utc), row)
+        return {"message": "Work session ended", "worked_for": str(duration)}
+
+
+    @staticmethod
+    def add_session_durations(closed_sessions) -> list:
+        """
+        Return CTEs adding closed session durations to their work days and
+        to the weekly and monthly rollups.
+
+        The increments are applied by the database, so concurrent clock-outs
+        on the same work day cannot overwrite each other.
+
+        Args:
+            closed_sessions: Selectable with `work_day_id`, `work_date` and `duration` columns.
+        """
+        totals = (
+            select(
+                closed_sessions.c.work_day_id,
+                closed_sessions.c.work_date,
+                func.sum(closed_sessions.c.duration).label("duration"),
+            )
+            .group_by(closed_sessions.c.work_day_id, closed_sessions.c.work_date)
+            .subquery("totals")
+        )
+        work_day_cte = (
+            update(WorkDay)
+            .where(WorkDay.id == totals.c.work_day_id, WorkDay.work_date == totals.c.work_date)
+            .values(total_duration=WorkDay.total_duration + totals.c.duration)
+            .returning(WorkDay.id, WorkDay.employee_id, WorkDay.work_date, WorkDay.total_duration, totals.c.duration)
+            .cte("work_day")
+        )
+
+        ctes = [work_day_cte]
+        for model, period_column, unit in ROLLUP_PERIODS:
+            period_start = cast(func.date_trunc(unit, work_day_cte.c.work_date), Date)
+            rollup_insert = insert(model).from_select(
+                ["employee_id", period_column, "total_duration"],
+                select(work_day_cte.c.employee_id, period_start, func.sum(work_day_cte.c.duration))
+                .group_by(work_day_cte.c.employee_id, period_start),
+            )
+            ctes.append(
+                rollup_insert
+                .on_conflict_do_update(
+                    index_elements=["employee_id", period_column],
+                    set_={"total_duration": model.total_duration + rollup_insert.excluded.total_duration},
+                )
+                .returning(model.employee_id, getattr(model, period_column).label("period_start"), model.total_duration)
+                .cte(f"{unit}_total")
+            )
+        return ctes
+
+
+    @staticmethod
+    def updated_totals(work_day_cte, rollup_ctes) -> list:
+        """
+        Return day, week and month total columns for rows of the work day CTE
+        of `add_session_durations`, as written by the same statement.
+
+        Args:
+            work_day_cte: Work day CTE.
+            rollup_ctes: Rollup CTEs, in ROLLUP_PERIODS order.
+        """
+        columns = [work_day_cte.c.total_duration.label("day_total")]
+        for cte, (_, _, unit) in zip(rollup_ctes, ROLLUP_PERIODS):
+            columns.append(
+                select(cte.c.total_duration)
+                .where(
+                    cte.c.employee_id == work_day_cte.c.employee_id,
+                    cte.c.period_start == cast(func.date_trunc(unit, work_day_cte.c.work_date), Date),
+                )
+                .scalar_subquery()
+                .label(f"{unit}_total")
+            )
+        return columns
+
+
+    @staticmethod
+    def publish_clock_event(employee: CachedEmployee, on_shift: bool, at: datetime, totals=None) -> None:
+        """
+        Publish a clock delta to the live dashboards of the employee's employer.
+
+        Args:
+            employee (CachedEmployee): Employee.
+            on_shift (bool): Whether the employee has an open session now.
+            at (datetime): Event time.
+            totals: Row with work_date, day_total, week_total and month_total, if they changed.
+        """
+        event = {
+            "employee_id": employee.id,
+            "workplace_id": employee.workplace_id,
+            "state": "on_shift" if on_shift else "off_shift",
+            "at": at.isoformat(),
+        }
+        if totals is not None:
+            event.update(
+                work_date=totals.work_date.isoformat(),
+                day_seconds=int(totals.day_total.total_seconds()),
+                week_seconds=int(totals.week_total.total_seconds()),
+                month_seconds=int(totals.month_total.total_seconds()),
+            )
+        live_hub.publish(employee.user_id, event)
+
+
+    @staticmethod
+    def publish_cache_change(
+            user_id: int,
+            employee_id: int,
+            work_dates: list[date] | None = None,
+            all_reports: bool = False,
+            token_changed: bool = False
+    ) -> None:
+        """
+        Drop cached reports and tokens of employee on every worker, without a clock delta.
+
+        Args:
+            user_id (int): Employer (user) id.
+            employee_id (int): Employee id.
+            work_dates (list[date] | None): Work days whose reports changed.
+            all_reports (bool): Whether all reports of employee changed.
+            token_changed (bool): Whether employee's personal token stopped working.
+        """
+        event = {"employee_id": employee_id}
+        if work_dates:
+            event["work_dates"] = [day.isoformat() for day in work_dates]
+        if all_reports:
+            event["all_reports"] = True
+        if token_changed:
+            event["token_changed"] = True
+        live_hub.publish(user_id, event, dashboards=False)
+
+
+    @staticmethod
+    async def rebuild_rollups(session: SessionDep, since: date | None = None) -> None:
+        """
+        Recompute weekly and monthly rollups from work days.
+
+        Rollup tables are locked for the rebuild, so clock-outs running
+        meanwhile add their durations after it instead of being lost.
+
+        Args:
+            session (AsyncSession): Session object.
+            since (date | None): Rebuild only periods containing or following this date.
+        """
+        await session.execute(text(
+            f"LOCK TABLE {EmployeeWeekTotal.__tablename__}, {EmployeeMonthTotal.__tablename__} IN EXCLUSIVE MODE"
+        ))
+
+        for model, period_column, unit in ROLLUP_PERIODS:
+            period_start = cast(func.date_trunc(unit, WorkDay.work_date), Date)
+            delete_stmt = delete(model)
+            select_stmt = (
+                select(WorkDay.employee_id, period_start, func.sum(WorkDay.total_duration))
+                .group_by(WorkDay.employee_id, period_start)
+            )
+            if since:
+                first_day = since - timedelta(days=since.weekday()) if unit == "week" else since.replace(day=1)
+                delete_stmt = delete_stmt.where(getattr(model, period_column) >= first_day)
+                select_stmt = select_stmt.where(WorkDay.work_date >= first_day)
+
+            await session.execute(delete_stmt)
+            await session.execute(
+                insert(model).from_select(["employee_id", period_column, "total_duration"], select_stmt)
+            )
+
+        await session.commit()
+
+
+    @staticmethod
+    async def auto_close_sessions(session: SessionDep, limit: int) -> int:
+        """
+        Close up to `limit` forgotten sessions and flag them for review.
+
+        A session is forgotten once it has been open longer than its work
+        place's `auto_close_after`, or OPEN_SESSION_MAX_AGE whatever the work
+        place's settings, since clock events look for open sessions only
+        that far back. It is closed at its start plus `auto_close_credit`,
+        capped by the age it was closed at, and its duration is added to its
+        work day and rollups in the same statement. Sessions locked by a
+        concurrent clock-out are skipped, not waited for.
+
+        Args:
+            session (AsyncSession): Session object.
+            limit (int): Maximum number of sessions to close.
+        """
+        close_after = func.least(func.coalesce(WorkPlace.auto_close_after, AUTO_CLOSE_AFTER), OPEN_SESSION_MAX_AGE)
+        credit = func.least(func.coalesce(WorkPlace.auto_close_credit, AUTO_CLOSE_CREDIT), close_after)
+        candidates = (
+            select(WorkSession.id, WorkSession.work_date, (WorkSession.start_time + credit).label("end_time"))
+            .join(Employee, Employee.id == WorkSession.employee_id)
+            .join(WorkPlace, WorkPlace.id == Employee.workplace_id)
+            .where(
+                WorkSession.end_time.is_(None),
+                or_(WorkPlace.auto_close_enabled, WorkSession.start_time < func.now() - OPEN_SESSION_MAX_AGE),
+                WorkSession.start_time < func.now() - close_after,
+            )
+            .order_by(WorkSession.start_time)
+            .limit(limit)
+            .with_for_update(of=WorkSession, skip_locked=True)
+            .cte("candidates")
+        )
+        closed_cte = (
+            update(WorkSession)
+            .where(WorkSession.id == candidates.c.id, WorkSession.work_date == candidates.c.work_date)
+            .values(end_time=candidates.c.end_time, needs_review=True)
+            .returning(
+                WorkSession.employee_id,
+                WorkSession.work_day_id,
+                WorkSession.work_date,
+                WorkSession.end_time,
+                (WorkSession.end_time - WorkSession.start_time).label("duration"),
+            )
+            .cte("closed_session")
+        )
+        work_day_cte, *rollup_ctes = EmployeeService.add_session_durations(closed_cte)
+
+        stmt = (
+            select(
+                Employee.id,
+                Employee.user_id,
+                Employee.workplace_id,
+                Employee.is_active,
+                closed_cte.c.end_time,
+                work_day_cte.c.work_date,
+                *EmployeeService.updated_totals(work_day_cte, rollup_ctes),
+            )
+            .select_from(closed_cte)
+            .join(
+                work_day_cte,
+                and_(work_day_cte.c.id == closed_cte.c.work_day_id, work_day_cte.c.work_date == closed_cte.c.work_date),
+            )
+            .join(Employee, Employee.id == closed_cte.c.employee_id)
+            .add_cte(*rollup_ctes)
         )
         result = await session.execute(stmt)
-        work_day = result.scalar_one_or_none()
-        if not work_day:
-            raise HTTPException(status_code=400, detail="No work day started today")
+        rows = result.all()
+        await session.commit()
+
+        for row in rows:
+            report_cache.invalidate(row.id, row.work_date)
+            employee = CachedEmployee(row.id, row.user_id, row.workplace_id, row.is_active)
+            EmployeeService.publish_clock_event(employee, False, row.end_time, row)
+        return len(rows)
+
+
+    @staticmethod
+    async def close_forgotten_sessions(chunk_size: int) -> int:
+        """
+        Auto-close all forgotten sessions, one short transaction per chunk.
+
+        Args:
+            chunk_size (int): Sessions closed per transaction.
+        """
+        total = 0
+        while True:
+            async with new_session() as session:
+                closed = await EmployeeService.auto_close_sessions(session, chunk_size)
+            total += closed
+            if closed < chunk_size:
+                break
+        if total:
+            logger.info(f"Auto-closed {total} forgotten work sessions.")
+        return total
+
 
-        stmt = select(WorkSession).where(
-            WorkSession.work_day_id == work_day.id,
-            WorkSession.end_time.is_(None)
+    @staticmethod
+    async def get_sessions_for_review(payload: TokenPayload, session: SessionDep) -> list[ReviewSessionSchema]:
+        """
+        Return auto-closed sessions of current user's employees awaiting review.
+
+        Args:
+            payload (TokenPayload): Validated payload.
+            session (AsyncSession): Session object.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        stmt = (
+            select(WorkSession.id, WorkSession.employee_id, WorkSession.start_time, WorkSession.end_time)
+            .join(Employee, Employee.id == WorkSession.employee_id)
+            .where(Employee.user_id == user_id, WorkSession.needs_review)
+            .order_by(WorkSession.start_time)
         )
         result = await session.execute(stmt)
-        open_session = result.scalar_one_or_none()
-        if not open_session:
-            raise HTTPException(status_code=400, detail="No active session to close")
+        return [ReviewSessionSchema.model_validate(row) for row in result.mappings()]
 
-        now = datetime.now(timezone.utc)
-        open_session.end_time = now
-        duration = now - open_session.start_time
 
-        total_duration = work_day.total_duration or timedelta()
-        total_duration += duration
+    @staticmethod
+    async def review_session(
+            session_id: int,
+            data: ReviewSessionUpdateSchema,
+            session: SessionDep,
+            payload: TokenPayload
+    ) -> ReviewSessionSchema:
+        """
+        Accept an auto-closed session of current user's employee and clear its review flag.
 
-        await session.execute(
-            update(WorkDay)
-            .where(WorkDay.id == work_day.id)
-            .values(total_duration=total_duration)
+        A corrected end time replaces the credited one, and the difference
+        is added to the session's work day and rollups in the same
+        statement.
+
+        Args:
+            session_id (int): Work session id.
+            data (ReviewSessionUpdateSchema): Corrected end time, if any.
+            session (AsyncSession): Session object.
+            payload (TokenPayload): Validated payload.
+        """
+        user_id = extract_user_uid_from_token(payload)
+
+        stmt = (
+            select(WorkSession.id, WorkSession.work_date, WorkSession.employee_id, WorkSession.start_time, WorkSession.end_time)
+            .join(Employee, Employee.id == WorkSession.employee_id)
+            .where(WorkSession.id == session_id, Employee.user_id == user_id, WorkSession.needs_review)
+            .with_for_update(of=WorkSession)
+        )
+        work_session = (await session.execute(stmt)).one_or_none()
+        if work_session is None:
+            raise HTTPException(status_code=404, detail="Session awaiting review not found")
+
+        end_time = data.end_time or work_session.end_time
+        if not work_session.start_time < end_time <= datetime.now(timezone.utc):
+            raise HTTPException(status_code=400, detail="End time must be after the session start and not in the future")
+
+        reviewed_cte = (
+            update(WorkSession)
+            .where(WorkSession.id == work_session.id, WorkSession.work_date == work_session.work_date)
+            .values(end_time=end_time, needs_review=False)
+            .returning(
+                WorkSession.work_day_id,
+                WorkSession.work_date,
+                (WorkSession.end_time - literal(work_session.end_time, DateTime(timezone=True))).label("duration"),
+            )
+            .cte("reviewed_session")
         )
+        work_day_cte, *rollup_ctes = EmployeeService.add_session_durations(reviewed_cte)
+        await session.execute(select(work_day_cte.c.id).add_cte(*rollup_ctes))
+        await session.commit()
+
+        if end_time != work_session.end_time:
+            report_cache.invalidate(work_session.employee_id, work_session.work_date)
+            EmployeeService.publish_cache_change(user_id, work_session.employee_id, [work_session.work_date])
+        return ReviewSessionSchema(
+            id=work_session.id,
+            employee_id=work_session.employee_id,
+            start_time=work_session.start_time,
+            end_time=end_time,
+        )
+
+
+    @staticmethod
+    async def resolve_personal_tokens(session: SessionDep, tokens: set[str]) -> dict[str, CachedEmployee]:
+        """
+        Resolve many personal tokens at once, unknown tokens are left out.
+
+        Args:
+            session (AsyncSession): Session object.
+            tokens (set[str]): Employee tokens.
+        """
+        employees = {}
+        missing = {}
+        for token in tokens:
+            employee = token_cache.get(token)
+            if employee:
+                employees[token] = employee
+            else:
+                missing[digest_personal_token(token)] = token
+
+        if missing:
+            query = select(
+                Employee.personal_token_digest, Employee.id, Employee.user_id, Employee.workplace_id, Employee.is_active
+            ).where(Employee.personal_token_digest.in_(missing))
+            result = await session.execute(query)
+            for digest, *fields in result.all():
+                employees[missing[digest]] = CachedEmployee(*fields)
+                token_cache.set(missing[digest], employees[missing[digest]])
+
+        return employees
+
+
+    @staticmethod
+    async def ingest_work_events(session: SessionDep, data: WorkEventBatchSchema) -> list[WorkEventResultSchema]:
+        """
+        Apply buffered clock events in event-time order in one transaction.
+
+        Events are validated against the open sessions of their employees,
+        then written with one bulk statement per table. A rejected event
+        does not stop the rest of the batch.
+
+        Args:
+            session (AsyncSession): Session object.
+            data (WorkEventBatchSchema): Validated events.
+        """
+        events = data.events
+        results: list[WorkEventResultSchema | None] = [None] * len(events)
+
+        def reject(index: int, detail: str):
+            results[index] = WorkEventResultSchema(index=index, status="rejected", detail=detail)
+
+        employees = await EmployeeService.resolve_personal_tokens(session, {event.token for event in events})
+
+        # live clock-ins of these employees wait for the batch, and employees
+        # deleted after their token was cached are rejected, not written
+        employee_ids = {employee.id for employee in employees.values()}
+        if employee_ids:
+            await EmployeeService.lock_employees(session, employee_ids)
+            result = await session.execute(
+                select(Employee.id).where(Employee.id.in_(employee_ids)).with_for_update(key_share=True)
+            )
+            existing = set(result.scalars().all())
+            for token, employee in list(employees.items()):
+                if employee.id not in existing:
+                    token_cache.invalidate(token)
+                    del employees[token]
+
+        # open sessions are locked, so live clock-outs wait for the batch
+        stmt = (
+            select(
+                WorkSession.id, WorkSession.work_day_id, WorkSession.work_date, WorkSession.start_time,
+                WorkSession.employee_id,
+            )
+            .where(
+                WorkSession.employee_id.in_({employee.id for employee in employees.values()}),
+                WorkSession.end_time.is_(None),
+                EmployeeService.recent_work_sessions(),
+            )
+            .with_for_update()
+        )
+        result = await session.execute(stmt)
+        open_sessions = {row.employee_id: dict(row._mapping) for row in result.all()}
+
+        # sessions started in this batch, closed ones are inserted with end_time
+        started: list[dict] = []
+        # sessions opened before this batch and closed by it
+        closed: list[dict] = []
+        # time of the last applied event per employee
+        applied_at: dict[int, tuple[CachedEmployee, datetime]] = {}
+
+        now = datetime.now(timezone.utc)
+        for index, event in sorted(enumerate(events), key=lambda item: item[1].timestamp):
+            employee = employees.get(event.token)
+            if not employee:
+                reject(index, "Employee not found")
+                continue
+            if event.timestamp > now:
+                reject(index, "Event timestamp is in the future")
+                continue
+
+            open_session = open_sessions.get(employee.id)
+            if event.type == "start":
+                if open_session:
+                    reject(index, "Work session already started")
+                    continue
+                open_sessions[employee.id] = {
+                    "employee_id": employee.id,
+                    "work_date": event.timestamp.astimezone().date(),
+                    "start_time": event.timestamp,
+                    "end_time": None,
+                    "start_index": index,
+                    "end_index": None,
+                }
+                started.append(open_sessions[employee.id])
+                applied_at[employee.id] = (employee, event.timestamp)
+            else:
+                if not open_session:
+                    reject(index, "No active session to close")
+                    continue
+                if event.timestamp < open_session["start_time"]:
+                    reject(index, "Event precedes the active session start")
+                    continue
+                open_session["end_time"] = event.timestamp
+                open_session["end_index"] = index
+                if "start_index" not in open_session:
+                    closed.append(open_session)
+                del open_sessions[employee.id]
+                applied_at[employee.id] = (employee, event.timestamp)
+
+        if started:
+            days = {(s["employee_id"], s["work_date"]) for s in started}
+            work_day_insert = insert(WorkDay)
+            stmt = (
+                work_day_insert
+                .on_conflict_do_update(
+                    constraint="uq_employee_day",
+                    set_={"total_duration": WorkDay.total_duration},
+                )
+                .returning(WorkDay.id, WorkDay.employee_id, WorkDay.work_date)
+            )
+            result = await session.execute(
+                stmt, [{"employee_id": employee_id, "work_date": work_date} for employee_id, work_date in days]
+            )
+            work_day_ids = {(row.employee_id, row.work_date): row.id for row in result.all()}
+
+            stmt = insert(WorkSession).returning(WorkSession.id, sort_by_parameter_order=True)
+            result = await session.execute(stmt, [
+                {
+                    "work_day_id": work_day_ids[(s["employee_id"], s["work_date"])],
+                    "work_date": s["work_date"],
+                    "employee_id": s["employee_id"],
+                    "start_time": s["start_time"],
+                    "end_time": s["end_time"],
+                }
+                for s in started
+            ])
+            for started_session, session_id in zip(started, result.scalars().all()):
+                started_session["id"] = session_id
+                started_session["work_day_id"] = work_day_ids[(started_session["employee_id"], started_session["work_date"])]
+
+        # closing and duration accumulation run in one statement
+        closed_durations = []
+        if closed:
+            closed_values = values(
+                column("id", Integer),
+                column("work_date", Date),
+                column("end_time", DateTime(timezone=True)),
+                name="closed_values",
+            ).data([(s["id"], s["work_date"], s["end_time"]) for s in closed])
+            closed_durations.append(
+                update(WorkSession)
+                .where(WorkSession.id == closed_values.c.id, WorkSession.work_date == closed_values.c.work_date)
+                .values(end_time=closed_values.c.end_time)
+                .returning(
+                    WorkSession.work_day_id,
+                    WorkSession.work_date,
+                    (WorkSession.end_time - WorkSession.start_time).label("duration"),
+                )
+                .cte("closed_session")
+                .select()
+            )
+        started_closed_ids = [s["id"] for s in started if s["end_time"]]
+        if started_closed_ids:
+            closed_durations.append(
+                select(
+                    WorkSession.work_day_id,
+                    WorkSession.work_date,
+                    (WorkSession.end_time - WorkSession.start_time).label("duration"),
+                ).where(WorkSession.id.in_(started_closed_ids))
+            )
+        updated_days = []
+        if closed_durations:
+            work_day_cte, *rollup_ctes = EmployeeService.add_session_durations(
+                union_all(*closed_durations).subquery("closed_durations")
+            )
+            result = await session.execute(
+                select(
+                    work_day_cte.c.employee_id,
+                    work_day_cte.c.work_date,
+                    *EmployeeService.updated_totals(work_day_cte, rollup_ctes),
+                )
+                .add_cte(*rollup_ctes)
+                .order_by(work_day_cte.c.work_date)
+            )
+            updated_days = result.all()
 
         await session.commit()
-        return {"message": "Work session ended", "worked_for": str(duration)}
+
+        latest_totals = {}
+        updated_dates = {}
+        for row in updated_days:
+            report_cache.invalidate(row.employee_id, row.work_date)
+            latest_totals[row.employee_id] = row
+            updated_dates.setdefault(row.employee_id, []).append(row.work_date)
+
+        # one delta per employee, with its state after the whole batch
+        for employee, at in applied_at.values():
+            EmployeeService.publish_clock_event(
+                employee, employee.id in open_sessions, at, latest_totals.get(employee.id)
+            )
+            # the delta carries the latest work day only, e.g. replayed events of yesterday come before it
+            earlier_dates = updated_dates.get(employee.id, [])[:-1]
+            if earlier_dates:
+                EmployeeService.publish_cache_change(employee.user_id, employee.id, earlier_dates)
+
+        for s in started + closed:
+            for index in (s.get("start_index"), s["end_index"]):
+                if index is not None:
+                    results[index] = WorkEventResultSchema(index=index, status="applied", session_id=s["id"])
+
+        return results
+
+    @staticmethod
+    async def flush_work_events(events: list[WorkEventSchema]) -> None:
+        """
+        Persist clock events accepted by the write-behind queue.
+
+        Args:
+            events (list[WorkEventSchema]): Queued events, oldest first.
+        """
+        async with new_session() as session:
+            results = await EmployeeService.ingest_work_events(
+                session, WorkEventBatchSchema.model_construct(events=events)
+            )
+
+        for result in results:
+            if result.status == "rejected":
+                event = events[result.index]
+                logger.warning(f"Queued {event.type} event for token {event.token[:4]}... rejected: {result.detail}")
+
 
     @staticmethod
     async def add_workplace(data: WorkplaceCreateSchema, session: SessionDep, token: str):
@@ -316,7 +1420,7 @@ class EmployeeService:
             session (AsyncSession): Session object.
             token (str): Employee token.
         """
-        new_workplace = WorkPlace(title=data.title, address=data.address)
+        new_workplace = WorkPlace(**data.model_dump())
         session.add(new_workplace)
         await session.commit()
         await session.refresh(new_workplace)
@@ -359,9 +1463,53 @@ class EmployeeService:
 
         await session.delete(employee)
         await session.commit()
+        token_cache.invalidate_employee(employee.id)
+        report_cache.invalidate(employee.id)
+        EmployeeService.publish_cache_change(user_id, employee.id, all_reports=True, token_changed=True)
+        if employee.id in presence.on_shift(user_id):
+            # its open session was deleted with it
+            EmployeeService.publish_clock_event(
+                CachedEmployee(employee.id, employee.user_id, employee.workplace_id, employee.is_active),
+                False,
+                datetime.now(timezone.utc),
+            )
 
         return {"detail": "Employee deleted successfully"}
 
+    @staticmethod
+    async def rotate_personal_token(employee_id: int, session: SessionDep, payload: TokenPayload):
+        """
+        Replace employee's personal token with a new one.
+
+        Only the digest is stored, so the new token is returned by this call
+        alone. The old token stops working at once on every worker.
+
+        Args:
+            employee_id (int): Employee id.
+            session (AsyncSession): Session object.
+            payload (TokenPayload): Validated payload.
+        """
+        user_id = extract_user_uid_from_token(payload)
+        personal_token = generate_personal_token(employee_id)
+
+        stmt = (
+            update(Employee)
+            .where(Employee.id == employee_id, Employee.user_id == user_id)
+            .values(personal_token_digest=digest_personal_token(personal_token))
+            .returning(Employee.id)
+        )
+        result = await session.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Employee not found or you don't have permission to change it"
+            )
+        await session.commit()
+        token_cache.invalidate_employee(employee_id)
+        EmployeeService.publish_cache_change(user_id, employee_id, token_changed=True)
+
+        return {"msg": "success", "personal_token": personal_token}
+
     @staticmethod
     async def get_employee_by_token(
             request: Request,
@@ -370,11 +1518,14 @@ class EmployeeService:
     ) -> EmployeeReturnByTokenSchema:
         """
         Return employee by personal token with aggregated work stats.
+
+        Stats are served from the report cache until the employee closes
+        a session.
         """
         query = (
             select(Employee)
-            .where(Employee.personal_token == token)
-            .options(selectinload(Employee.workplace))
+            .where(Employee.personal_token_digest == digest_personal_token(token))
+            .options(selectinload(Employee.workplace), lazyload(Employee.user))
         )
         result = await session.execute(query)
         employee = result.scalar_one_or_none()
@@ -382,36 +1533,24 @@ class EmployeeService:
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        today = date.today()
-
-        start_week = today - timedelta(days=today.weekday())
-        end_week = start_week + timedelta(days=6)
-        start_month = today.replace(day=1)
-        _, days_in_month = monthrange(today.year, today.month)
-        end_month = today.replace(day=days_in_month)
-
-        min_date = min(start_week, start_month)
-        max_date = max(end_week, end_month)
+        token_cache.set(token, CachedEmployee(
+            id=employee.id,
+            user_id=employee.user_id,
+            workplace_id=employee.workplace_id,
+            is_active=employee.is_active,
+        ))
 
-        stmt = select(WorkDay).where(
-            WorkDay.employee_id == employee.id,
-            WorkDay.work_date.between(min_date, max_date)
-        )
-        result = await session.execute(stmt)
-        work_days = result.scalars().all()
-
-        day_sum = timedelta(0)
-        week_sum = timedelta(0)
-        month_sum = timedelta(0)
-
-        for wd in work_days:
-            if wd.work_date == today:
-                day_sum += wd.total_duration
-            if start_week <= wd.work_date <= end_week:
-                week_sum += wd.total_duration
-
-            if start_month <= wd.work_date <= end_month:
-                month_sum += wd.total_duration
+        today = date.today()
+        cache_key = (employee.id, "stats", today)
+        totals = report_cache.get(cache_key)
+        if totals is None:
+            stats = EmployeeService.work_stats_subquery(today, WorkDay.employee_id == employee.id)
+            result = await session.execute(select(stats.c.today, stats.c.week, stats.c.month))
+            row = result.one_or_none()
+            totals = tuple(row) if row else (None, None, None)
+            start_of_period = min(today - timedelta(days=today.weekday()), today.replace(day=1))
+            report_cache.set(cache_key, totals, employee.id, start_of_period, today)
+        day_sum, week_sum, month_sum = totals
 
         employee_data = EmployeeReturnDetailSchema.model_validate(employee).model_dump(context={"request": request})
 
@@ -1,23 +1,71 @@
-import random
+import binascii
+import hashlib
+import hmac
+import json
+import secrets
 import string
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
 
-from passlib.context import CryptContext
+from decouple import config
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+PERSONAL_TOKEN_KEY = config("PERSONAL_TOKEN_KEY").encode()
+PERSONAL_TOKEN_KEY_MIN_LENGTH = 32
 
+# an empty or short key would let anyone who reads the digests brute-force the tokens
+if len(PERSONAL_TOKEN_KEY) < PERSONAL_TOKEN_KEY_MIN_LENGTH:
+    raise RuntimeError(
+        f"PERSONAL_TOKEN_KEY must be at least {PERSONAL_TOKEN_KEY_MIN_LENGTH} characters long, generate one with "
+        "`python -c \"import secrets; print(secrets.token_hex(32))\"`"
+    )
 
-def hash_personal_token(personal_token: str) -> str:
-    """Return hashed personal token."""
-    return pwd_context.hash(personal_token)
 
+def digest_personal_token(personal_token: str) -> str:
+    """
+    Return keyed digest of personal token, the form it is stored and looked up in.
 
-def verify_personal_token(plain_personal_token: str, hashed_personal_token: str) -> bool:
-    """Return True if plain_personal_token matches hashed_personal_token."""
-    return pwd_context.verify(plain_personal_token, hashed_personal_token)
+    Tokens are random, so a keyed SHA-256 protects them as well as a slow
+    password hash would, while the digest stays deterministic and can be
+    found with a single unique index probe.
+    """
+    return hmac.new(PERSONAL_TOKEN_KEY, personal_token.encode(), hashlib.sha256).hexdigest()
 
 
 def generate_personal_token(uid: int) -> str:
     """Return random personal token"""
     chars = string.ascii_letters + string.digits
-    return ''.join(random.choice(chars) for _ in range(20)) + str(uid) + ''.join(random.choice(chars) for _ in range(20))
\ No newline at end of file
+    return ''.join(secrets.choice(chars) for _ in range(20)) + str(uid) + ''.join(secrets.choice(chars) for _ in range(20))
+
+
+def encode_cursor(sort: str, values: tuple) -> str:
+    """Return opaque pagination cursor for the sort key values of the last row."""
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            value = {"dt": value.isoformat()}
+        elif isinstance(value, timedelta):
+            value = {"td": value.total_seconds()}
+        encoded.append(value)
+
+    data = json.dumps({"sort": sort, "values": encoded}, separators=(",", ":"))
+    return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list | None:
+    """Return sort key values stored in cursor, or None if it is invalid or was made for another sort."""
+    try:
+        data = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if data["sort"] != sort:
+            return None
+
+        values = []
+        for value in data["values"]:
+            if isinstance(value, dict) and "dt" in value:
+                value = datetime.fromisoformat(value["dt"])
+            elif isinstance(value, dict) and "td" in value:
+                value = timedelta(seconds=value["td"])
+            values.append(value)
+        return values
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
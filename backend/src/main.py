@@ -1,14 +1,30 @@
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends
+from authx.exceptions import RevokedTokenError
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastadmin import fastapi_app as admin_app
 from fastapi.openapi.utils import get_openapi
-from starlette.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 
 from src.users.router import router as user_router
 from src.employee.router import router as employee_router
+from src.database import engine
+from src.employee.cache import invalidate_caches, reset_caches
+from src.employee.jobs import auto_close_job, partition_job, presence_job, AUTO_CLOSE_CHUNK_SIZE
+from src.employee.live import live_hub
+from src.employee.partitions import create_future_partitions
+from src.employee.photos import PHOTO_MAX_BYTES, PHOTO_FORM_OVERHEAD, FINGERPRINTED_PHOTO, shutdown_thumbnail_pool
+from src.employee.presence import presence, rebuild_presence
+from src.employee.queue import work_event_writer
+from src.employee.service import EmployeeService
+from src.users.cache import revoked_users
+from src.users.config import auth
 from src.security import *
+from src.utils.hashing import hashing_pool
+from src.utils.limits import BodySizeLimitMiddleware
+from src.utils.static import CachedStaticFiles
 import src.admin
 
 
@@ -54,14 +70,51 @@ def custom_openapi():
 os.makedirs("static/employees/profile_photos", exist_ok=True)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start background workers and drain them on shutdown.
+    """
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    await revoked_users.start(dsn)
+    await work_event_writer.start(EmployeeService.flush_work_events)
+    live_hub.observe(presence.apply)
+    live_hub.observe(invalidate_caches)
+    # events missed while the bridge was down are read back from the database
+    live_hub.on_connect(rebuild_presence)
+    live_hub.on_connect(reset_caches)
+    await live_hub.start(dsn)
+    await rebuild_presence()
+    await auto_close_job.start(lambda: EmployeeService.close_forgotten_sessions(AUTO_CLOSE_CHUNK_SIZE))
+    await partition_job.start(create_future_partitions)
+    await presence_job.start(rebuild_presence)
+    yield
+    await presence_job.stop()
+    await partition_job.stop()
+    await auto_close_job.stop()
+    await work_event_writer.stop()
+    await live_hub.stop()
+    await revoked_users.stop()
+    shutdown_thumbnail_pool()
+    hashing_pool.shutdown()
+
+
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.openapi = custom_openapi
 app.mount("/admin", admin_app)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static", immutable=FINGERPRINTED_PHOTO), name="static")
 app.include_router(user_router)
 app.include_router(employee_router)
 
+# tokens of deactivated users are refused before they expire
+auth.set_callback_token_blocklist(revoked_users.is_token_revoked)
+
+
+@app.exception_handler(RevokedTokenError)
+async def revoked_token_handler(request: Request, exc: RevokedTokenError):
+    return JSONResponse({"detail": "User account is deactivated"}, status_code=401)
+
 
 # CORS Middleware
 origins = [
@@ -75,7 +128,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+# photo uploads are refused before they are spooled to disk
+app.add_middleware(BodySizeLimitMiddleware, limits={("POST", "/employees"): PHOTO_MAX_BYTES + PHOTO_FORM_OVERHEAD})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+import asyncpg
+import jwt
+from decouple import config
+
+from src.users.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedUser:
+    """
+    Active user record kept between requests.
+
+    Attributes:
+        id (int): Unique Identifier.
+        first_name (str): User first name.
+        last_name (str): User last name
+        email (str): User email address.
+        created_at (datetime): When the user was created.
+    """
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(user.id, user.first_name, user.last_name, user.email, user.created_at)
+
+
+class UserCache:
+    """
+    Bounded LRU cache with TTL mapping user ids to active users.
+
+    Only active users are stored. Deactivation drops a user's entry on
+    every worker through `revoked_users`; other changes made elsewhere
+    become visible at the latest after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[float, CachedUser]] = OrderedDict()
+
+    def get(self, user_id: int) -> CachedUser | None:
+        """Return cached user or None."""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user: CachedUser) -> None:
+        """Store user, evicting the least recently used entry."""
+        self._entries[user.id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop cached entry of user."""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class RevocationList:
+    """
+    Ids of deactivated users, whose JWTs are refused before they expire.
+
+    The set is read from `users` when the worker starts and again after
+    every reconnect, so notifications missed while disconnected cannot
+    leave a revoked user in. Revoking or restoring a user takes effect on
+    this worker at once and on the others as soon as the Postgres
+    notification arrives; both also drop the user from `cache`.
+
+    A notification that could not be sent is sent again after reconnecting,
+    followed by a resync notification making every other worker read the
+    set again, which covers changes made while this worker was cut off.
+
+    Attributes:
+        channel (str): Postgres notification channel.
+    """
+
+    def __init__(self, channel: str, cache: UserCache):
+        self.channel = channel
+        self.cache = cache
+        self.origin = uuid.uuid4().hex
+        self._revoked: set[int] = set()
+        # None asks the listener to read the set again
+        self._outbox: asyncio.Queue[str | None] = asyncio.Queue()
+        self._pending: str | None = None
+        self._task: asyncio.Task | None = None
+
+        self.rejected = 0
+        self.notified = 0
+        self.received = 0
+        self.resyncs = 0
+
+    def is_revoked(self, user_id: int) -> bool:
+        """Return True if user was deactivated."""
+        return user_id in self._revoked
+
+    def is_token_revoked(self, token: str) -> bool:
+        """
+        Return True if token belongs to a deactivated user, the authx blocklist callback.
+
+        The signature is verified by authx right after this check, so the
+        subject is only read here.
+        """
+        if not self._revoked:
+            return False
+        try:
+            user_id = int(jwt.decode(token, options={"verify_signature": False})["sub"])
+        except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+            return False
+        if user_id in self._revoked:
+            self.rejected += 1
+            return True
+        return False
+
+    def revoke(self, user_id: int) -> None:
+        """Refuse tokens of user on every worker, call after deactivation was committed."""
+        self._apply(user_id, True)
+        self._send(user_id, True)
+
+    def restore(self, user_id: int) -> None:
+        """Accept tokens of user again on every worker, call after activation was committed."""
+        self._apply(user_id, False)
+        self._send(user_id, False)
+
+    def _apply(self, user_id: int, revoked: bool) -> None:
+        if revoked:
+            self._revoked.add(user_id)
+        else:
+            self._revoked.discard(user_id)
+        self.cache.invalidate(user_id)
+
+    def _send(self, user_id: int, revoked: bool) -> None:
+        if self._task:
+            self._outbox.put_nowait(json.dumps({"origin": self.origin, "user_id": user_id, "revoked": revoked}))
+
+    async def start(self, dsn: str) -> None:
+        """Load revoked users and start listening for changes of other workers."""
+        if self._task:
+            return
+        connection = await self._connect(dsn)
+        self._task = asyncio.create_task(self._run(dsn, connection), name="user-revocations")
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if not self._task:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _connect(self, dsn: str) -> asyncpg.Connection:
+        connection = await asyncpg.connect(dsn)
+        await connection.add_listener(self.channel, self._on_notification)
+        await self._load(connection)
+        logger.info(f"Loaded {len(self._revoked)} revoked users, listening on channel {self.channel}.")
+        return connection
+
+    async def _load(self, connection: asyncpg.Connection) -> None:
+        rows = await connection.fetch("SELECT id FROM users WHERE NOT is_active")
+        self._revoked = {row["id"] for row in rows}
+        self.cache.clear()
+
+    async def _run(self, dsn: str, connection: asyncpg.Connection | None) -> None:
+        while True:
+            try:
+                if connection is None:
+                    connection = await self._connect(dsn)
+                    # other workers may have missed what this one sent while it was cut off
+                    if self._pending:
+                        await self._notify(connection, self._pending)
+                        self._pending = None
+                    await self._notify(connection, json.dumps({"origin": self.origin, "resync": True}))
+                while True:
+                    try:
+                        async with asyncio.timeout(30):
+                            payload = await self._outbox.get()
+                    except TimeoutError:
+                        # keeps a silently dropped connection from going unnoticed
+                        await connection.execute("SELECT 1")
+                        continue
+                    if payload is None:
+                        await self._load(connection)
+                        self.resyncs += 1
+                        logger.info(f"Reloaded {len(self._revoked)} revoked users after another worker reconnected.")
+                        continue
+                    self._pending = payload
+                    await self._notify(connection, payload)
+                    self._pending = None
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("User revocation listener failed, reconnecting.")
+                await asyncio.sleep(1)
+            finally:
+                if connection is not None:
+                    connection.terminate()
+                    connection = None
+
+    async def _notify(self, connection: asyncpg.Connection, payload: str) -> None:
+        await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        self.notified += 1
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        notification = json.loads(payload)
+        if notification["origin"] == self.origin:
+            return
+        self.received += 1
+        if notification.get("resync"):
+            # the connection may be busy here, the listener reloads between the notifications it sends
+            self._outbox.put_nowait(None)
+            return
+        self._apply(notification["user_id"], notification["revoked"])
+
+    def stats(self) -> dict:
+        """Return revoked user count and counters."""
+        return {
+            "listening": self._task is not None,
+            "revoked": len(self._revoked),
+            "rejected": self.rejected,
+            "notified": self.notified,
+            "received": self.received,
+            "resyncs": self.resyncs,
+        }
+
+
+user_cache = UserCache(
+    maxsize=config("USER_CACHE_SIZE", default=10000, cast=int),
+    ttl=config("USER_CACHE_TTL", default=60, cast=float),
+)
+
+revoked_users = RevocationList(
+    channel=config("USER_REVOCATION_CHANNEL", default="user_revocations"),
+    cache=user_cache,
+)
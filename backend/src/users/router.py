@@ -3,7 +3,9 @@ from fastapi import APIRouter, Response, Depends, Request
 
 from src.dependencies import SessionDep
 from src.users.schemas import UserCreateSchema, UserLoginSchema, UserCurrentSchema
+from src.users.cache import user_cache, revoked_users
 from src.users.service import UserService, auth
+from src.utils.hashing import hashing_pool
 
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -40,4 +42,16 @@ async def get_current_user(session: SessionDep, payload: TokenPayload = Depends(
 @router.delete("/me", summary="Deactivate a user's profile", openapi_extra={"security": [{"JWT Access Cookie": []}]})
 async def deactivate_user(session: SessionDep, payload: TokenPayload = Depends(auth.access_token_required)):
     """Deactivate a user's profile."""
-    return await UserService.deactivate_user(payload, session)
\ No newline at end of file
+    return await UserService.deactivate_user(payload, session)
+
+
+@router.get("/hashing/stats", summary="Get password hashing pool statistics", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_hashing_stats(payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get load, queue wait and rejections of this worker's password hashing pool."""
+    return hashing_pool.stats()
+
+
+@router.get("/cache/stats", summary="Get user cache statistics", openapi_extra={"security": [{"JWT Access Cookie": []}]})
+async def get_user_cache_stats(payload: TokenPayload = Depends(auth.access_token_required)):
+    """Get hit ratio of this worker's user cache and its revoked user count."""
+    return {"user_cache": user_cache.stats(), "revoked_users": revoked_users.stats()}
\ No newline at end of file
@@ -3,11 +3,12 @@ import logging
 from authx import TokenPayload
 from fastapi import HTTPException, Response, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
+from src.users.cache import revoked_users
 from src.users.models import User
 from src.users.schemas import UserCreateSchema, UserLoginSchema
-from src.users.utils import hash_password, verify_password
+from src.users.utils import hash_password, verify_and_update_password
 from src.users.config import auth
 from src.utils.users import extract_user_uid_from_token, extract_user_by_id
 
@@ -29,7 +30,7 @@ class UserService:
             user (UserCreateSchema): Validated input data.
             session (AsyncSession): DB session.
         """
-        hashed_password = hash_password(user.password1)
+        hashed_password = await hash_password(user.password1)
         new_user = User(first_name=user.first_name, last_name=user.last_name, email=user.email, password=hashed_password)
         session.add(new_user)
         await session.commit()
@@ -61,9 +62,17 @@ class UserService:
             logger.warning(f"Login failed. User with email={user.email} was not found.")
             raise HTTPException(status_code=401, detail="User not found")
 
-        if not verify_password(user.password, db_user.password):
+        verified, new_hash = await verify_and_update_password(user.password, db_user.password)
+        if not verified:
             logger.warning(f"Login failed. User with email={user.email} enter wrong password.")
             raise HTTPException(status_code=401, detail="Incorrect password")
+        if not db_user.is_active:
+            logger.warning(f"Login failed. User with email={user.email} is deactivated.")
+            raise HTTPException(status_code=403, detail="User account is deactivated")
+        if new_hash:
+            # argon2 cost parameters changed since the password was set
+            db_user.password = new_hash
+            await session.commit()
 
         access_token = auth.create_access_token(uid=str(db_user.id))
         refresh_token = auth.create_refresh_token(uid=str(db_user.id))
@@ -118,14 +127,21 @@ class UserService:
         """
         Deactivate a user's account.
 
+        Tokens already issued to the user are refused on every worker from
+        now on, see `revoked_users`.
+
         Args:
             payload (TokenPayload): JWT token payload.
             session (AsyncSession): DB session.
         """
         uid = extract_user_uid_from_token(payload)
-        user = await extract_user_by_id(uid, User, session)
+        result = await session.execute(
+            update(User).where(User.id == uid).values(is_active=False).returning(User.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="User not found")
 
-        user.is_active = False
         await session.commit()
+        revoked_users.revoke(uid)
         return {"status_code": 200, "message": "User account deactivated"}
 
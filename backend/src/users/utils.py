@@ -1,14 +1,16 @@
-from passlib.context import CryptContext
+from src.utils.hashing import pwd_context, hashing_pool
 
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
-
-def hash_password(password: str) -> str:
+async def hash_password(password: str) -> str:
     """Return hashed password."""
-    return pwd_context.hash(password)
+    return await hashing_pool.run(pwd_context.hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Return True if plain_password matches hashed_password."""
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Return whether plain_password matches, and its new hash if hashed_password used outdated argon2 parameters."""
+    return await hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
\ No newline at end of file
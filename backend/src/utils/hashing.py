@@ -0,0 +1,98 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from decouple import config
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+
+T = TypeVar("T")
+
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=config("ARGON2_TIME_COST", default=3, cast=int),
+    argon2__memory_cost=config("ARGON2_MEMORY_COST", default=65536, cast=int),
+    argon2__parallelism=config("ARGON2_PARALLELISM", default=4, cast=int),
+)
+
+
+class HashingPool:
+    """
+    Bounded thread pool for argon2 hashing and verification.
+
+    argon2 releases the GIL while it hashes, so a few threads keep the
+    event loop free for clock events during a burst of logins. At most
+    `workers` hashes run at a time; calls beyond that wait in the executor
+    queue, and once `max_pending` calls are running or waiting new ones
+    are answered 503 instead of piling up memory-hard work.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hashing")
+        self.pending = 0
+
+        self.calls = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run func in the pool and return its result.
+
+        Args:
+            func (Callable): Hashing or verification function.
+            *args: Its arguments.
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server is busy, retry shortly", headers={"Retry-After": "1"})
+
+        queued = time.perf_counter()
+
+        def timed() -> tuple[T, float, float]:
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started - queued, time.perf_counter() - started
+
+        self.pending += 1
+        try:
+            result, waited, ran = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.pending -= 1
+
+        self.calls += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.run_seconds_total += ran
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the pool, waiting for hashes in progress."""
+        self._executor.shutdown()
+
+    def stats(self) -> dict:
+        """Return pool load, counters and queue wait."""
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "wait_ms_avg": round(self.wait_seconds_total / self.calls * 1000, 2) if self.calls else 0.0,
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 2),
+            "run_ms_avg": round(self.run_seconds_total / self.calls * 1000, 2) if self.calls else 0.0,
+        }
+
+
+hashing_pool = HashingPool(
+    workers=config("HASHING_WORKERS", default=2, cast=int),
+    max_pending=config("HASHING_MAX_PENDING", default=64, cast=int),
+)
@@ -0,0 +1,68 @@
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodyTooLarge(HTTPException):
+    """Raised from receive, so the app's exception handling answers 413 while it reads the body."""
+
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Request body must not exceed {limit} bytes")
+
+
+class BodySizeLimitMiddleware:
+    """
+    Answers 413 to requests whose body exceeds the limit of their route.
+
+    A declared Content-Length is checked before anything is read; bodies
+    without one are counted while they stream in and cut off at the limit,
+    so an oversized upload is never spooled to disk in full.
+
+    Attributes:
+        limits (dict): (method, path) mapped to the largest accepted body in bytes.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[tuple[str, str], int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                await self.reject(limit, scope, receive, send)
+                return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise BodyTooLarge(limit)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except BodyTooLarge:
+            if started:
+                raise
+            await self.reject(limit, scope, receive, send)
+
+    @staticmethod
+    async def reject(limit: int, scope: Scope, receive: Receive, send: Send) -> None:
+        error = BodyTooLarge(limit)
+        response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+        await response(scope, receive, send)
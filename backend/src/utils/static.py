@@ -0,0 +1,106 @@
+import gzip
+import mimetypes
+import os
+import re
+import shutil
+
+from decouple import config
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+
+STATIC_IMMUTABLE_MAX_AGE = config("STATIC_IMMUTABLE_MAX_AGE", default=365 * 24 * 3600, cast=int)
+
+# media types worth storing a gzip variant of; images are compressed already
+COMPRESSIBLE_TYPES = re.compile(r"text/.+|application/(json|javascript|xml)|image/svg\+xml")
+# a variant must save at least this share of the original to be kept
+PRECOMPRESS_MIN_SAVING = 0.1
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    Static files that browsers can keep.
+
+    Files whose path matches `immutable` are named after a hash of their
+    content, so their bytes never change under the same URL: they are sent
+    with `Cache-Control: immutable` and a year long max-age, and their ETag
+    is the content hash from the name, the same on every worker and host.
+    Browsers do not even revalidate them, so repeat page loads fetch no
+    bytes at all. Every other file is sent with `no-cache`, so it is always
+    revalidated and answered 304 while unchanged.
+
+    A `<file>.gz` variant stored next to a compressible file (see
+    `precompress_directory`) is sent instead of it to clients accepting gzip.
+
+    Attributes:
+        immutable (re.Pattern): Paths, relative to directory, of content-addressed files.
+    """
+
+    def __init__(self, *args, immutable: re.Pattern, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable = immutable
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+
+        headers = {}
+        if self.immutable.fullmatch(path):
+            headers["cache-control"] = f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable"
+            headers["etag"] = f'"{os.path.splitext(os.path.basename(path))[0]}"'
+        else:
+            headers["cache-control"] = "no-cache"
+
+        if COMPRESSIBLE_TYPES.fullmatch(media_type):
+            headers["vary"] = "accept-encoding"
+            variant = f"{full_path}.gz"
+            if "gzip" in request_headers.get("accept-encoding", "") and os.path.isfile(variant):
+                full_path, stat_result = variant, os.stat(variant)
+                headers["content-encoding"] = "gzip"
+                if "etag" in headers:
+                    headers["etag"] = f'{headers["etag"][:-1]}-gzip"'
+
+        response = FileResponse(
+            full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress_directory(directory: str) -> int:
+    """
+    Write missing or outdated `.gz` variants of compressible files under directory.
+
+    Returns the number of variants written. A variant saving less than
+    PRECOMPRESS_MIN_SAVING of the original is not kept.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            media_type = mimetypes.guess_type(name)[0]
+            if name.endswith(".gz") or not media_type or not COMPRESSIBLE_TYPES.fullmatch(media_type):
+                continue
+            path = os.path.join(root, name)
+            variant = f"{path}.gz"
+            if os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path):
+                continue
+            with open(path, "rb") as source, gzip.open(f"{variant}.part", "wb", compresslevel=9) as target:
+                shutil.copyfileobj(source, target)
+            if os.path.getsize(f"{variant}.part") > os.path.getsize(path) * (1 - PRECOMPRESS_MIN_SAVING):
+                os.unlink(f"{variant}.part")
+                if os.path.exists(variant):
+                    os.unlink(variant)
+                continue
+            os.replace(f"{variant}.part", variant)
+            written += 1
+    return written
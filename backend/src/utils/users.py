@@ -4,7 +4,7 @@ from fastapi import HTTPException
 from sqlalchemy import select
 
 from src.dependencies import SessionDep
-from src.users.models import User
+from src.users.cache import CachedUser, user_cache
 
 
 def extract_user_uid_from_token(payload: TokenPayload) -> int:
@@ -21,15 +21,18 @@ def extract_user_uid_from_token(payload: TokenPayload) -> int:
         raise HTTPException(status_code=401, detail="Invalid token.")
 
 
-async def extract_user_by_id(uid: int, model, session: SessionDep) -> User:
+async def extract_user_by_id(uid: int, model, session: SessionDep) -> CachedUser:
     """
-    Extract user by id from DB.
+    Extract user by id, from the per-process user cache or the DB.
 
     Args:
         uid: User id.
         model: User model.
         session: DB session.
     """
+    user = user_cache.get(uid)
+    if user:
+        return user
 
     query = select(model).where(model.id == uid)
     result = await session.execute(query)
@@ -38,4 +41,7 @@ async def extract_user_by_id(uid: int, model, session: SessionDep) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
\ No newline at end of file
+    cached = CachedUser.from_user(user)
+    if user.is_active:
+        user_cache.set(cached)
+    return cached
\ No newline at end of file
@@ -42,7 +42,7 @@ VALUES
 SELECT setval('public.employees_id_seq', (SELECT MAX(id) FROM public.employees));
 
 --
--- 4. Генерація Токенів та Історії роботи
+-- 4. Генерація Історії роботи
 --
 DO $$
 DECLARE
@@ -51,12 +51,6 @@ DECLARE
     start_date DATE := CURRENT_DATE - INTERVAL '1 year';
     end_date DATE := CURRENT_DATE;
 
-    -- Змінні для токенів
-    chars TEXT := 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789';
-    token_part1 TEXT;
-    token_part2 TEXT;
-    final_token TEXT;
-
     -- Змінні для часу
     random_hours INT;
     random_minutes INT;
@@ -69,24 +63,8 @@ BEGIN
     -- Цикл по працівниках Віталія
     FOR emp_rec IN SELECT id FROM public.employees WHERE user_id = 2 LOOP
 
-        -- === ГЕНЕРАЦІЯ ТОКЕНА ===
-        -- Генеруємо перші 20 символів
-        token_part1 := array_to_string(array(
-            SELECT substr(chars, ((random() * (length(chars) - 1) + 1)::integer), 1)
-            FROM generate_series(1, 20)
-        ), '');
-
-        -- Генеруємо останні 20 символів
-        token_part2 := array_to_string(array(
-            SELECT substr(chars, ((random() * (length(chars) - 1) + 1)::integer), 1)
-            FROM generate_series(1, 20)
-        ), '');
-
-        -- Склеюємо: Part1 + ID + Part2
-        final_token := token_part1 || emp_rec.id::text || token_part2;
-
-        -- Оновлюємо працівника
-        UPDATE public.employees SET personal_token = final_token WHERE id = emp_rec.id;
+        -- Токени не генеруються: в БД зберігається лише їх HMAC, новий токен видає
+        -- POST /employees/{id}/personal-token
 
         -- === ГЕНЕРАЦІЯ ЧАСУ (Work History) ===
         curr_date := start_date;
@@ -14,8 +14,8 @@ import {
 import CloudUploadIcon from "@mui/icons-material/CloudUpload";
 import CloseIcon from "@mui/icons-material/Close";
 import { UserCard } from "@widgets/index";
-import { rqClient } from "@shared/api/instance";
-import { useQueryClient } from "@tanstack/react-query"; // Для оновлення списку після додавання
+import { fetchClient, rqClient } from "@shared/api/instance";
+import { useInfiniteQuery, useQueryClient } from "@tanstack/react-query"; // Для оновлення списку після додавання
 
 // Типізація форми (те, що ми збираємо з полів)
 interface EmployeeFormInputs {
@@ -46,7 +46,20 @@ function Home() {
   const selectedFile = watch("file");
 
   // 3. Запити
-  const employees = rqClient.useQuery("get", "/employees");
+  // Працівники приходять сторінками, курсор наступної сторінки - у заголовку X-Next-Cursor.
+  // Для карток достатньо мініатюри 64px замість оригіналу фото
+  const employees = useInfiniteQuery({
+    queryKey: ["get", "/employees", "pages"],
+    queryFn: async ({ pageParam }) => {
+      const { data, error, response } = await fetchClient.GET("/employees", {
+        params: { query: { cursor: pageParam, photo_size: 64 } },
+      });
+      if (error) throw error;
+      return { items: data, nextCursor: response.headers.get("X-Next-Cursor") };
+    },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+  });
   const newEmployee = rqClient.useMutation("post", "/employees", {
     onSuccess: () => {
       // Закриваємо модалку і очищаємо форму
@@ -139,11 +152,26 @@ function Home() {
 
       {/* --- Список карток --- */}
       <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
-        {employees.data?.map((employee) => (
-          <UserCard key={employee.id} user={employee} />
-        ))}
+        {employees.data?.pages.flatMap((page) =>
+          page.items.map((employee) => (
+            <UserCard key={employee.id} user={employee} />
+          ))
+        )}
       </div>
 
+      {employees.hasNextPage && (
+        <div className="flex justify-center mt-6">
+          <Button
+            variant="outlined"
+            onClick={() => employees.fetchNextPage()}
+            disabled={employees.isFetchingNextPage}
+            sx={{ textTransform: "none", borderRadius: 2 }}
+          >
+            {employees.isFetchingNextPage ? "Завантаження..." : "Показати ще"}
+          </Button>
+        </div>
+      )}
+
       {/* --- Модальне вікно (Dialog) --- */}
       <Dialog open={open} onClose={handleClose} maxWidth="sm" fullWidth>
         <form onSubmit={handleSubmit(onSubmit)}>
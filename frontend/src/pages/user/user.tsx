@@ -28,7 +28,6 @@ interface Employee {
   phone_number: string;
   created_at: string;
   workplace: WorkPlace;
-  personal_token: string;
 }
 
 interface ChartData {
@@ -39,28 +38,6 @@ interface ChartData {
 
 // --- HELPERS ---
 
-// Надійний парсинг часу
-const parseWorkTime = (workTime: string | number): number => {
-  if (typeof workTime === "number") return workTime;
-  if (!workTime) return 0;
-
-  // Варіант 1: Якщо приходить просто час "08:30:00"
-  if (workTime.includes(":") && !workTime.includes("T")) {
-    const [h, m] = workTime.split(":").map(Number);
-    return parseFloat((h + m / 60).toFixed(2));
-  }
-
-  // Варіант 2: Якщо приходить ISO Date
-  const date = new Date(workTime);
-  if (!isNaN(date.getTime())) {
-    const hours = date.getUTCHours();
-    const minutes = date.getUTCMinutes();
-    return parseFloat((hours + minutes / 60).toFixed(2));
-  }
-
-  return 0;
-};
-
 // YYYY-MM-DD (Локальний час)
 const formatDateISO = (date: Date): string => {
   const year = date.getFullYear();
@@ -169,10 +146,39 @@ const WorkerInfo: React.FC<{ employee: Employee; totalHours: number }> = ({
   totalHours,
 }) => {
   const [copied, setCopied] = useState(false);
+  // Бекенд зберігає лише дайджест токена, тому новий токен показуємо один раз
+  const [personalToken, setPersonalToken] = useState<string | null>(null);
+
+  const rotateToken = rqClient.useMutation(
+    "post",
+    "/employees/{employee_id}/personal-token",
+    {
+      onSuccess: (data) => {
+        setPersonalToken((data as { personal_token: string }).personal_token);
+        setCopied(false);
+      },
+      onError: (error) => {
+        console.error("Помилка при створенні токена:", error);
+        alert("Не вдалося створити новий токен");
+      },
+    },
+  );
+
+  const handleRotateToken = () => {
+    if (
+      window.confirm(
+        "Створити новий токен? Поточний токен працівника перестане працювати.",
+      )
+    ) {
+      rotateToken.mutate({
+        params: { path: { employee_id: employee.id } },
+      });
+    }
+  };
 
   const handleCopyToken = () => {
-    if (employee.personal_token) {
-      navigator.clipboard.writeText(employee.personal_token);
+    if (personalToken) {
+      navigator.clipboard.writeText(personalToken);
       setCopied(true);
       setTimeout(() => setCopied(false), 2000);
     }
@@ -204,7 +210,7 @@ const WorkerInfo: React.FC<{ employee: Employee; totalHours: number }> = ({
           <p className="text-sm text-gray-500">{employee.email}</p>
 
           {/* --- БЛОК ТОКЕНА --- */}
-          {employee.personal_token && (
+          {personalToken ? (
             <div className="mt-3 flex items-center space-x-2 max-w-full">
               <div
                 className="bg-slate-100 dark:bg-slate-700/50 border border-slate-200 dark:border-slate-600 px-3 py-1.5 rounded-md text-xs font-mono text-slate-600 dark:text-slate-300 truncate select-all cursor-pointer hover:border-indigo-300 transition-colors"
@@ -212,7 +218,7 @@ const WorkerInfo: React.FC<{ employee: Employee; totalHours: number }> = ({
                 title="Натисніть, щоб скопіювати"
                 style={{ maxWidth: "200px" }}
               >
-                {employee.personal_token}
+                {personalToken}
               </div>
               <button
                 onClick={handleCopyToken}
@@ -250,6 +256,19 @@ const WorkerInfo: React.FC<{ employee: Employee; totalHours: number }> = ({
                 )}
               </button>
             </div>
+          ) : (
+            <button
+              onClick={handleRotateToken}
+              disabled={rotateToken.isPending}
+              className="mt-3 px-3 py-1.5 text-xs font-medium rounded-md border border-slate-200 dark:border-slate-600 text-slate-600 dark:text-slate-300 hover:border-indigo-300 hover:text-indigo-600 dark:hover:text-indigo-400 disabled:opacity-50 transition-colors"
+            >
+              {rotateToken.isPending ? "Створення..." : "Створити новий токен"}
+            </button>
+          )}
+          {personalToken && (
+            <p className="mt-1 text-xs text-amber-600 dark:text-amber-400">
+              Токен показано лише один раз, скопіюйте його зараз
+            </p>
           )}
           {/* --- КІНЕЦЬ БЛОКУ ТОКЕНА --- */}
         </div>
@@ -287,6 +306,8 @@ function User() {
       params: {
         path: { employee_id: Number(userId) },
         query: {
+          // Аватар 96px, мініатюри 256px вистачає і для щільних екранів
+          photo_size: 256,
           // Відправляємо YYYY-MM-DD і для тижня, і для місяця (щоб пройти валідацію на бекенді)
           week: timePeriod === "week" ? formatDateISO(currentDate) : undefined,
           month:
@@ -341,7 +362,7 @@ function User() {
     apiData.work_summary.forEach((item) => {
       // Нормалізуємо дату з API, щоб вона точно збігалася з ключами
       const normalizedDate = formatDateISO(new Date(item.date));
-      const hours = parseWorkTime(item.work_time!);
+      const hours = parseFloat((item.seconds / 3600).toFixed(2));
       summaryMap.set(normalizedDate, hours);
     });
 
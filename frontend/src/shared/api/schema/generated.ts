@@ -57,7 +57,7 @@ export interface paths {
          * Token Refresh
          * @description Return Updated JWT tokens in cookies.
          *
-         *     Requires refresh token cookie.
+         * Requires refresh token cookie.
          */
         post: operations["token_refresh_users_token_refresh_post"];
         delete?: never;
@@ -90,6 +90,46 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/users/hashing/stats": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get password hashing pool statistics
+         * @description Get load, queue wait and rejections of this worker's password hashing pool.
+         */
+        get: operations["get_hashing_stats_users_hashing_stats_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/users/cache/stats": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get user cache statistics
+         * @description Get hit ratio of this worker's user cache and its revoked user count.
+         */
+        get: operations["get_user_cache_stats_users_cache_stats_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/employees": {
         parameters: {
             query?: never;
@@ -99,7 +139,9 @@ export interface paths {
         };
         /**
          * Get all employees for current user
-         * @description Get all employees for current user.
+         * @description Get a page of employees for current user.
+         *
+         * Pass the `X-Next-Cursor` response header as `cursor` to get the next page.
          */
         get: operations["get_all_employees_employees_get"];
         put?: never;
@@ -114,6 +156,146 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/employees/export": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Export work sessions
+         * @description Stream work sessions of all employees as CSV or NDJSON.
+         */
+        get: operations["export_work_sessions_employees_export_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/live": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Stream live clock events
+         * @description Stream start/end deltas of all employees as server-sent events.
+         */
+        get: operations["live_events_employees_live_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/on-shift": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get employees currently on shift
+         * @description Get employees with an open work session and their count per work place.
+         */
+        get: operations["get_on_shift_employees_on_shift_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/sessions/review": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get auto-closed sessions awaiting review
+         * @description Get work sessions that were closed automatically and need review.
+         */
+        get: operations["get_sessions_for_review_employees_sessions_review_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/sessions/{session_id}/review": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Accept an auto-closed session
+         * @description Accept a work session closed automatically, optionally correcting its end time, and clear its review flag.
+         */
+        post: operations["review_session_employees_sessions__session_id__review_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/payroll": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get payroll of a period
+         * @description Get regular, overtime, night and weekend hours and gross pay of every employee with closed sessions in a period.
+         */
+        get: operations["get_payroll_employees_payroll_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/cache/stats": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get employee cache statistics
+         * @description Get size, memory footprint and hit ratio of this worker's caches.
+         */
+        get: operations["get_cache_stats_employees_cache_stats_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/employees/{employee_id}": {
         parameters: {
             query?: never;
@@ -128,7 +310,11 @@ export interface paths {
         get: operations["get_employee_detail_employees__employee_id__get"];
         put?: never;
         post?: never;
-        delete?: never;
+        /**
+         * Delete employee
+         * @description Delete an employee.
+         */
+        delete: operations["delete_employee_employees__employee_id__delete"];
         options?: never;
         head?: never;
         patch?: never;
@@ -174,6 +360,28 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/employees/work/batch": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Apply buffered work session events
+         * @description Apply buffered start/end events in event-time order.
+         *
+         * Every event is authorized by its own employee personal token.
+         */
+        post: operations["ingest_work_events_employees_work_batch_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/employees/workplaces": {
         parameters: {
             query?: never;
@@ -194,6 +402,66 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/employees/workplaces/{workplace_id}/timesheet": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get work place timesheet
+         * @description Get worked seconds of every employee at a work place for every day of a month.
+         */
+        get: operations["get_workplace_timesheet_employees_workplaces__workplace_id__timesheet_get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/{employee_id}/personal-token": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Rotate employee's personal token
+         * @description Issue a new personal token for an employee, the old one stops working.
+         */
+        post: operations["rotate_personal_token_employees__employee_id__personal_token_post"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/employees/by-token/{employee_token}": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Return employee by personal token
+         * @description Return employee info and stats by personal token.
+         */
+        get: operations["get_employee_by_token_employees_by_token__employee_token__get"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
 }
 export type webhooks = Record<string, never>;
 export interface components {
@@ -208,6 +476,38 @@ export interface components {
             /** Data */
             data: string;
         };
+        /** EmployeeReturnByTokenSchema */
+        EmployeeReturnByTokenSchema: {
+            /** Id */
+            id: number;
+            /** First Name */
+            first_name: string;
+            /** Last Name */
+            last_name: string;
+            /** Position */
+            position: string;
+            /** Profile Photo */
+            profile_photo: string | null;
+            /**
+             * Email
+             * Format: email
+             */
+            email: string;
+            /** Phone Number */
+            phone_number: string;
+            /**
+             * Created At
+             * Format: date-time
+             */
+            created_at: string;
+            workplace: components["schemas"]["WorkPlaceReturnSchema"];
+            /** Day Time */
+            day_time: string | null;
+            /** Week Time */
+            week_time: string | null;
+            /** Month Time */
+            month_time: string | null;
+        };
         /**
          * EmployeeReturnDetailSchema
          * @description Schema using when returning employee detail information
@@ -236,8 +536,6 @@ export interface components {
              */
             created_at: string;
             workplace: components["schemas"]["WorkPlaceReturnSchema"];
-            /** Personal Token */
-            personal_token: string;
         };
         /**
          * EmployeeWithStatsReturnSchema
@@ -277,8 +575,25 @@ export interface components {
             employee: components["schemas"]["EmployeeReturnDetailSchema"];
             /** Period */
             period: string;
+            /**
+             * Bucket
+             * @enum {string}
+             */
+            bucket: "day" | "week" | "month";
+            /**
+             * Date From
+             * Format: date
+             */
+            date_from: string;
+            /**
+             * Date To
+             * Format: date
+             */
+            date_to: string;
             /** Work Summary */
             work_summary: components["schemas"]["WorkSummarySchema"][];
+            /** Total Seconds */
+            total_seconds: number;
             /** Total Hours */
             total_hours: number;
         };
@@ -287,6 +602,96 @@ export interface components {
             /** Detail */
             detail?: components["schemas"]["ValidationError"][];
         };
+        /**
+         * OnShiftEmployeeSchema
+         * @description Schema using when returning an employee with an open work session
+         */
+        OnShiftEmployeeSchema: {
+            /** Employee Id */
+            employee_id: number;
+            /** Workplace Id */
+            workplace_id: number;
+            /**
+             * Started At
+             * Format: date-time
+             */
+            started_at: string;
+        };
+        /**
+         * OnShiftSchema
+         * @description Schema using when returning employees currently on shift
+         */
+        OnShiftSchema: {
+            /** Count */
+            count: number;
+            /** By Workplace */
+            by_workplace: {
+                [key: string]: number;
+            };
+            /** Employees */
+            employees: components["schemas"]["OnShiftEmployeeSchema"][];
+        };
+        /**
+         * PayrollSchema
+         * @description Schema using when returning payroll of a period.
+         * All lists are parallel to employee_ids.
+         */
+        PayrollSchema: {
+            /**
+             * Date From
+             * Format: date
+             */
+            date_from: string;
+            /**
+             * Date To
+             * Format: date
+             */
+            date_to: string;
+            /** Employee Ids */
+            employee_ids: number[];
+            /** Sessions */
+            sessions: number[];
+            /** Total Hours */
+            total_hours: number[];
+            /** Regular Hours */
+            regular_hours: number[];
+            /** Overtime Hours */
+            overtime_hours: number[];
+            /** Night Hours */
+            night_hours: number[];
+            /** Weekend Hours */
+            weekend_hours: number[];
+            /** Gross Pay */
+            gross_pay: number[];
+        };
+        /**
+         * ReviewSessionSchema
+         * @description Schema using when returning an auto-closed work session awaiting review
+         */
+        ReviewSessionSchema: {
+            /** Id */
+            id: number;
+            /** Employee Id */
+            employee_id: number;
+            /**
+             * Start Time
+             * Format: date-time
+             */
+            start_time: string;
+            /**
+             * End Time
+             * Format: date-time
+             */
+            end_time: string;
+        };
+        /**
+         * ReviewSessionUpdateSchema
+         * @description Schema using when accepting an auto-closed work session, optionally with a corrected end time
+         */
+        ReviewSessionUpdateSchema: {
+            /** End Time */
+            end_time?: string | null;
+        };
         /**
          * UserCreateSchema
          * @description Schema used when creating a new user.
@@ -350,6 +755,49 @@ export interface components {
             /** Error Type */
             type: string;
         };
+        /**
+         * WorkEventBatchSchema
+         * @description Schema using for batch clock event ingestion
+         */
+        WorkEventBatchSchema: {
+            /** Events */
+            events: components["schemas"]["WorkEventSchema"][];
+        };
+        /**
+         * WorkEventResultSchema
+         * @description Schema using when returning the result of a single clock event
+         */
+        WorkEventResultSchema: {
+            /** Index */
+            index: number;
+            /**
+             * Status
+             * @enum {string}
+             */
+            status: "applied" | "rejected";
+            /** Session Id */
+            session_id?: number | null;
+            /** Detail */
+            detail?: string | null;
+        };
+        /**
+         * WorkEventSchema
+         * @description Schema using for a single buffered clock event
+         */
+        WorkEventSchema: {
+            /** Token */
+            token: string;
+            /**
+             * Type
+             * @enum {string}
+             */
+            type: "start" | "end";
+            /**
+             * Timestamp
+             * Format: date-time
+             */
+            timestamp: string;
+        };
         /**
          * WorkPlaceReturnSchema
          * @description Schema using when returning work place
@@ -364,8 +812,8 @@ export interface components {
         };
         /**
          * WorkSummarySchema
-         * @description Повертає статистику за день.
-         *     hours - це об'єкт time (наприклад 08:45:00) або None.
+         * @description Повертає статистику за день, тиждень або місяць.
+         * date - перший день періоду, seconds - відпрацьований час у секундах.
          */
         WorkSummarySchema: {
             /**
@@ -373,8 +821,8 @@ export interface components {
              * Format: date
              */
             date: string;
-            /** Work Time */
-            work_time: string | null;
+            /** Seconds */
+            seconds: number;
         };
         /**
          * WorkTimeStatusSchema
@@ -397,6 +845,36 @@ export interface components {
             title: string;
             /** Address */
             address: string;
+            /**
+             * Auto Close Enabled
+             * @default true
+             */
+            auto_close_enabled: boolean;
+            /** Auto Close After */
+            auto_close_after?: string | null;
+            /** Auto Close Credit */
+            auto_close_credit?: string | null;
+        };
+        /**
+         * WorkplaceTimesheetSchema
+         * @description Schema using when returning work place timesheet matrix.
+         * seconds is flat and row-major: seconds[i * len(dates) + j] belongs to
+         * employee_ids[i] on dates[j].
+         */
+        WorkplaceTimesheetSchema: {
+            /** Workplace Id */
+            workplace_id: number;
+            /**
+             * Month
+             * Format: date
+             */
+            month: string;
+            /** Employee Ids */
+            employee_ids: number[];
+            /** Dates */
+            dates: string[];
+            /** Seconds */
+            seconds: number[];
         };
     };
     responses: never;
@@ -409,16 +887,186 @@ export type $defs = Record<string, never>;
 export interface operations {
     create_user_users_register_post: {
         parameters: {
-            query?: never;
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["UserCreateSchema"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    login_user_users_login_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["UserLoginSchema"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    token_refresh_users_token_refresh_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
+    get_current_user_users_me_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["UserCurrentSchema"];
+                };
+            };
+        };
+    };
+    deactivate_user_users_me_delete: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
+    get_hashing_stats_users_hashing_stats_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
+    get_user_cache_stats_users_cache_stats_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
+    get_all_employees_employees_get: {
+        parameters: {
+            query?: {
+                limit?: number;
+                cursor?: string | null;
+                workplace_id?: number | null;
+                is_active?: boolean | null;
+                search?: string | null;
+                sort?: "name" | "-name" | "created_at" | "-created_at" | "week" | "-week" | "month" | "-month";
+                photo_size?: number | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
         };
-        requestBody: {
-            content: {
-                "application/json": components["schemas"]["UserCreateSchema"];
-            };
-        };
+        requestBody?: never;
         responses: {
             /** @description Successful Response */
             200: {
@@ -426,7 +1074,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": unknown;
+                    "application/json": components["schemas"]["EmployeeWithStatsReturnSchema"][];
                 };
             };
             /** @description Validation Error */
@@ -440,7 +1088,7 @@ export interface operations {
             };
         };
     };
-    login_user_users_login_post: {
+    create_employee_employees_post: {
         parameters: {
             query?: never;
             header?: never;
@@ -449,7 +1097,7 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["UserLoginSchema"];
+                "multipart/form-data": components["schemas"]["Body_create_employee_employees_post"];
             };
         };
         responses: {
@@ -473,9 +1121,14 @@ export interface operations {
             };
         };
     };
-    token_refresh_users_token_refresh_post: {
+    export_work_sessions_employees_export_get: {
         parameters: {
-            query?: never;
+            query?: {
+                format?: "csv" | "ndjson";
+                workplace_id?: number | null;
+                date_from?: string | null;
+                date_to?: string | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -491,9 +1144,18 @@ export interface operations {
                     "application/json": unknown;
                 };
             };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
         };
     };
-    get_current_user_users_me_get: {
+    live_events_employees_live_get: {
         parameters: {
             query?: never;
             header?: never;
@@ -508,14 +1170,16 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["UserCurrentSchema"];
+                    "application/json": unknown;
                 };
             };
         };
     };
-    deactivate_user_users_me_delete: {
+    get_on_shift_employees_on_shift_get: {
         parameters: {
-            query?: never;
+            query?: {
+                workplace_id?: number | null;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -528,12 +1192,21 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": unknown;
+                    "application/json": components["schemas"]["OnShiftSchema"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
                 };
             };
         };
     };
-    get_all_employees_employees_get: {
+    get_sessions_for_review_employees_sessions_review_get: {
         parameters: {
             query?: never;
             header?: never;
@@ -548,21 +1221,23 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["EmployeeWithStatsReturnSchema"][];
+                    "application/json": components["schemas"]["ReviewSessionSchema"][];
                 };
             };
         };
     };
-    create_employee_employees_post: {
+    review_session_employees_sessions__session_id__review_post: {
         parameters: {
             query?: never;
             header?: never;
-            path?: never;
+            path: {
+                session_id: number;
+            };
             cookie?: never;
         };
         requestBody: {
             content: {
-                "multipart/form-data": components["schemas"]["Body_create_employee_employees_post"];
+                "application/json": components["schemas"]["ReviewSessionUpdateSchema"];
             };
         };
         responses: {
@@ -572,7 +1247,47 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": unknown;
+                    "application/json": components["schemas"]["ReviewSessionSchema"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_payroll_employees_payroll_get: {
+        parameters: {
+            query: {
+                date_from: string;
+                date_to: string;
+                workplace_id?: number | null;
+                hourly_rate?: number;
+                overtime_multiplier?: number;
+                night_multiplier?: number;
+                weekend_multiplier?: number;
+                daily_overtime_hours?: number;
+                rounding_minutes?: number;
+                rounding?: "nearest" | "up" | "down";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["PayrollSchema"];
                 };
             };
             /** @description Validation Error */
@@ -586,11 +1301,35 @@ export interface operations {
             };
         };
     };
+    get_cache_stats_employees_cache_stats_get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+        };
+    };
     get_employee_detail_employees__employee_id__get: {
         parameters: {
             query?: {
                 week?: string | null;
                 month?: string | null;
+                date_from?: string | null;
+                date_to?: string | null;
+                bucket?: "day" | "week" | "month";
+                photo_size?: number | null;
             };
             header?: never;
             path: {
@@ -620,6 +1359,37 @@ export interface operations {
             };
         };
     };
+    delete_employee_employees__employee_id__delete: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                employee_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     start_work_employees_work_start_post: {
         parameters: {
             query?: never;
@@ -660,6 +1430,39 @@ export interface operations {
             };
         };
     };
+    ingest_work_events_employees_work_batch_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["WorkEventBatchSchema"];
+            };
+        };
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["WorkEventResultSchema"][];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     add_workplace_employees_workplaces_post: {
         parameters: {
             query?: never;
@@ -693,4 +1496,99 @@ export interface operations {
             };
         };
     };
+    get_workplace_timesheet_employees_workplaces__workplace_id__timesheet_get: {
+        parameters: {
+            query?: {
+                month?: string | null;
+            };
+            header?: never;
+            path: {
+                workplace_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["WorkplaceTimesheetSchema"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    rotate_personal_token_employees__employee_id__personal_token_post: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                employee_id: number;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": unknown;
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
+    get_employee_by_token_employees_by_token__employee_token__get: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path: {
+                employee_token: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["EmployeeReturnByTokenSchema"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
 }